@@ -12,25 +12,27 @@ import time
 import json
 import logging
 import random
-from typing import Dict, List, Optional, Any
+from array import array
+from typing import Dict, Iterator, List, Optional, Any, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
-from c3po_client import C3POClient, create_sample_market_data, format_prediction_output
+from c3po_client import (AsyncC3POClient, CircuitBreaker, LatencyBudget, PredictionCache,
+                         create_sample_market_data, format_prediction_output)
+from market_data_store import MarketDataStore
+from trading_metrics import MetricsAccumulator
+from technical_indicators import IndicatorEngine
+from trading_logging import configure_logging
+from trading_persistence import TradingPersistence
+from trading_scheduler import DataArrivalScheduler
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('ai_trading_bot.log'),
-        logging.StreamHandler()
-    ]
-)
+# Handlers are configured by main() (configure_logging), not on import
 logger = logging.getLogger(__name__)
 
 @dataclass
 class Position:
     """Trading position data structure"""
+    __slots__ = ('symbol', 'quantity', 'entry_price', 'current_price', 'entry_time', 'side')
+    
     symbol: str
     quantity: float
     entry_price: float
@@ -48,10 +50,18 @@ class Position:
     @property
     def unrealized_pnl_percent(self) -> float:
         return (self.unrealized_pnl / (self.entry_price * self.quantity)) * 100
+    
+    @property
+    def market_value(self) -> float:
+        """Cash the position returns if closed now: its cost plus unrealized P&L (longs and shorts)"""
+        return self.entry_price * self.quantity + self.unrealized_pnl
 
 @dataclass
 class Trade:
     """Completed trade data structure"""
+    __slots__ = ('symbol', 'side', 'quantity', 'entry_price', 'exit_price', 'entry_time', 'exit_time',
+                 'pnl', 'pnl_percent', 'strategy', 'ai_confidence', 'c3po_used')
+    
     symbol: str
     side: str
     quantity: float
@@ -65,20 +75,167 @@ class Trade:
     ai_confidence: float
     c3po_used: bool
 
+class TradeLog:
+    """
+    Append-only columnar trade log
+    
+    Numeric fields live in ``array('d')`` columns, timestamps as epoch seconds,
+    and symbol/side/strategy strings as codes into one interned string table,
+    so a closed trade costs 77 bytes (eight doubles, three 4-byte codes and a
+    c3po_used byte) instead of a Trade object plus two datetimes. Indexing,
+    slicing and iteration materialize Trade views on demand.
+    """
+    
+    NUMERIC_FIELDS = ('quantity', 'entry_price', 'exit_price', 'entry_time', 'exit_time',
+                      'pnl', 'pnl_percent', 'ai_confidence')
+    CODED_FIELDS = ('symbol', 'side', 'strategy')
+    
+    def __init__(self):
+        self._numeric = {field: array('d') for field in self.NUMERIC_FIELDS}
+        self._coded = {field: array('I') for field in self.CODED_FIELDS}
+        self._c3po_used = array('B')
+        self._strings: List[str] = []
+        self._string_codes: Dict[str, int] = {}
+    
+    def _intern(self, value: str) -> int:
+        code = self._string_codes.get(value)
+        if code is None:
+            code = self._string_codes[value] = len(self._strings)
+            self._strings.append(value)
+        return code
+    
+    def append(self, trade: Trade):
+        """Record a closed trade"""
+        numeric = self._numeric
+        numeric['quantity'].append(trade.quantity)
+        numeric['entry_price'].append(trade.entry_price)
+        numeric['exit_price'].append(trade.exit_price)
+        numeric['entry_time'].append(trade.entry_time.timestamp())
+        numeric['exit_time'].append(trade.exit_time.timestamp())
+        numeric['pnl'].append(trade.pnl)
+        numeric['pnl_percent'].append(trade.pnl_percent)
+        numeric['ai_confidence'].append(trade.ai_confidence)
+        for field in self.CODED_FIELDS:
+            self._coded[field].append(self._intern(getattr(trade, field)))
+        self._c3po_used.append(trade.c3po_used)
+    
+    def column(self, field: str) -> Union[memoryview, List[str]]:
+        """
+        One field for every trade
+        
+        Returns:
+            Read-only memoryview for numeric fields (timestamps as epoch seconds),
+            list of strings for symbol/side/strategy
+        """
+        if field in self._numeric:
+            return memoryview(self._numeric[field]).toreadonly()
+        if field in self._coded:
+            strings = self._strings
+            return [strings[code] for code in self._coded[field]]
+        if field == 'c3po_used':
+            return [bool(flag) for flag in self._c3po_used]
+        raise KeyError(field)
+    
+    def _trade_at(self, i: int) -> Trade:
+        numeric = self._numeric
+        strings = self._strings
+        return Trade(
+            symbol=strings[self._coded['symbol'][i]],
+            side=strings[self._coded['side'][i]],
+            quantity=numeric['quantity'][i],
+            entry_price=numeric['entry_price'][i],
+            exit_price=numeric['exit_price'][i],
+            entry_time=datetime.fromtimestamp(numeric['entry_time'][i]),
+            exit_time=datetime.fromtimestamp(numeric['exit_time'][i]),
+            pnl=numeric['pnl'][i],
+            pnl_percent=numeric['pnl_percent'][i],
+            strategy=strings[self._coded['strategy'][i]],
+            ai_confidence=numeric['ai_confidence'][i],
+            c3po_used=bool(self._c3po_used[i])
+        )
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Trade, List[Trade]]:
+        if isinstance(index, slice):
+            return [self._trade_at(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("trade index out of range")
+        return self._trade_at(index)
+    
+    def __iter__(self) -> Iterator[Trade]:
+        for i in range(len(self)):
+            yield self._trade_at(i)
+    
+    def __len__(self) -> int:
+        return len(self._c3po_used)
+    
+    def last(self, n: int = 10) -> List[Trade]:
+        """The most recent ``n`` trades, oldest first"""
+        return self[-n:] if n > 0 else []
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the trade columns"""
+        columns = list(self._numeric.values()) + list(self._coded.values()) + [self._c3po_used]
+        return sum(column.itemsize * len(column) for column in columns)
+
 class Portfolio:
     """Portfolio management class"""
     def __init__(self, initial_cash: float = 10000):
         self.initial_cash = initial_cash
         self.cash = initial_cash
         self.positions: Dict[str, Position] = {}
-        self.trades: List[Trade] = []
+        self.trades = TradeLog()
         self.max_position_size = 0.2  # 20% of portfolio per position
         self.max_total_exposure = 0.8  # 80% total exposure
+        
+        # Aggregates maintained by add_position / mark_price / remove_position
+        self._market_value = 0.0
+        self._unrealized_pnl = 0.0
+    
+    def add_position(self, position: Position, cost: float):
+        """Open a position, paying ``cost`` from cash"""
+        self.positions[position.symbol] = position
+        self.cash -= cost
+        self._market_value += position.market_value
+        self._unrealized_pnl += position.unrealized_pnl
+    
+    def mark_price(self, symbol: str, price: float):
+        """Move a position to a new price, adjusting the aggregates by the difference"""
+        position = self.positions.get(symbol)
+        if position is None or price == position.current_price:
+            return
+        
+        previous_pnl = position.unrealized_pnl
+        position.current_price = price
+        change = position.unrealized_pnl - previous_pnl
+        self._market_value += change
+        self._unrealized_pnl += change
+    
+    def remove_position(self, symbol: str) -> Position:
+        """Remove a position (proceeds are booked by the caller)"""
+        position = self.positions.pop(symbol)
+        if self.positions:
+            self._market_value -= position.market_value
+            self._unrealized_pnl -= position.unrealized_pnl
+        else:
+            # Drop accumulated floating-point drift whenever the book is flat
+            self._market_value = 0.0
+            self._unrealized_pnl = 0.0
+        return position
+    
+    @property
+    def market_value(self) -> float:
+        return self._market_value
+    
+    @property
+    def unrealized_pnl(self) -> float:
+        return self._unrealized_pnl
     
     @property
     def total_value(self) -> float:
-        position_value = sum(pos.current_price * pos.quantity for pos in self.positions.values())
-        return self.cash + position_value
+        return self.cash + self._market_value
     
     @property
     def total_pnl(self) -> float:
@@ -90,22 +247,29 @@ class Portfolio:
     
     @property
     def exposure_percent(self) -> float:
-        position_value = sum(pos.current_price * pos.quantity for pos in self.positions.values())
-        return (position_value / self.total_value) * 100
+        return (self._market_value / self.total_value) * 100
     
     def can_open_position(self, symbol: str, price: float, quantity: float) -> bool:
         position_value = price * quantity
-        max_position_value = self.total_value * self.max_position_size
+        total_value = self.total_value
         
-        if position_value > max_position_value:
+        if position_value > total_value * self.max_position_size:
             return False
         
-        current_exposure = sum(pos.current_price * pos.quantity for pos in self.positions.values())
-        if (current_exposure + position_value) > (self.total_value * self.max_total_exposure):
+        if (self._market_value + position_value) > (total_value * self.max_total_exposure):
             return False
         
         return position_value <= self.cash
 
+class SystemClock:
+    """Wall-clock time source (backtests inject a virtual clock with the same interface)"""
+    
+    def time(self) -> float:
+        return time.time()
+    
+    def now(self) -> datetime:
+        return datetime.now()
+
 class AIPaperTradingBot:
     """AI-powered paper trading bot with C3PO integration"""
     
@@ -113,10 +277,79 @@ class AIPaperTradingBot:
                  initial_balance: float = 10000,
                  trading_symbols: List[str] = None,
                  ai_confidence_threshold: float = 0.7,
-                 max_positions: int = 5):
+                 max_positions: int = 5,
+                 c3po_url: str = "http://localhost:8002",
+                 prediction_timeout: float = 5.0,
+                 prediction_cache_ttl: float = 60.0,
+                 iteration_latency_budget: float = 10.0,
+                 hedge_predictions: bool = True,
+                 session_windows: bool = True,
+                 market_data_capacity: int = 256,
+                 prediction_window: int = 50,
+                 candle_interval: float = 30.0,
+                 max_evaluation_rate: float = 2.0,
+                 max_concurrent_evaluations: int = 64,
+                 predictor: Optional[Any] = None,
+                 clock: Optional[Any] = None,
+                 market_simulator: Optional[Any] = None,
+                 quote_source: Optional[Any] = None,
+                 persistence: Optional[Any] = None,
+                 snapshot_interval: float = 60.0,
+                 quiet: bool = False):
+        """
+        Initialize the bot
         
+        Args:
+            initial_balance: Starting cash
+            trading_symbols: Symbols to trade
+            ai_confidence_threshold: Minimum prediction confidence to act on
+            max_positions: Maximum simultaneously open positions
+            c3po_url: URL of the C3PO model service
+            prediction_timeout: Per-request deadline for C3PO calls in seconds
+            prediction_cache_ttl: Seconds a cached prediction stays valid
+            iteration_latency_budget: Total seconds one iteration may spend on C3PO calls
+            hedge_predictions: Duplicate prediction requests slower than the observed p95
+            session_windows: Let the C3PO service keep each symbol's window and upload only
+                             new candles (falls back to full windows if unsupported)
+            market_data_capacity: Candles retained per symbol
+            prediction_window: Candles sent with each prediction request
+            candle_interval: Seconds between simulated feed candles
+            max_evaluation_rate: Maximum evaluations per second
+            max_concurrent_evaluations: Symbols whose exit/entry signals are evaluated at
+                                        once (bounds concurrent prediction requests)
+            predictor: Object with AsyncC3POClient's predict/predict_batch/health_check/close
+                       coroutines (default: an AsyncC3POClient for c3po_url)
+            clock: Time source with time() and now() (default: SystemClock; backtests
+                   pass a virtual clock)
+            market_simulator: Candle source with SyntheticMarket's candles()/generate() for the
+                              simulated feed, e.g. a seeded SyntheticMarket for reproducible
+                              runs (default: unseeded ±2% random walk)
+            quote_source: Publisher with an ``on_change`` callback, e.g. a TopOfBookAggregator;
+                          its consolidated mid becomes each symbol's price (default: last
+                          candle close). An existing on_change subscriber keeps receiving
+                          quotes after the bot's. Quotes can also be pushed with on_quote()
+            persistence: TradingPersistence that records executions and portfolio
+                         snapshots to SQLite (default: in-memory only)
+            snapshot_interval: Clock seconds between persisted portfolio snapshots
+            quiet: Skip the per-position lines of the iteration status log
+        """
         self.portfolio = Portfolio(initial_balance)
-        self.c3po_client = C3POClient()
+        self.clock = clock or SystemClock()
+        self.prediction_cache = PredictionCache(max_size=1024, ttl=prediction_cache_ttl)
+        self.circuit_breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+        self.c3po_client = predictor or AsyncC3POClient(
+            c3po_url,
+            timeout=prediction_timeout,
+            cache=self.prediction_cache,
+            circuit_breaker=self.circuit_breaker,
+            hedge=hedge_predictions,
+            session_windows=session_windows
+        )
+        self.iteration_latency_budget = iteration_latency_budget
+        self.persistence = persistence
+        self.snapshot_interval = snapshot_interval
+        self._last_snapshot = None
+        self.quiet = quiet
         self.trading_symbols = trading_symbols or ['BTCUSDT', 'ETHUSDT', 'SOLUSDT']
         self.ai_confidence_threshold = ai_confidence_threshold
         self.max_positions = max_positions
@@ -129,6 +362,7 @@ class AIPaperTradingBot:
             'take_profit_percent': 0.10,  # 10% take profit
             'max_holding_time': timedelta(hours=24),  # Max 24 hours per position
             'ai_weight': 0.7,  # Weight given to AI predictions vs technical analysis
+            'blended_threshold': None,  # Entry strength for blended signals (None: ai_weight * ai_confidence_threshold)
         }
         
         # Performance tracking
@@ -146,124 +380,289 @@ class AIPaperTradingBot:
             'c3po_predictions': 0,
             'c3po_successful': 0
         }
+        self.metrics = MetricsAccumulator(initial_balance)
         
-        # Market data buffer
-        self.market_data: Dict[str, List[Dict]] = {symbol: [] for symbol in self.trading_symbols}
+        # Market data buffer (columnar ring buffer per symbol)
+        self.market_data = MarketDataStore(self.trading_symbols, capacity=market_data_capacity)
+        self.prediction_window = prediction_window
+        self.indicators = IndicatorEngine()
         self.running = False
         
-        logger.info(f"🤖 AI Paper Trading Bot initialized")
-        logger.info(f"💰 Initial balance: ${initial_balance:,.2f}")
-        logger.info(f"📈 Trading symbols: {', '.join(self.trading_symbols)}")
-        logger.info(f"🎯 AI confidence threshold: {ai_confidence_threshold:.1%}")
-    
-    async def start_trading(self, duration_minutes: int = 60):
-        """Start the AI trading session"""
-        logger.info(f"🚀 Starting AI trading session for {duration_minutes} minutes...")
-        
-        # Check C3PO connection
-        if not self.c3po_client.health_check():
-            logger.error("❌ C3PO service not available! Cannot start AI trading.")
-            return
+        # Event-driven evaluation: symbols are evaluated when their data changes
+        self.candle_interval = candle_interval
+        self.market_simulator = market_simulator
         
-        logger.info("✅ C3PO AI models connected and ready")
+        # Consolidated cross-exchange mid per symbol; takes precedence over the last close
+        self._quote_prices: Dict[str, float] = {}
+        if quote_source is not None:
+            # Chain to an existing subscriber instead of replacing it (like TopOfBookAggregator.attach)
+            subscriber = quote_source.on_change
+            
+            def on_change(quote):
+                self.on_quote(quote)
+                if subscriber is not None:
+                    subscriber(quote)
+            
+            quote_source.on_change = on_change
+        self.max_evaluation_rate = max_evaluation_rate
+        self.max_concurrent_evaluations = max_concurrent_evaluations
+        self.scheduler: Optional[DataArrivalScheduler] = None
+        self.iteration = 0
         
-        self.running = True
-        start_time = time.time()
-        end_time = start_time + (duration_minutes * 60)
+        # Predictions fetched in one batch at the start of each iteration, and the
+        # time all of that iteration's C3PO calls together may spend
+        self._iteration_predictions: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._iteration_budget: Optional[LatencyBudget] = None
         
-        # Initialize market data
-        await self._initialize_market_data()
+        logger.info("🤖 AI Paper Trading Bot initialized")
+        logger.info("💰 Initial balance: $%s", format(initial_balance, ',.2f'))
+        logger.info("📈 Trading symbols: %s", ', '.join(self.trading_symbols))
+        logger.info("🎯 AI confidence threshold: %.1f%%", ai_confidence_threshold * 100)
+    
+    async def start_trading(self, duration_minutes: int = 60):
+        """Start the AI trading session"""
+        logger.info("🚀 Starting AI trading session for %s minutes...", duration_minutes)
         
         try:
-            iteration = 0
-            while time.time() < end_time and self.running:
-                iteration += 1
-                await self._trading_iteration(iteration)
-                
-                # Update every 30 seconds
-                await asyncio.sleep(30)
-                
-        except KeyboardInterrupt:
-            logger.info("⏹️ Trading session stopped by user")
-        except Exception as e:
-            logger.error(f"❌ Trading session error: {e}")
+            # Check C3PO connection
+            if not await self.c3po_client.health_check():
+                logger.error("❌ C3PO service not available! Cannot start AI trading.")
+                return
+            
+            logger.info("✅ C3PO AI models connected and ready")
+            
+            self.running = True
+            self.scheduler = DataArrivalScheduler(self._evaluate_symbols, max_rate=self.max_evaluation_rate)
+            deadline = time.monotonic() + (duration_minutes * 60)
+            
+            # Initialize market data (the initial window counts as new data for every symbol)
+            await self._initialize_market_data()
+            for symbol in self.trading_symbols:
+                self.scheduler.notify(symbol)
+            
+            feed = asyncio.create_task(self._run_market_feed())
+            try:
+                # Evaluate symbols as their candles arrive instead of on a fixed sleep
+                await self.scheduler.run(deadline=deadline)
+                    
+            except KeyboardInterrupt:
+                logger.info("⏹️ Trading session stopped by user")
+            except Exception as e:
+                logger.error("❌ Trading session error: %s", e)
+            finally:
+                self.running = False
+                feed.cancel()
+                await self._session_cleanup()
         finally:
-            self.running = False
-            await self._session_cleanup()
+            # Also reached when the session never started (both closes are idempotent)
+            if self.persistence is not None:
+                await asyncio.to_thread(self.persistence.close)
+            await self.c3po_client.close()
+    
+    def stop(self):
+        """Stop the trading session after the current evaluation"""
+        self.running = False
+        if self.scheduler is not None:
+            self.scheduler.stop()
+    
+    def on_candle(self, symbol: str, candle: Dict[str, float]):
+        """Ingest a candle from an external feed and schedule the symbol for evaluation"""
+        self.market_data.add_symbol(symbol).append_candle(candle)
+        if self.scheduler is not None:
+            self.scheduler.notify(symbol)
+    
+    def on_quote(self, quote: Any):
+        """
+        Consolidated top-of-book change (ConsolidatedQuote) for a symbol
+        
+        The quote's mid becomes the symbol's price; a quote missing a side falls
+        back to the last candle close. Symbols with an open position are marked
+        and scheduled so stop-loss/take-profit react to the book, not the next candle.
+        """
+        symbol, price = quote.symbol, quote.mid
+        if price is None:
+            self._quote_prices.pop(symbol, None)
+            return
+        self._quote_prices[symbol] = price
+        if symbol in self.portfolio.positions:
+            self.portfolio.mark_price(symbol, price)
+            if self.scheduler is not None:
+                self.scheduler.notify(symbol)
+    
+    def current_price(self, symbol: str) -> float:
+        """Consolidated mid if a quote source is publishing for the symbol, else the last close"""
+        price = self._quote_prices.get(symbol)
+        return price if price is not None else self.market_data[symbol].last_close
+    
+    async def _run_market_feed(self):
+        """Simulated exchange feed: a new candle per symbol every candle_interval seconds"""
+        while self.running:
+            await asyncio.sleep(self.candle_interval)
+            await self._update_market_data()
+    
+    async def _evaluate_symbols(self, symbols: List[str]):
+        """Scheduler handler: run one trading iteration for the symbols with new data"""
+        self.iteration += 1
+        await self._trading_iteration(self.iteration, symbols)
     
     async def _initialize_market_data(self):
         """Initialize market data for all trading symbols"""
         logger.info("📊 Initializing market data...")
         
+        now = self.clock.time()
+        simulated = self.market_simulator.candles(100) if self.market_simulator is not None else None
         for symbol in self.trading_symbols:
-            # Generate initial market data
-            self.market_data[symbol] = create_sample_market_data(symbol, 100)
-            logger.info(f"   {symbol}: {len(self.market_data[symbol])} data points")
+            # Generate initial market data, spaced one candle interval apart up to now
+            history = simulated[symbol] if simulated is not None else create_sample_market_data(symbol, 100)
+            for i, candle in enumerate(history):
+                candle['timestamp'] = now - (len(history) - 1 - i) * self.candle_interval
+            self.market_data[symbol].extend(history)
+            logger.info("   %s: %d data points", symbol, len(self.market_data[symbol]))
     
-    async def _trading_iteration(self, iteration: int):
-        """Single trading iteration"""
-        logger.info(f"\n🔄 Trading Iteration #{iteration}")
-        logger.info("-" * 50)
+    async def _trading_iteration(self, iteration: int, symbols: Optional[List[str]] = None):
+        """
+        Single trading iteration
         
-        # Update market data and prices
-        await self._update_market_data()
+        Args:
+            iteration: Iteration number (for logging)
+            symbols: Symbols with new market data to evaluate (default: all trading symbols)
+        """
+        if symbols is None:
+            symbols = list(self.trading_symbols)
+        else:
+            changed = set(symbols)
+            symbols = [symbol for symbol in self.trading_symbols if symbol in changed]
         
-        # Update existing positions
+        logger.info("\n🔄 Trading Iteration #%d (%d symbols updated)\n%s", iteration, len(symbols), "-" * 50)
+        
+        # Update existing positions with the latest prices
         self._update_positions()
         
+        # Fold new candles into the technical indicators (O(1) per candle)
+        for symbol in symbols:
+            self.indicators.sync(symbol, self.market_data[symbol])
+        
+        # Fetch this iteration's AI predictions in a single batch, within the latency budget
+        self._iteration_budget = LatencyBudget(self.iteration_latency_budget)
+        await self._prefetch_predictions(symbols)
+        
         # Check for exit signals
-        await self._check_exit_signals()
+        await self._check_exit_signals(symbols)
         
         # Look for new entry opportunities
-        await self._check_entry_signals()
+        await self._check_entry_signals(symbols)
         
         # Update performance metrics
         self._update_performance_metrics()
+        self._persist_portfolio_state()
         
         # Log portfolio status
         self._log_portfolio_status()
     
     async def _update_market_data(self):
-        """Update market data with new price movements"""
+        """Simulate a new candle for every symbol and notify the scheduler"""
+        now = self.clock.time()
+        step = self.market_simulator.generate(1) if self.market_simulator is not None else None
         for symbol in self.trading_symbols:
-            # Simulate price movement
-            last_price = self.market_data[symbol][-1]['close']
-            new_price = last_price * (1 + random.uniform(-0.02, 0.02))  # ±2% movement
+            candles = self.market_data[symbol]
+            if step is not None:
+                candle = {field: float(values[0]) for field, values in step[symbol].items()}
+                candle['timestamp'] = now
+            else:
+                # Simulate price movement
+                last_price = candles.last_close
+                new_price = last_price * (1 + random.uniform(-0.02, 0.02))  # ±2% movement
+                candle = {
+                    'open': last_price,
+                    'high': max(last_price, new_price) * 1.001,
+                    'low': min(last_price, new_price) * 0.999,
+                    'close': new_price,
+                    'volume': random.uniform(100, 1000),
+                    'timestamp': now
+                }
             
-            new_candle = {
-                'open': last_price,
-                'high': max(last_price, new_price) * 1.001,
-                'low': min(last_price, new_price) * 0.999,
-                'close': new_price,
-                'volume': random.uniform(100, 1000),
-                'timestamp': time.time()
+            # Ring buffer overwrites the oldest candle once full
+            candles.append_candle(candle)
+            if self.scheduler is not None:
+                self.scheduler.notify(symbol)
+    
+    async def _prefetch_predictions(self, symbols: List[str]):
+        """Fetch exit and entry predictions for this iteration in one batch request"""
+        wanted = [s for s in symbols if s in self.portfolio.positions]
+        if len(self.portfolio.positions) < self.max_positions:
+            wanted += [s for s in symbols if s not in self.portfolio.positions]
+        symbols = wanted
+        
+        batch = [
+            {
+                'market_data': self.market_data[symbol].to_payload(self.prediction_window),
+                'symbol': symbol,
+                'model_type': 'ensemble'
             }
-            
-            self.market_data[symbol].append(new_candle)
-            
-            # Keep buffer manageable
-            if len(self.market_data[symbol]) > 200:
-                self.market_data[symbol] = self.market_data[symbol][-100:]
+            for symbol in symbols
+        ]
+        predictions = await self.c3po_client.predict_batch(batch, budget=self._iteration_budget)
+        self._iteration_predictions = dict(zip(symbols, predictions))
+    
+    async def _get_prediction(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get this iteration's prediction for a symbol, requesting it if it was not prefetched"""
+        if symbol in self._iteration_predictions:
+            return self._iteration_predictions[symbol]
+        
+        prediction = await self.c3po_client.predict(
+            market_data=self.market_data[symbol].to_payload(self.prediction_window),
+            symbol=symbol,
+            model_type='ensemble',
+            budget=self._iteration_budget
+        )
+        self._iteration_predictions[symbol] = prediction
+        return prediction
     
     def _update_positions(self):
         """Update current positions with latest prices"""
-        for symbol, position in self.portfolio.positions.items():
-            if symbol in self.market_data and self.market_data[symbol]:
-                position.current_price = self.market_data[symbol][-1]['close']
+        for symbol in self.portfolio.positions:
+            if symbol in self._quote_prices or (symbol in self.market_data and len(self.market_data[symbol])):
+                self.portfolio.mark_price(symbol, self.current_price(symbol))
     
-    async def _check_exit_signals(self):
-        """Check for position exit signals"""
-        positions_to_close = []
+    async def _evaluate_concurrently(self, fn, items: List[Any], default: Any = None) -> List[Any]:
+        """
+        Await ``fn(item)`` for all items concurrently, at most max_concurrent_evaluations at once
         
-        for symbol, position in self.portfolio.positions.items():
-            should_exit, reason = await self._should_exit_position(position)
-            
-            if should_exit:
-                positions_to_close.append((symbol, reason))
+        Args:
+            fn: Coroutine function evaluating one item
+            items: Items to evaluate
+            default: Result for an item whose evaluation raises (logged; the others still complete)
+        
+        Returns:
+            Results in the order of ``items``, so applying them is deterministic
+        """
+        async def guarded(item):
+            try:
+                return await fn(item)
+            except Exception as e:
+                logger.error("❌ Evaluation of %s failed: %s", getattr(item, 'symbol', item), e)
+                return default
+        
+        if len(items) <= 1:
+            return [await guarded(item) for item in items]
+        
+        slots = asyncio.Semaphore(self.max_concurrent_evaluations)
+        
+        async def bounded(item):
+            async with slots:
+                return await guarded(item)
+        
+        return await asyncio.gather(*(bounded(item) for item in items))
+    
+    async def _check_exit_signals(self, symbols: List[str]):
+        """Check for position exit signals on symbols with new data"""
+        positions = [self.portfolio.positions[s] for s in symbols if s in self.portfolio.positions]
+        decisions = await self._evaluate_concurrently(self._should_exit_position, positions, default=(False, ""))
         
-        # Close positions
-        for symbol, reason in positions_to_close:
-            await self._close_position(symbol, reason)
+        # Close positions in symbol order
+        for position, (should_exit, reason) in zip(positions, decisions):
+            if should_exit:
+                await self._close_position(position.symbol, reason)
     
     async def _should_exit_position(self, position: Position) -> tuple[bool, str]:
         """Determine if a position should be exited"""
@@ -271,24 +670,26 @@ class AIPaperTradingBot:
         entry_price = position.entry_price
         
         # Time-based exit
-        if datetime.now() - position.entry_time > self.strategy_config['max_holding_time']:
+        if self.clock.now() - position.entry_time > self.strategy_config['max_holding_time']:
             return True, "max_holding_time"
         
-        # Stop loss
+        # Stop loss / take profit (mirrored for shorts)
+        stop_loss = self.strategy_config['stop_loss_percent']
+        take_profit = self.strategy_config['take_profit_percent']
         if position.side == 'long':
-            if current_price <= entry_price * (1 - self.strategy_config['stop_loss_percent']):
+            if current_price <= entry_price * (1 - stop_loss):
                 return True, "stop_loss"
-            if current_price >= entry_price * (1 + self.strategy_config['take_profit_percent']):
+            if current_price >= entry_price * (1 + take_profit):
+                return True, "take_profit"
+        else:
+            if current_price >= entry_price * (1 + stop_loss):
+                return True, "stop_loss"
+            if current_price <= entry_price * (1 - take_profit):
                 return True, "take_profit"
         
         # AI-based exit signal
         try:
-            market_data = self.market_data[position.symbol][-50:]  # Last 50 candles
-            prediction = self.c3po_client.predict(
-                market_data=market_data,
-                symbol=position.symbol,
-                model_type='ensemble'
-            )
+            prediction = await self._get_prediction(position.symbol)
             
             if prediction and prediction['confidence'] > self.ai_confidence_threshold:
                 if position.side == 'long' and prediction['direction'] == 'DOWN':
@@ -297,63 +698,88 @@ class AIPaperTradingBot:
                     return True, f"ai_exit_signal (confidence: {prediction['confidence']:.1%})"
         
         except Exception as e:
-            logger.warning(f"AI exit signal check failed for {position.symbol}: {e}")
+            logger.warning("AI exit signal check failed for %s: %s", position.symbol, e)
         
         return False, ""
     
-    async def _check_entry_signals(self):
-        """Check for new position entry signals"""
+    async def _check_entry_signals(self, symbols: List[str]):
+        """Check for new position entry signals on symbols with new data"""
         if len(self.portfolio.positions) >= self.max_positions:
             return
         
-        for symbol in self.trading_symbols:
-            if symbol in self.portfolio.positions:
-                continue  # Already have position in this symbol
-            
-            entry_signal = await self._get_entry_signal(symbol)
-            
+        # Skip symbols we already have a position in
+        candidates = [symbol for symbol in symbols if symbol not in self.portfolio.positions]
+        signals = await self._evaluate_concurrently(self._get_entry_signal, candidates,
+                                                    default={'action': 'hold', 'confidence': 0, 'reason': 'error'})
+        
+        # Open in symbol order so position and risk limits apply the same way every run
+        for symbol, entry_signal in zip(candidates, signals):
+            if len(self.portfolio.positions) >= self.max_positions:
+                break
             if entry_signal['action'] != 'hold':
                 await self._open_position(symbol, entry_signal)
     
     async def _get_entry_signal(self, symbol: str) -> Dict[str, Any]:
-        """Get entry signal for a symbol"""
+        """
+        Get entry signal for a symbol
+        
+        The C3PO prediction (signed confidence) and the local technical score are
+        blended as ``ai_weight * ai + (1 - ai_weight) * technical``; if either is
+        unavailable the other is used alone. A position is opened when the
+        strength reaches ai_confidence_threshold for a single source, or the
+        blended threshold for a blend. That defaults to ``ai_weight *
+        ai_confidence_threshold``, so neutral technicals leave AI-driven entries
+        as they were, agreeing ones lower the AI confidence needed and
+        disagreeing ones raise it.
+        """
         try:
-            market_data = self.market_data[symbol][-50:]  # Last 50 candles
-            current_price = market_data[-1]['close']
+            current_price = self.current_price(symbol)
+            technical_score = self.indicators.score(symbol)
             
             # Get AI prediction
-            prediction = self.c3po_client.predict(
-                market_data=market_data,
-                symbol=symbol,
-                model_type='ensemble'
-            )
+            prediction = await self._get_prediction(symbol)
+            
+            ai_score = None
+            if prediction:
+                self.performance_metrics['c3po_predictions'] += 1
+                direction = {'UP': 1.0, 'DOWN': -1.0}.get(prediction['direction'], 0.0)
+                ai_score = direction * prediction['confidence']
             
-            if not prediction:
+            if ai_score is None and technical_score is None:
                 return {'action': 'hold', 'confidence': 0, 'reason': 'no_ai_prediction'}
             
-            self.performance_metrics['c3po_predictions'] += 1
+            threshold = self.ai_confidence_threshold
+            if technical_score is None:
+                score, source = ai_score, 'ai'
+            elif ai_score is None:
+                score, source = technical_score, 'technical'
+            else:
+                ai_weight = self.strategy_config['ai_weight']
+                score, source = ai_weight * ai_score + (1 - ai_weight) * technical_score, 'blended'
+                threshold = self.strategy_config['blended_threshold']
+                if threshold is None:
+                    threshold = ai_weight * self.ai_confidence_threshold
             
-            # Check AI confidence
-            if prediction['confidence'] < self.ai_confidence_threshold:
-                return {'action': 'hold', 'confidence': prediction['confidence'], 'reason': 'low_ai_confidence'}
+            # Check signal strength
+            strength = abs(score)
+            if strength < threshold or score == 0:
+                return {'action': 'hold', 'confidence': strength, 'reason': f'low_{source}_confidence'}
             
-            # Determine action based on AI prediction
-            action = 'hold'
-            if prediction['direction'] == 'UP':
-                action = 'buy'
-            elif prediction['direction'] == 'DOWN':
-                action = 'sell'  # Short position
+            # Determine action based on the blended signal
+            action = 'buy' if score > 0 else 'sell'  # Short position
             
             return {
                 'action': action,
-                'confidence': prediction['confidence'],
-                'reason': f"ai_signal_{prediction['direction'].lower()}",
+                'confidence': strength,
+                'reason': f"{source}_signal_{'up' if score > 0 else 'down'}",
                 'prediction': prediction,
+                'ai_score': ai_score,
+                'technical_score': technical_score,
                 'current_price': current_price
             }
             
         except Exception as e:
-            logger.error(f"Error getting entry signal for {symbol}: {e}")
+            logger.error("Error getting entry signal for %s: %s", symbol, e)
             return {'action': 'hold', 'confidence': 0, 'reason': 'error'}
     
     async def _open_position(self, symbol: str, signal: Dict[str, Any]):
@@ -369,7 +795,7 @@ class AIPaperTradingBot:
             
             # Check if we can open position
             if not self.portfolio.can_open_position(symbol, current_price, quantity):
-                logger.warning(f"   ⚠️ Cannot open position: insufficient funds or risk limits")
+                logger.warning("   ⚠️ Cannot open position: insufficient funds or risk limits")
                 return
             
             # Create position
@@ -379,22 +805,30 @@ class AIPaperTradingBot:
                 quantity=quantity,
                 entry_price=current_price,
                 current_price=current_price,
-                entry_time=datetime.now(),
+                entry_time=self.clock.now(),
                 side=side
             )
             
             # Update portfolio
-            self.portfolio.positions[symbol] = position
-            self.portfolio.cash -= position_size
+            self.portfolio.add_position(position, position_size)
+            if self.persistence is not None:
+                self.persistence.record_trade(
+                    symbol, 'buy' if side == 'long' else 'sell', current_price, quantity,
+                    self.clock.time(), 'ai_c3po', reason=signal['reason'], confidence=confidence
+                )
             
             # Log trade
             emoji = "🟢" if action == 'buy' else "🔴"
-            logger.info(f"   {emoji} OPENED {side.upper()} position: {quantity:.6f} {symbol} at ${current_price:.2f}")
-            logger.info(f"      💡 Reason: {signal['reason']} | Confidence: {confidence:.1%}")
-            logger.info(f"      💰 Position size: ${position_size:.2f} | Remaining cash: ${self.portfolio.cash:.2f}")
+            logger.info("   %s OPENED %s position: %.6f %s at $%.2f\n"
+                        "      💡 Reason: %s | Confidence: %.1f%%\n"
+                        "      💰 Position size: $%.2f | Remaining cash: $%.2f",
+                        emoji, side.upper(), quantity, symbol, current_price,
+                        signal['reason'], confidence * 100, position_size, self.portfolio.cash,
+                        extra={'event': 'position_opened', 'symbol': symbol, 'side': side,
+                               'quantity': quantity, 'price': current_price, 'confidence': confidence})
             
         except Exception as e:
-            logger.error(f"Error opening position for {symbol}: {e}")
+            logger.error("Error opening position for %s: %s", symbol, e)
     
     async def _close_position(self, symbol: str, reason: str):
         """Close an existing position"""
@@ -418,7 +852,7 @@ class AIPaperTradingBot:
                 entry_price=position.entry_price,
                 exit_price=exit_price,
                 entry_time=position.entry_time,
-                exit_time=datetime.now(),
+                exit_time=self.clock.now(),
                 pnl=pnl,
                 pnl_percent=pnl_percent,
                 strategy='ai_c3po',
@@ -426,26 +860,33 @@ class AIPaperTradingBot:
                 c3po_used=True
             )
             
-            # Update portfolio
-            self.portfolio.cash += exit_price * position.quantity
+            # Update portfolio: the cost comes back plus P&L (for shorts that is not exit_price * quantity)
+            self.portfolio.remove_position(symbol)
+            self.portfolio.cash += position.entry_price * position.quantity + pnl
             self.portfolio.trades.append(trade)
-            del self.portfolio.positions[symbol]
+            if self.persistence is not None:
+                self.persistence.record_trade(
+                    symbol, 'sell' if position.side == 'long' else 'buy', exit_price, position.quantity,
+                    self.clock.time(), trade.strategy, pnl=pnl, reason=reason, confidence=trade.ai_confidence
+                )
             
             # Update performance tracking
+            self.metrics.record_trade(pnl)
             if pnl > 0:
-                self.performance_metrics['winning_trades'] += 1
                 self.performance_metrics['c3po_successful'] += 1
-            else:
-                self.performance_metrics['losing_trades'] += 1
             
             # Log trade
             emoji = "🟢" if pnl > 0 else "🔴"
-            logger.info(f"   {emoji} CLOSED {position.side.upper()} position: {position.quantity:.6f} {symbol} at ${exit_price:.2f}")
-            logger.info(f"      💡 Reason: {reason}")
-            logger.info(f"      💰 P&L: ${pnl:+.2f} ({pnl_percent:+.2f}%) | New cash: ${self.portfolio.cash:.2f}")
+            logger.info("   %s CLOSED %s position: %.6f %s at $%.2f\n"
+                        "      💡 Reason: %s\n"
+                        "      💰 P&L: $%+.2f (%+.2f%%) | New cash: $%.2f",
+                        emoji, position.side.upper(), position.quantity, symbol, exit_price,
+                        reason, pnl, pnl_percent, self.portfolio.cash,
+                        extra={'event': 'position_closed', 'symbol': symbol, 'side': position.side,
+                               'quantity': position.quantity, 'price': exit_price, 'pnl': pnl, 'reason': reason})
             
         except Exception as e:
-            logger.error(f"Error closing position for {symbol}: {e}")
+            logger.error("Error closing position for %s: %s", symbol, e)
     
     def _calculate_position_size(self, symbol: str, price: float, confidence: float) -> float:
         """Calculate position size based on confidence and risk management"""
@@ -463,49 +904,75 @@ class AIPaperTradingBot:
         return min(position_size, max_position, self.portfolio.cash)
     
     def _update_performance_metrics(self):
-        """Update performance metrics"""
-        trades = self.portfolio.trades
-        
-        if len(trades) > 0:
-            self.performance_metrics['total_trades'] = len(trades)
-            self.performance_metrics['win_rate'] = (self.performance_metrics['winning_trades'] / len(trades)) * 100
-            
-            winning_trades = [t for t in trades if t.pnl > 0]
-            losing_trades = [t for t in trades if t.pnl <= 0]
-            
-            if winning_trades:
-                self.performance_metrics['avg_win'] = sum(t.pnl for t in winning_trades) / len(winning_trades)
-            
-            if losing_trades:
-                self.performance_metrics['avg_loss'] = sum(t.pnl for t in losing_trades) / len(losing_trades)
-            
-            if self.performance_metrics['avg_loss'] != 0:
-                self.performance_metrics['profit_factor'] = abs(self.performance_metrics['avg_win'] / self.performance_metrics['avg_loss'])
+        """Mark equity and refresh performance metrics from the running accumulator (O(1))"""
+        self.metrics.mark_equity(self.portfolio.total_value)
+        self.performance_metrics.update(self.metrics.snapshot())
         
         # AI accuracy
         if self.performance_metrics['c3po_predictions'] > 0:
             self.performance_metrics['ai_accuracy'] = (self.performance_metrics['c3po_successful'] / self.performance_metrics['c3po_predictions']) * 100
     
+    def _persist_portfolio_state(self, force: bool = False):
+        """Queue a portfolio snapshot if snapshot_interval has elapsed"""
+        if self.persistence is None:
+            return
+        
+        now = self.clock.time()
+        if not force and self._last_snapshot is not None and now - self._last_snapshot < self.snapshot_interval:
+            return
+        self._last_snapshot = now
+        
+        self.persistence.record_portfolio_state(
+            now,
+            cash=self.portfolio.cash,
+            total_value=self.portfolio.total_value,
+            initial_value=self.portfolio.initial_cash,
+            unrealized_pnl=self.portfolio.unrealized_pnl,
+            positions=[
+                {'symbol': p.symbol, 'side': p.side, 'quantity': p.quantity,
+                 'entry_price': p.entry_price, 'entry_time': p.entry_time.timestamp()}
+                for p in self.portfolio.positions.values()
+            ]
+        )
+    
     def _log_portfolio_status(self):
-        """Log current portfolio status"""
-        logger.info(f"\n📊 Portfolio Status:")
-        logger.info(f"   💰 Total Value: ${self.portfolio.total_value:.2f}")
-        logger.info(f"   💵 Cash: ${self.portfolio.cash:.2f}")
-        logger.info(f"   📈 Total P&L: ${self.portfolio.total_pnl:+.2f} ({self.portfolio.total_pnl_percent:+.2f}%)")
-        logger.info(f"   📊 Exposure: {self.portfolio.exposure_percent:.1f}%")
-        logger.info(f"   🎯 Open Positions: {len(self.portfolio.positions)}")
+        """Log current portfolio status (one record; per-position lines unless quiet)"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        portfolio = self.portfolio
+        metrics = self.performance_metrics
+        lines = [
+            "\n📊 Portfolio Status:",
+            "   💰 Total Value: $%.2f",
+            "   💵 Cash: $%.2f",
+            "   📈 Total P&L: $%+.2f (%+.2f%%)",
+            "   📊 Exposure: %.1f%%",
+            "   🎯 Open Positions: %d (unrealized P&L: $%+.2f)",
+        ]
+        args = [portfolio.total_value, portfolio.cash, portfolio.total_pnl, portfolio.total_pnl_percent,
+                portfolio.exposure_percent, len(portfolio.positions), portfolio.unrealized_pnl]
         
         # Show open positions
-        for symbol, position in self.portfolio.positions.items():
-            emoji = "🟢" if position.unrealized_pnl > 0 else "🔴"
-            logger.info(f"      {emoji} {symbol}: {position.quantity:.6f} @ ${position.entry_price:.2f} "
-                       f"(P&L: ${position.unrealized_pnl:+.2f})")
+        if not self.quiet:
+            for symbol, position in portfolio.positions.items():
+                lines.append("      %s %s: %.6f @ $%.2f (P&L: $%+.2f)")
+                args += ["🟢" if position.unrealized_pnl > 0 else "🔴", symbol,
+                         position.quantity, position.entry_price, position.unrealized_pnl]
         
         # Show recent performance
-        if self.performance_metrics['total_trades'] > 0:
-            logger.info(f"   📊 Performance: {self.performance_metrics['total_trades']} trades, "
-                       f"{self.performance_metrics['win_rate']:.1f}% win rate, "
-                       f"{self.performance_metrics['ai_accuracy']:.1f}% AI accuracy")
+        if metrics['total_trades'] > 0:
+            lines.append("   📊 Performance: %d trades, %.1f%% win rate, %.1f%% AI accuracy")
+            args += [metrics['total_trades'], metrics['win_rate'], metrics['ai_accuracy']]
+        
+        logger.info("\n".join(lines), *args, extra={
+            'event': 'portfolio_status',
+            'iteration': self.iteration,
+            'total_value': portfolio.total_value,
+            'cash': portfolio.cash,
+            'exposure_percent': portfolio.exposure_percent,
+            'open_positions': len(portfolio.positions),
+        })
     
     async def _session_cleanup(self):
         """Cleanup at end of session"""
@@ -515,6 +982,15 @@ class AIPaperTradingBot:
         # Close all open positions
         for symbol in list(self.portfolio.positions.keys()):
             await self._close_position(symbol, "session_end")
+        self._update_performance_metrics()
+        
+        # Flush persisted history
+        if self.persistence is not None:
+            self._persist_portfolio_state(force=True)
+            await asyncio.to_thread(self.persistence.close)
+        
+        # Release pooled C3PO connections
+        await self.c3po_client.close()
         
         # Final performance summary
         self._print_final_summary()
@@ -525,30 +1001,49 @@ class AIPaperTradingBot:
         logger.info("=" * 60)
         
         # Portfolio performance
-        logger.info(f"💰 Final Portfolio Value: ${self.portfolio.total_value:.2f}")
-        logger.info(f"📈 Total Return: ${self.portfolio.total_pnl:+.2f} ({self.portfolio.total_pnl_percent:+.2f}%)")
-        logger.info(f"🎯 Total Trades: {self.performance_metrics['total_trades']}")
+        metrics = self.performance_metrics
+        logger.info("💰 Final Portfolio Value: $%.2f", self.portfolio.total_value)
+        logger.info("📈 Total Return: $%+.2f (%+.2f%%)", self.portfolio.total_pnl, self.portfolio.total_pnl_percent)
+        logger.info("🎯 Total Trades: %d", metrics['total_trades'])
         
-        if self.performance_metrics['total_trades'] > 0:
-            logger.info(f"🏆 Win Rate: {self.performance_metrics['win_rate']:.1f}%")
-            logger.info(f"💡 Average Win: ${self.performance_metrics['avg_win']:.2f}")
-            logger.info(f"💔 Average Loss: ${self.performance_metrics['avg_loss']:.2f}")
-            logger.info(f"⚖️ Profit Factor: {self.performance_metrics['profit_factor']:.2f}")
+        if metrics['total_trades'] > 0:
+            logger.info("🏆 Win Rate: %.1f%%", metrics['win_rate'])
+            logger.info("💡 Average Win: $%.2f", metrics['avg_win'])
+            logger.info("💔 Average Loss: $%.2f", metrics['avg_loss'])
+            logger.info("⚖️ Profit Factor: %.2f", metrics['profit_factor'])
+        logger.info("📉 Max Drawdown: %.2f%%", metrics['max_drawdown'])
+        logger.info("📐 Sharpe Ratio (per iteration): %.3f", metrics['sharpe_ratio'])
         
         # AI performance
-        logger.info(f"\n🤖 AI Performance:")
-        logger.info(f"   🔮 C3PO Predictions: {self.performance_metrics['c3po_predictions']}")
-        logger.info(f"   🎯 AI Accuracy: {self.performance_metrics['ai_accuracy']:.1f}%")
-        logger.info(f"   ✅ Successful AI Trades: {self.performance_metrics['c3po_successful']}")
+        logger.info("\n🤖 AI Performance:")
+        logger.info("   🔮 C3PO Predictions: %d", metrics['c3po_predictions'])
+        logger.info("   🎯 AI Accuracy: %.1f%%", metrics['ai_accuracy'])
+        logger.info("   ✅ Successful AI Trades: %d", metrics['c3po_successful'])
+        cache_stats = self.prediction_cache.stats
+        logger.info("   🗃️ Prediction Cache: %d hits / %d misses (%.1f%% hit rate)",
+                    cache_stats['hits'], cache_stats['misses'], cache_stats['hit_rate'] * 100)
+        logger.info("   ⚡ Circuit Breaker: %s (%d calls failed fast) | Hedged requests: %d",
+                    self.circuit_breaker.state, self.circuit_breaker.rejected,
+                    getattr(self.c3po_client, 'hedged_requests', 0))
+        sessions = getattr(self.c3po_client, 'sessions', None)
+        if sessions is not None and (sessions.full_uploads or sessions.delta_uploads):
+            logger.info("   🪟 Session windows: %d delta / %d full uploads (%d resyncs)",
+                        sessions.delta_uploads, sessions.full_uploads, sessions.resyncs)
+        
+        if self.persistence is not None:
+            db_stats = self.persistence.stats
+            logger.info("\n🗄️ Persisted %d rows in %d batches to %s (session %s, %d dropped)",
+                        db_stats['written'], db_stats['batches'], self.persistence.db_path,
+                        self.persistence.session_id, db_stats['dropped'])
         
         # Trade history
         if self.portfolio.trades:
-            logger.info(f"\n📝 Trade History:")
-            for i, trade in enumerate(self.portfolio.trades[-10:], 1):  # Last 10 trades
+            logger.info("\n📝 Trade History:")
+            for i, trade in enumerate(self.portfolio.trades.last(10), 1):
                 emoji = "🟢" if trade.pnl > 0 else "🔴"
-                logger.info(f"   {i:2d}. {emoji} {trade.side.upper()} {trade.symbol}: "
-                           f"${trade.pnl:+.2f} ({trade.pnl_percent:+.1f}%) | "
-                           f"AI: {trade.ai_confidence:.1%}")
+                logger.info("   %2d. %s %s %s: $%+.2f (%+.1f%%) | AI: %.1f%%",
+                            i, emoji, trade.side.upper(), trade.symbol,
+                            trade.pnl, trade.pnl_percent, trade.ai_confidence * 100)
 
 async def main():
     """Run the AI paper trading bot"""
@@ -561,15 +1056,23 @@ async def main():
         'trading_symbols': ['BTCUSDT', 'ETHUSDT', 'SOLUSDT'],
         'ai_confidence_threshold': 0.7,
         'session_duration': 10,  # minutes
-        'max_positions': 3
+        'max_positions': 3,
+        'database': 'paper-trading.db',
+        'json_logs': False,  # JSON-lines log file instead of plain text
+        'quiet': False  # Skip per-position lines in iteration status
     }
     
+    # Log I/O on a background thread
+    log_listener = configure_logging(queued=True, json_lines=config['json_logs'])
+    
     # Create and run bot
     bot = AIPaperTradingBot(
         initial_balance=config['initial_balance'],
         trading_symbols=config['trading_symbols'],
         ai_confidence_threshold=config['ai_confidence_threshold'],
-        max_positions=config['max_positions']
+        max_positions=config['max_positions'],
+        persistence=TradingPersistence(config['database'], session_name='AI Paper Trading Bot (C3PO)'),
+        quiet=config['quiet']
     )
     
     try:
@@ -577,7 +1080,9 @@ async def main():
     except KeyboardInterrupt:
         logger.info("🛑 Bot stopped by user")
     except Exception as e:
-        logger.error(f"❌ Bot error: {e}")
+        logger.error("❌ Bot error: %s", e)
+    finally:
+        log_listener.stop()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
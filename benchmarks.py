@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+⏱️ PERFORMANCE BENCHMARKS
+=========================
+
+Repeatable measurements of the bot's and client's hot paths, written as JSON
+so successive releases can be compared.
+
+    iteration   AIPaperTradingBot._trading_iteration latency per stage (market
+                update, position mark, indicators, predictions, exit checks,
+                entry checks, metrics, persistence, logging) for 3 to 1,000
+                symbols, with a seeded SyntheticMarket feed, the in-process
+                momentum predictor and a virtual clock
+    memory      traced Python allocations per tracked symbol
+    client      C3POClient.predict request encoding, response decoding and
+                full round trip per wire format against a local MockC3POServer
+
+Logging goes through the production queue handler into /dev/null, so the
+logging stage measures what the trading loop actually pays.
+
+Usage:
+    python benchmarks.py                      # writes benchmark-results.json
+
+    results = run_benchmarks(symbol_counts=(3, 100), iterations=50)
+    regressions = compare_results(json.load(open("baseline.json")), results, tolerance=0.25)
+"""
+
+import asyncio
+import contextlib
+import inspect
+import json
+import logging
+import logging.handlers
+import os
+import platform
+import queue
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Sequence
+
+import numpy as np
+
+from ai_paper_trading_bot import AIPaperTradingBot
+from backtest import LocalPredictor, VirtualClock, momentum_prediction
+from c3po_client import (C3POClient, MSGPACK_CONTENT_TYPE, WIRE_FORMATS, decode_predict_response,
+                         encode_predict_request, msgpack)
+from latency_stats import latency_summary
+from mock_c3po_server import MockC3POServer
+from synthetic_market_data import BASE_PRICES, SyntheticMarket, generate_candles
+from trading_logging import DEFAULT_FORMAT, DeferredQueueHandler
+
+logger = logging.getLogger(__name__)
+
+# Stage name -> bot method timed for that stage ("indicators" wraps IndicatorEngine.sync)
+ITERATION_STAGES = (
+    ('market_update', '_update_market_data'),
+    ('position_mark', '_update_positions'),
+    ('indicators', None),
+    ('predictions', '_prefetch_predictions'),
+    ('exit_checks', '_check_exit_signals'),
+    ('entry_checks', '_check_entry_signals'),
+    ('metrics', '_update_performance_metrics'),
+    ('persistence', '_persist_portfolio_state'),
+    ('logging', '_log_portfolio_status'),
+)
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def benchmark_symbols(count: int) -> List[str]:
+    """The known symbols first, then synthetic ones"""
+    symbols = list(BASE_PRICES)[:count]
+    symbols += [f"SYN{i:04d}USDT" for i in range(count - len(symbols))]
+    return symbols
+
+@contextlib.contextmanager
+def production_logging(level: int = logging.INFO) -> Iterator[None]:
+    """Route all logging through the bot's deferred queue handler into /dev/null"""
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    sink = logging.FileHandler(os.devnull)
+    sink.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+    listener = logging.handlers.QueueListener(log_queue, sink)
+    listener.start()
+    root.handlers = [DeferredQueueHandler(log_queue)]
+    root.setLevel(level)
+    try:
+        yield
+    finally:
+        listener.stop()
+        sink.close()
+        root.handlers = saved_handlers
+        root.setLevel(saved_level)
+
+class StageTimer:
+    """Accumulates the time a bot spends in each iteration stage"""
+
+    def __init__(self, bot: AIPaperTradingBot):
+        """
+        Instrument a bot instance (its class is untouched)
+
+        Args:
+            bot: Bot whose stage methods are wrapped
+        """
+        self.samples: Dict[str, List[float]] = {stage: [] for stage, _ in ITERATION_STAGES}
+        self._current: Dict[str, float] = {}
+
+        for stage, method in ITERATION_STAGES:
+            if method is None:
+                bot.indicators.sync = self._wrap(stage, bot.indicators.sync)
+            else:
+                setattr(bot, method, self._wrap(stage, getattr(bot, method)))
+
+    def _wrap(self, stage: str, fn: Callable) -> Callable:
+        current = self._current
+
+        if inspect.iscoroutinefunction(fn):
+            async def timed_async(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    current[stage] = current.get(stage, 0.0) + time.perf_counter() - started
+            return timed_async
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                current[stage] = current.get(stage, 0.0) + time.perf_counter() - started
+        return timed
+
+    def begin(self):
+        self._current.clear()
+
+    def end(self):
+        """Record the finished iteration's per-stage totals"""
+        for stage in self.samples:
+            self.samples[stage].append(self._current.get(stage, 0.0))
+
+def _make_bot(symbols: List[str], seed: int, candle_interval: float) -> AIPaperTradingBot:
+    return AIPaperTradingBot(
+        trading_symbols=symbols,
+        predictor=LocalPredictor(momentum_prediction),
+        clock=VirtualClock(1_700_000_000.0),
+        market_simulator=SyntheticMarket(symbols, correlation=0.3, interval=candle_interval, seed=seed),
+        candle_interval=candle_interval,
+        ai_confidence_threshold=0.55,
+        max_positions=max(5, len(symbols) // 10)
+    )
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+async def benchmark_iteration(symbol_count: int,
+                              iterations: int = 50,
+                              warmup: int = 10,
+                              seed: int = 7,
+                              candle_interval: float = 60.0) -> Dict[str, Any]:
+    """
+    Time market update plus _trading_iteration for every symbol, by stage
+
+    Args:
+        symbol_count: Symbols tracked (and updated every iteration)
+        iterations: Measured iterations
+        warmup: Unmeasured iterations first (indicators warm up, positions open)
+        seed: Market data seed
+        candle_interval: Simulated seconds between iterations
+
+    Returns:
+        Total and per-stage latency summaries
+    """
+    symbols = benchmark_symbols(symbol_count)
+    bot = _make_bot(symbols, seed, candle_interval)
+    await bot._initialize_market_data()
+    timer = StageTimer(bot)
+
+    totals = []
+    for i in range(warmup + iterations):
+        bot.clock.advance(candle_interval)
+        timer.begin()
+        started = time.perf_counter()
+        await bot._update_market_data()
+        bot.iteration += 1
+        await bot._trading_iteration(bot.iteration, symbols)
+        elapsed = time.perf_counter() - started
+        if i >= warmup:
+            timer.end()
+            totals.append(elapsed)
+
+    total = latency_summary(totals)
+    return {
+        'symbols': symbol_count,
+        'iterations': iterations,
+        'total': total,
+        'per_symbol_us': total.get('mean_ms', 0.0) * 1000.0 / symbol_count,
+        'stages': {stage: latency_summary(samples) for stage, samples in timer.samples.items()},
+        'open_positions': len(bot.portfolio.positions),
+        'trades': len(bot.portfolio.trades),
+    }
+
+async def measure_memory(symbol_count: int, seed: int = 7, candle_interval: float = 60.0) -> Dict[str, Any]:
+    """
+    Traced Python allocations of a bot tracking ``symbol_count`` symbols
+
+    Covers construction, the initial market data, and one iteration (indicator
+    state and prediction bookkeeping for every symbol).
+    """
+    symbols = benchmark_symbols(symbol_count)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        bot = _make_bot(symbols, seed, candle_interval)
+        await bot._initialize_market_data()
+        bot.iteration += 1
+        await bot._trading_iteration(bot.iteration, symbols)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return {
+        'symbols': symbol_count,
+        'allocated_bytes': allocated,
+        'bytes_per_symbol': allocated / symbol_count,
+        'market_data_bytes_per_symbol': bot.market_data.nbytes / symbol_count,
+    }
+
+def benchmark_client(window: int = 50, requests: int = 200, seed: int = 7) -> Dict[str, Any]:
+    """
+    C3POClient.predict cost per wire format: request encoding, response decoding, full round trip
+
+    The round trip runs against a zero-latency MockC3POServer over loopback,
+    so it is client plus HTTP overhead; cache and coalescing are disabled.
+    """
+    market_data = generate_candles("BTCUSDT", window, seed=seed)
+    wire_formats = [f for f in WIRE_FORMATS if f != "msgpack" or msgpack is not None]
+
+    results: Dict[str, Any] = {'window': window, 'requests': requests, 'formats': {}}
+    with MockC3POServer(seed=seed) as server:
+        for wire_format in wire_formats:
+            # Encoding as sent on the wire
+            encode = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                body, _ = encode_predict_request(market_data, wire_format=wire_format)
+                encode.append(time.perf_counter() - started)
+
+            client = C3POClient(server.url, coalesce=False, wire_format=wire_format)
+            client.predict(market_data, symbol="BTCUSDT")
+            round_trip = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                prediction = client.predict(market_data, symbol="BTCUSDT")
+                round_trip.append(time.perf_counter() - started)
+            if prediction is None:
+                logger.error("❌ Benchmark predictions failed for %s", wire_format)
+
+            # Decoding a representative response in the format the service answers with
+            response = {"success": True, "symbol": "BTCUSDT", "model_type": "ensemble",
+                        "prediction": {"direction": "UP", "confidence": 0.75, "prediction": 0.75}}
+            content_type = MSGPACK_CONTENT_TYPE if wire_format == "msgpack" else "application/json"
+            raw = msgpack.packb(response) if wire_format == "msgpack" else json.dumps(response).encode()
+            decode = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                decode_predict_response(raw, content_type)
+                decode.append(time.perf_counter() - started)
+
+            client.session.close()
+            results['formats'][wire_format] = {
+                'request_bytes': len(body),
+                'encode': latency_summary(encode),
+                'round_trip': latency_summary(round_trip),
+                'decode': latency_summary(decode),
+            }
+    return results
+
+def run_benchmarks(symbol_counts: Sequence[int] = (3, 10, 100, 1000),
+                   iterations: int = 50,
+                   client_requests: int = 200,
+                   window: int = 50,
+                   seed: int = 7) -> Dict[str, Any]:
+    """
+    Run the full suite
+
+    Args:
+        symbol_counts: Tracked-symbol counts for the iteration and memory benchmarks
+        iterations: Measured trading iterations per symbol count
+        client_requests: Samples per client measurement
+        window: Candles per prediction request
+        seed: Seed for market data and the mock service
+
+    Returns:
+        JSON-serializable results with environment metadata
+    """
+    results: Dict[str, Any] = {
+        'metadata': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'msgpack': msgpack is not None,
+            'seed': seed,
+        },
+        'iteration': [],
+        'memory': [],
+    }
+
+    with production_logging():
+        for count in symbol_counts:
+            logger.warning("⏱️ Benchmarking %d symbols", count)
+            results['iteration'].append(asyncio.run(benchmark_iteration(count, iterations, seed=seed)))
+            results['memory'].append(asyncio.run(measure_memory(count, seed=seed)))
+        results['client'] = benchmark_client(window, client_requests, seed=seed)
+
+    return results
+
+def compare_results(baseline: Dict[str, Any],
+                    current: Dict[str, Any],
+                    tolerance: float = 0.2) -> List[str]:
+    """
+    Metrics that got worse than baseline by more than ``tolerance``
+
+    Compares p50 latencies and per-symbol memory present in both results.
+
+    Returns:
+        Human-readable regression descriptions (empty if none)
+    """
+    old, new = _comparable_metrics(baseline), _comparable_metrics(current)
+    regressions = []
+    for name in sorted(old.keys() & new.keys()):
+        if old[name] > 0 and new[name] > old[name] * (1 + tolerance):
+            regressions.append(f"{name}: {old[name]:.4g} -> {new[name]:.4g} (+{new[name] / old[name] - 1:.0%})")
+    return regressions
+
+def _comparable_metrics(results: Dict[str, Any]) -> Dict[str, float]:
+    metrics = {}
+    for entry in results.get('iteration', []):
+        prefix = f"iteration[{entry['symbols']}]"
+        metrics[f"{prefix}.total.p50_ms"] = entry['total'].get('p50_ms', 0.0)
+        for stage, summary in entry['stages'].items():
+            metrics[f"{prefix}.{stage}.p50_ms"] = summary.get('p50_ms', 0.0)
+    for entry in results.get('memory', []):
+        metrics[f"memory[{entry['symbols']}].bytes_per_symbol"] = entry['bytes_per_symbol']
+    for wire_format, entry in results.get('client', {}).get('formats', {}).items():
+        for measurement in ('encode', 'round_trip', 'decode'):
+            metrics[f"client[{wire_format}].{measurement}.p50_ms"] = entry[measurement].get('p50_ms', 0.0)
+    return metrics
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+def main():
+    """Run the suite, write JSON and compare against a baseline if one exists"""
+    config = {
+        'output': 'benchmark-results.json',
+        'baseline': 'benchmark-baseline.json',
+        'symbol_counts': (3, 10, 100, 1000),
+        'iterations': 50,
+        'client_requests': 200,
+        'tolerance': 0.2,
+    }
+
+    print("⏱️ Performance Benchmarks")
+    print("=" * 60)
+
+    results = run_benchmarks(config['symbol_counts'], config['iterations'], config['client_requests'])
+    with open(config['output'], 'w') as f:
+        json.dump(results, f, indent=2)
+
+    for entry, memory in zip(results['iteration'], results['memory']):
+        slowest = sorted(entry['stages'].items(), key=lambda item: -item[1]['mean_ms'])[:3]
+        print(f"🔄 {entry['symbols']:5d} symbols: p50 {entry['total']['p50_ms']:8.2f} ms | "
+              f"p99 {entry['total']['p99_ms']:8.2f} ms | {entry['per_symbol_us']:6.1f} µs/symbol | "
+              f"{memory['bytes_per_symbol'] / 1024:6.1f} KiB/symbol | "
+              + ", ".join(f"{stage} {summary['mean_ms']:.2f}" for stage, summary in slowest))
+    for wire_format, entry in results['client']['formats'].items():
+        print(f"🔌 {wire_format:8s}: {entry['request_bytes']:6d} B | encode {entry['encode']['p50_ms']:.3f} ms | "
+              f"round trip {entry['round_trip']['p50_ms']:.3f} ms | decode {entry['decode']['p50_ms']:.4f} ms")
+    print(f"\n💾 Results written to {config['output']}")
+
+    if os.path.exists(config['baseline']):
+        with open(config['baseline']) as f:
+            regressions = compare_results(json.load(f), results, config['tolerance'])
+        if regressions:
+            print(f"⚠️ {len(regressions)} regressions vs {config['baseline']}:")
+            for regression in regressions:
+                print(f"   {regression}")
+        else:
+            print(f"✅ No regressions vs {config['baseline']}")
+
+if __name__ == "__main__":
+    main()
@@ -12,18 +12,252 @@ Usage:
     client = C3POClient("http://localhost:8002")
     prediction = client.predict(market_data, symbol="BTCUSDT")
     print(f"Prediction: {prediction['direction']} with {prediction['confidence']:.2%} confidence")
+
+Async usage (non-blocking, for use inside an event loop):
+    from c3po_client import AsyncC3POClient
+    
+    async with AsyncC3POClient("http://localhost:8002") as client:
+        prediction = await client.predict(market_data, symbol="BTCUSDT", timeout=2.0)
 """
 
+import asyncio
 import requests
 import json
-from typing import Dict, List, Optional, Any, Union
+import struct
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime
 import logging
 
+try:
+    import msgpack  # Optional: compact binary wire format
+except ImportError:
+    msgpack = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Request encodings, most compact first (see WIRE FORMAT below)
+WIRE_FORMATS = ("msgpack", "columnar", "json")
+MSGPACK_CONTENT_TYPE = "application/x-msgpack"
+
+# Seconds before a failed wire-format probe (/health) is retried; JSON is sent meanwhile
+NEGOTIATION_RETRY = 30.0
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for C3PO requests
+    
+    CLOSED: requests flow normally. After ``failure_threshold`` consecutive
+    errors/timeouts the breaker OPENs and requests fail fast without touching
+    the network. Once ``reset_timeout`` has passed it is HALF_OPEN and lets a
+    single probe through: success closes it, failure re-opens it.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize circuit breaker
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before probing again
+            clock: Monotonic time source (injectable for tests and backtests)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.consecutive_failures = 0
+        self.rejected = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_started_at: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        """Current state (an open circuit turns half-open once reset_timeout has passed)"""
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+    
+    def allow_request(self) -> bool:
+        """Whether a request may be sent now (counts rejections)"""
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            
+            if state == self.HALF_OPEN:
+                # One probe at a time; a probe that never reported back is replaced
+                now = self.clock()
+                if self._probe_started_at is None or now - self._probe_started_at >= self.reset_timeout:
+                    self._probe_started_at = now
+                    return True
+            
+            self.rejected += 1
+            return False
+    
+    def record_success(self):
+        """Report a successful request (closes the circuit)"""
+        with self._lock:
+            self.consecutive_failures = 0
+            self._state = self.CLOSED
+            self._probe_started_at = None
+    
+    def record_failure(self):
+        """Report a failed or timed-out request"""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN or self._probe_started_at is not None:
+                    logger.warning("⚡ C3PO circuit opened after %d consecutive failures", self.consecutive_failures)
+                self._state = self.OPEN
+                self._opened_at = self.clock()
+                self._probe_started_at = None
+
+class LatencyBudget:
+    """
+    Deadline shared by every C3PO call made within one unit of work
+    
+    Pass the same budget to several predict()/predict_batch() calls (e.g. one
+    trading iteration) and each request is capped at the time left; once the
+    budget is spent, calls return None immediately instead of waiting.
+    """
+    
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Start a latency budget
+        
+        Args:
+            seconds: Total time allowed from now
+            clock: Monotonic time source
+        """
+        self.seconds = seconds
+        self.clock = clock
+        self.deadline = clock() + seconds
+    
+    def remaining(self) -> float:
+        """Seconds left (never negative)"""
+        return max(0.0, self.deadline - self.clock())
+    
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+class LatencyTracker:
+    """Rolling window of request latencies with percentile lookup"""
+    
+    def __init__(self, window: int = 256):
+        self._samples: deque = deque(maxlen=window)
+    
+    def __len__(self) -> int:
+        return len(self._samples)
+    
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+    
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency at quantile ``q`` (0-1) over the window, or None without samples"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+class PredictionCache:
+    """
+    TTL + size-bounded LRU cache of C3PO predictions
+    
+    Entries are keyed by (symbol, model_type, prediction_horizon, timeframe,
+    fingerprint of the trailing candles), so two calls over the same window
+    share one model evaluation while any new candle produces a fresh key.
+    Safe to share between threads and between several clients.
+    """
+    
+    def __init__(self,
+                 max_size: int = 1024,
+                 ttl: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize prediction cache
+        
+        Args:
+            max_size: Maximum number of cached predictions (least recently used evicted first)
+            ttl: Seconds a cached prediction stays valid
+            clock: Monotonic time source (injectable for tests and backtests)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(market_data: List[Dict[str, float]],
+                 symbol: str,
+                 model_type: str,
+                 prediction_horizon: str,
+                 timeframe: str) -> Tuple:
+        """Build the cache key for a prediction request"""
+        return (symbol, model_type, prediction_horizon, timeframe, _window_fingerprint(market_data))
+    
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached prediction
+        
+        Returns:
+            Copy of the cached prediction, or None on miss/expiry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, prediction = entry
+                if expires_at > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(prediction)
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def put(self, key: Tuple, prediction: Dict[str, Any]):
+        """Store a successful prediction, evicting the least recently used entries if full"""
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, dict(prediction))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """Drop all cached predictions (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'hit_rate': (self.hits / lookups) if lookups else 0.0
+        }
+
 class C3POClient:
     """
     Lightweight client for C3PO AI trading model service
@@ -32,37 +266,66 @@ class C3POClient:
     - Simple API for getting trading predictions
     - Multiple model types (autoencoder, vae, transformer, ensemble)
     - Error handling and fallbacks
+    - Optional circuit breaker and per-call latency budgets
     - Minimal dependencies (only requests)
     """
     
-    def __init__(self, base_url: str = "http://localhost:8002", timeout: int = 30):
+    def __init__(self,
+                 base_url: str = "http://localhost:8002",
+                 timeout: int = 30,
+                 cache: Optional[PredictionCache] = None,
+                 coalesce: bool = True,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 wire_format: str = "auto",
+                 session_windows: bool = False):
         """
         Initialize C3PO client
         
         Args:
             base_url: URL of the C3PO model service
             timeout: Request timeout in seconds
+            cache: Optional prediction cache consulted before calling the service
+            coalesce: Share one HTTP request between identical concurrent predict() calls
+            circuit_breaker: Optional breaker that fails fast while the service is down
+            wire_format: Prediction payload encoding: "json", "columnar", "msgpack", or
+                         "auto" to use the most compact one the service advertises
+            session_windows: Keep rolling windows on the service and upload only new
+                             candles (needs candle timestamps; falls back to full
+                             windows if the service has no session endpoint)
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
+        self.cache = cache
+        self.coalesce = coalesce
+        self.circuit_breaker = circuit_breaker
+        self.latency_tracker = LatencyTracker()
         self.session = requests.Session()
+        self.batch_supported = True
+        self.session_windows = session_windows
+        self.sessions = _SessionWindows()
+        self._in_flight = _SingleFlight()
+        self.wire_format = wire_format
+        self._wire_format = _validate_wire_format(wire_format)
+        self._negotiate_after = 0.0
         
         # Test connection
         try:
             response = self._make_request('GET', '/health')
+            self._update_wire_format(response)
             if response and response.get('status') == 'healthy':
-                logger.info(f"✅ Connected to C3PO service at {base_url}")
+                logger.info("✅ Connected to C3PO service at %s", base_url)
             else:
-                logger.warning(f"⚠️ C3PO service not responding properly")
+                logger.warning("⚠️ C3PO service not responding properly")
         except Exception as e:
-            logger.error(f"❌ Failed to connect to C3PO service: {e}")
+            logger.error("❌ Failed to connect to C3PO service: %s", e)
     
     def predict(self,
                 market_data: List[Dict[str, float]],
                 symbol: str = "BTCUSDT",
                 model_type: str = "ensemble",
                 prediction_horizon: str = "1h",
-                timeframe: str = "1m") -> Optional[Dict[str, Any]]:
+                timeframe: str = "1m",
+                budget: Optional[LatencyBudget] = None) -> Optional[Dict[str, Any]]:
         """
         Get trading prediction from C3PO models
         
@@ -73,45 +336,105 @@ class C3POClient:
             model_type: Model to use ("autoencoder", "vae", "transformer", "ensemble")
             prediction_horizon: Time horizon ("1m", "5m", "15m", "1h", "4h", "24h")
             timeframe: Data timeframe ("1m", "5m", "15m", "1h")
+            budget: Optional latency budget capping the request timeout
         
         Returns:
             Prediction dictionary with keys: direction, confidence, prediction, model_type
             None if prediction fails
         """
         try:
-            # Prepare request
-            request_data = {
-                "market_data": market_data,
-                "symbol": symbol,
-                "timeframe": timeframe,
-                "model_type": model_type,
-                "prediction_horizon": prediction_horizon
-            }
+            key = None
+            if self.cache is not None or self.coalesce:
+                key = PredictionCache.make_key(market_data, symbol, model_type, prediction_horizon, timeframe)
             
-            # Make prediction request
-            response = self._make_request('POST', '/predict', json=request_data)
+            # Serve repeated windows from the cache
+            if self.cache is not None:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return cached
             
-            if response and response.get('success'):
-                prediction = response.get('prediction', {})
-                return {
-                    'direction': prediction.get('direction', 'NEUTRAL'),
-                    'confidence': prediction.get('confidence', 0.5),
-                    'prediction': prediction.get('prediction', 0.5),
-                    'model_type': response.get('model_type', model_type),
-                    'symbol': response.get('symbol', symbol),
-                    'timestamp': response.get('timestamp'),
-                    'individual_predictions': prediction.get('individual_predictions', {}),
-                    'success': True
-                }
-            else:
-                error_msg = response.get('message', 'Unknown error') if response else 'No response'
-                logger.error(f"❌ Prediction failed: {error_msg}")
-                return None
+            def fetch() -> Optional[Dict[str, Any]]:
+                # Prepare request
+                request_data = _build_predict_request(
+                    market_data, symbol, model_type, prediction_horizon, timeframe
+                )
+                
+                # Make prediction request (only new candles when the service holds the window)
+                fetched = None
+                if self.session_windows and _has_timestamps([request_data]):
+                    fetched = self._predict_sessions([request_data], budget=budget)
+                if fetched is not None:
+                    prediction = fetched[0]
+                else:
+                    response = self._post('/predict', request_data,
+                                          timeout=_effective_timeout(self.timeout, None, budget))
+                    prediction = _parse_predict_response(response, symbol, model_type)
+                
+                if prediction and self.cache is not None:
+                    self.cache.put(key, prediction)
+                return prediction
+            
+            # Identical calls already in flight on other threads share this request
+            if self.coalesce:
+                return self._in_flight.run(key, fetch)
+            return fetch()
                 
         except Exception as e:
-            logger.error(f"❌ Error making prediction: {e}")
+            logger.error("❌ Error making prediction: %s", e)
             return None
     
+    def predict_batch(self,
+                      requests: List[Dict[str, Any]],
+                      budget: Optional[LatencyBudget] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get predictions for many (symbol, model, horizon, window) items in one round trip
+        
+        Args:
+            requests: List of prediction items, each a dict with ``market_data`` and
+                      optional ``symbol``, ``model_type``, ``prediction_horizon`` and
+                      ``timeframe`` keys (same defaults as predict())
+            budget: Optional latency budget capping the request timeout
+        
+        Returns:
+            List of prediction dictionaries (or None for failed items), in request order
+        """
+        if not requests:
+            return []
+        
+        items = [_build_batch_item(item) for item in requests]
+        results, missing = _lookup_batch(self.cache, items)
+        if not missing:
+            return results
+        pending = [items[i] for i in missing]
+        
+        if self.session_windows and _has_timestamps(pending):
+            fetched = self._predict_sessions(pending, budget=budget)
+            if fetched is not None:
+                return _merge_batch_results(self.cache, results, missing, pending, fetched)
+        
+        if self.batch_supported:
+            try:
+                response = self._request_batch({"requests": pending}, budget=budget)
+                if response is not None:
+                    return _merge_batch_results(self.cache, results, missing, pending,
+                                                _parse_batch_response(response, pending))
+            except Exception as e:
+                logger.error("❌ Error making batch prediction: %s", e)
+            if self.batch_supported:
+                return results
+        
+        # Service without a batch endpoint: fall back to one request per item
+        for i, item in zip(missing, pending):
+            results[i] = self.predict(
+                market_data=item["market_data"],
+                symbol=item["symbol"],
+                model_type=item["model_type"],
+                prediction_horizon=item["prediction_horizon"],
+                timeframe=item["timeframe"],
+                budget=budget
+            )
+        return results
+    
     def get_models(self) -> Optional[List[str]]:
         """
         Get list of available models
@@ -125,7 +448,7 @@ class C3POClient:
                 return response.get('available_models', [])
             return None
         except Exception as e:
-            logger.error(f"❌ Error getting models: {e}")
+            logger.error("❌ Error getting models: %s", e)
             return None
     
     def get_status(self) -> Optional[Dict[str, Any]]:
@@ -139,7 +462,7 @@ class C3POClient:
             response = self._make_request('GET', '/')
             return response
         except Exception as e:
-            logger.error(f"❌ Error getting status: {e}")
+            logger.error("❌ Error getting status: %s", e)
             return None
     
     def health_check(self) -> bool:
@@ -155,36 +478,1049 @@ class C3POClient:
         except:
             return False
     
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Dict[str, Any]]:
+    @property
+    def coalesced_requests(self) -> int:
+        """Number of predict() calls that piggybacked on an identical in-flight request"""
+        return self._in_flight.coalesced
+    
+    def _make_request(self,
+                      method: str,
+                      endpoint: str,
+                      timeout: Optional[float] = None,
+                      detect_unsupported: bool = False,
+                      **kwargs) -> Optional[Dict[str, Any]]:
         """
         Make HTTP request to the service
         
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint
+            timeout: Request timeout in seconds (defaults to client timeout)
+            detect_unsupported: Raise _UnsupportedEndpoint on 404/405 instead of failing
             **kwargs: Additional request arguments
         
         Returns:
-            Response JSON or None if request fails
+            Response JSON or None if request fails, times out or the circuit is open
         """
         url = f"{self.base_url}{endpoint}"
+        request_timeout = self.timeout if timeout is None else timeout
+        
+        if request_timeout <= 0:
+            logger.warning("⏱️ Latency budget exhausted, skipping %s %s", method, url)
+            return None
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow_request():
+            logger.warning("⚡ C3PO circuit open, skipping %s %s", method, url)
+            return None
         
+        started = time.monotonic()
         try:
             response = self.session.request(
                 method=method,
                 url=url,
-                timeout=self.timeout,
+                timeout=request_timeout,
                 **kwargs
             )
+            if detect_unsupported and response.status_code in (404, 405):
+                self._record_outcome(True, time.monotonic() - started)
+                raise _UnsupportedEndpoint(endpoint)
+            if response.status_code == 415:
+                self._record_outcome(True, time.monotonic() - started)
+                raise _UnsupportedEncoding(endpoint)
             response.raise_for_status()
-            return response.json()
+            result = _decode_body(response.headers.get('Content-Type', ''), response.content)
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Request failed ({method} {url}): {e}")
+            logger.error("❌ Request failed (%s %s): %s", method, url, e)
+            self._record_outcome(False)
+            return None
+        except ValueError as e:
+            logger.error("❌ Invalid response body: %s", e)
+            self._record_outcome(False)
             return None
-        except json.JSONDecodeError as e:
-            logger.error(f"❌ Invalid JSON response: {e}")
+        
+        self._record_outcome(True, time.monotonic() - started)
+        return result
+    
+    def _record_outcome(self, ok: bool, elapsed: Optional[float] = None):
+        """Feed a request outcome to the circuit breaker and latency tracker"""
+        if ok:
+            self.latency_tracker.record(elapsed)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_success()
+        elif self.circuit_breaker is not None:
+            self.circuit_breaker.record_failure()
+    
+    def _request_batch(self,
+                       request_data: Dict[str, Any],
+                       budget: Optional[LatencyBudget] = None) -> Optional[Dict[str, Any]]:
+        """
+        POST a batch to /predict/batch
+        
+        Returns:
+            Response JSON, or None if the request fails or the service has no batch
+            endpoint (then batch_supported is cleared so later calls use the fallback)
+        """
+        try:
+            return self._post('/predict/batch', request_data,
+                              timeout=_effective_timeout(self.timeout, None, budget),
+                              detect_unsupported=True)
+        except _UnsupportedEndpoint:
+            logger.warning("⚠️ C3PO service has no batch endpoint, using per-item requests")
+            self.batch_supported = False
             return None
+    
+    def _predict_sessions(self,
+                          items: List[Dict[str, Any]],
+                          budget: Optional[LatencyBudget] = None) -> Optional[List[Optional[Dict[str, Any]]]]:
+        """
+        Predict normalized items through server-side session windows
+        
+        Items whose stream is known upload only the candles after the last one
+        sent; unknown streams (and any the service asks to resync) upload their
+        full window, which registers the session.
+        
+        Returns:
+            Predictions in item order, or None if the service has no session endpoint
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        todo = list(range(len(items)))
+        full = False
+        
+        while todo:
+            sent = [self.sessions.build_item(items[i], full=full) for i in todo]
+            try:
+                response = self._post('/sessions/predict', {"requests": sent},
+                                      timeout=_effective_timeout(self.timeout, None, budget),
+                                      detect_unsupported=True)
+            except _UnsupportedEndpoint:
+                logger.warning("⚠️ C3PO service has no session endpoint, uploading full windows")
+                self.session_windows = False
+                return None
+            
+            retry = self.sessions.apply(items, todo, response, results)
+            if full:
+                break  # Rejected even with a full window; leave those items as None
+            todo, full = retry, True
+        return results
+    
+    def _post(self,
+              endpoint: str,
+              request_data: Dict[str, Any],
+              timeout: Optional[float] = None,
+              detect_unsupported: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        POST a prediction body in the negotiated wire format
+        
+        A service that answers 415 for a compact encoding is switched to JSON for
+        the rest of the session and the request is retried once.
+        """
+        if self._wire_format is None:
+            timeout = self._negotiate(timeout)
+        wire_format = self._wire_format or "json"
+        
+        try:
+            return self._make_request('POST', endpoint, timeout=timeout, detect_unsupported=detect_unsupported,
+                                      **_encode_body(request_data, wire_format))
+        except _UnsupportedEncoding:
+            logger.warning("⚠️ C3PO service rejected %s payloads, using JSON", wire_format)
+            self._wire_format = "json"
+            return self._make_request('POST', endpoint, timeout=timeout, detect_unsupported=detect_unsupported,
+                                      json=request_data)
+    
+    def _negotiate(self, timeout: Optional[float]) -> float:
+        """
+        Probe /health for the wire format within the caller's deadline
+        
+        Returns:
+            Seconds left of the deadline for the request itself. A failed probe is
+            not repeated for NEGOTIATION_RETRY seconds; JSON is sent meanwhile.
+        """
+        deadline = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        if started < self._negotiate_after:
+            return deadline
+        self._update_wire_format(self._make_request('GET', '/health', timeout=deadline))
+        if self._wire_format is None:
+            self._negotiate_after = started + NEGOTIATION_RETRY
+        return deadline - (time.monotonic() - started)
+    
+    def _update_wire_format(self, health: Optional[Dict[str, Any]]):
+        """Pick the wire format from a /health response when negotiating (wire_format="auto")"""
+        if self._wire_format is None and health is not None:
+            self._wire_format = _negotiate_wire_format(health)
+            logger.debug("C3PO wire format: %s", self._wire_format)
+
+class AsyncC3POClient:
+    """
+    Non-blocking asyncio client for the C3PO AI trading model service
+    
+    Features:
+    - Same API and return shapes as C3POClient, but every call is awaitable
+    - Bounded keep-alive connection pool shared by all concurrent calls
+    - Per-call deadlines (``timeout=``) on top of the client-wide default
+    - Optional circuit breaker, latency budgets and hedged requests
+    - Requires aiohttp (imported lazily so the sync client keeps working without it)
+    """
+    
+    def __init__(self,
+                 base_url: str = "http://localhost:8002",
+                 timeout: float = 10,
+                 max_connections: int = 20,
+                 keepalive_timeout: float = 30,
+                 cache: Optional[PredictionCache] = None,
+                 coalesce: bool = True,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 hedge: bool = False,
+                 hedge_after: Optional[float] = None,
+                 hedge_min_samples: int = 20,
+                 wire_format: str = "auto",
+                 session_windows: bool = False):
+        """
+        Initialize async C3PO client
+        
+        The HTTP session is created lazily on first use, so the client can be
+        constructed outside of a running event loop.
+        
+        Args:
+            base_url: URL of the C3PO model service
+            timeout: Default request deadline in seconds
+            max_connections: Maximum pooled connections to the service
+            keepalive_timeout: Seconds an idle pooled connection is kept open
+            cache: Optional prediction cache consulted before calling the service
+            coalesce: Share one HTTP request between identical concurrent predict() calls
+            circuit_breaker: Optional breaker that fails fast while the service is down
+            hedge: Send a duplicate prediction request if the first one is slow
+            hedge_after: Fixed hedge delay in seconds (default: observed p95 latency)
+            hedge_min_samples: Latency samples needed before p95 hedging kicks in
+            wire_format: Prediction payload encoding: "json", "columnar", "msgpack", or
+                         "auto" to use the most compact one the service advertises
+            session_windows: Keep rolling windows on the service and upload only new
+                             candles (needs candle timestamps; falls back to full
+                             windows if the service has no session endpoint)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.cache = cache
+        self.coalesce = coalesce
+        self.circuit_breaker = circuit_breaker
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.hedge_min_samples = hedge_min_samples
+        self.hedged_requests = 0
+        self.latency_tracker = LatencyTracker()
+        self._in_flight = _AsyncSingleFlight()
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.batch_supported = True
+        self.session_windows = session_windows
+        self.sessions = _SessionWindows()
+        self.wire_format = wire_format
+        self._wire_format = _validate_wire_format(wire_format)
+        self._negotiate_after = 0.0
+        self._session = None
+    
+    async def __aenter__(self) -> "AsyncC3POClient":
+        await self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def predict(self,
+                      market_data: List[Dict[str, float]],
+                      symbol: str = "BTCUSDT",
+                      model_type: str = "ensemble",
+                      prediction_horizon: str = "1h",
+                      timeframe: str = "1m",
+                      timeout: Optional[float] = None,
+                      budget: Optional[LatencyBudget] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get trading prediction from C3PO models without blocking the event loop
+        
+        Args:
+            market_data: List of OHLCV data points
+            symbol: Trading pair (e.g., "BTCUSDT", "ETHUSDT")
+            model_type: Model to use ("autoencoder", "vae", "transformer", "ensemble")
+            prediction_horizon: Time horizon ("1m", "5m", "15m", "1h", "4h", "24h")
+            timeframe: Data timeframe ("1m", "5m", "15m", "1h")
+            timeout: Deadline for this call in seconds (defaults to client timeout)
+            budget: Optional latency budget capping the deadline
+        
+        Returns:
+            Prediction dictionary (same shape as C3POClient.predict)
+            None if prediction fails or the deadline expires
+        """
+        try:
+            key = None
+            if self.cache is not None or self.coalesce:
+                key = PredictionCache.make_key(market_data, symbol, model_type, prediction_horizon, timeframe)
+            
+            if self.cache is not None:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return cached
+            
+            async def fetch() -> Optional[Dict[str, Any]]:
+                request_data = _build_predict_request(
+                    market_data, symbol, model_type, prediction_horizon, timeframe
+                )
+                fetched = None
+                if self.session_windows and _has_timestamps([request_data]):
+                    fetched = await self._predict_sessions([request_data], timeout=timeout, budget=budget)
+                if fetched is not None:
+                    prediction = fetched[0]
+                else:
+                    response = await self._post('/predict', request_data,
+                                                timeout=_effective_timeout(self.timeout, timeout, budget))
+                    prediction = _parse_predict_response(response, symbol, model_type)
+                
+                if prediction and self.cache is not None:
+                    self.cache.put(key, prediction)
+                return prediction
+            
+            # Identical calls already in flight share this request (and its deadline)
+            if self.coalesce:
+                return await self._in_flight.run(key, fetch)
+            return await fetch()
+        
+        except Exception as e:
+            logger.error("❌ Error making prediction: %s", e)
+            return None
+    
+    async def predict_batch(self,
+                            requests: List[Dict[str, Any]],
+                            timeout: Optional[float] = None,
+                            budget: Optional[LatencyBudget] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get predictions for many (symbol, model, horizon, window) items in one round trip
+        
+        Args:
+            requests: List of prediction items (see C3POClient.predict_batch)
+            timeout: Deadline for the whole batch in seconds (defaults to client timeout)
+            budget: Optional latency budget capping the deadline
+        
+        Returns:
+            List of prediction dictionaries (or None for failed items), in request order
+        """
+        if not requests:
+            return []
+        
+        items = [_build_batch_item(item) for item in requests]
+        results, missing = _lookup_batch(self.cache, items)
+        if not missing:
+            return results
+        pending = [items[i] for i in missing]
+        
+        if self.session_windows and _has_timestamps(pending):
+            fetched = await self._predict_sessions(pending, timeout=timeout, budget=budget)
+            if fetched is not None:
+                return _merge_batch_results(self.cache, results, missing, pending, fetched)
+        
+        if self.batch_supported:
+            try:
+                response = await self._request_batch({"requests": pending},
+                                                     timeout=_effective_timeout(self.timeout, timeout, budget))
+                if response is not None:
+                    return _merge_batch_results(self.cache, results, missing, pending,
+                                                _parse_batch_response(response, pending))
+            except Exception as e:
+                logger.error("❌ Error making batch prediction: %s", e)
+            if self.batch_supported:
+                return results
+        
+        # Service without a batch endpoint: fall back to concurrent per-item requests
+        fetched = await asyncio.gather(*[
+            self.predict(
+                market_data=item["market_data"],
+                symbol=item["symbol"],
+                model_type=item["model_type"],
+                prediction_horizon=item["prediction_horizon"],
+                timeframe=item["timeframe"],
+                timeout=timeout,
+                budget=budget
+            )
+            for item in pending
+        ])
+        for i, prediction in zip(missing, fetched):
+            results[i] = prediction
+        return results
+    
+    async def get_models(self) -> Optional[List[str]]:
+        """
+        Get list of available models
+        
+        Returns:
+            List of model names or None if request fails
+        """
+        try:
+            response = await self._make_request('GET', '/models')
+            if response:
+                return response.get('available_models', [])
+            return None
+        except Exception as e:
+            logger.error("❌ Error getting models: %s", e)
+            return None
+    
+    async def get_status(self) -> Optional[Dict[str, Any]]:
+        """
+        Get service status
+        
+        Returns:
+            Status dictionary or None if request fails
+        """
+        try:
+            return await self._make_request('GET', '/')
+        except Exception as e:
+            logger.error("❌ Error getting status: %s", e)
+            return None
+    
+    async def health_check(self, timeout: Optional[float] = None) -> bool:
+        """
+        Check if service is healthy
+        
+        Args:
+            timeout: Deadline for the check in seconds (defaults to client timeout)
+        
+        Returns:
+            True if service is healthy, False otherwise
+        """
+        try:
+            response = await self._make_request('GET', '/health', timeout=timeout)
+            self._update_wire_format(response)
+            return response is not None and response.get('status') == 'healthy'
+        except Exception:
+            return False
+    
+    async def close(self):
+        """Close pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    @property
+    def coalesced_requests(self) -> int:
+        """Number of predict() calls that piggybacked on an identical in-flight request"""
+        return self._in_flight.coalesced
+    
+    async def _get_session(self):
+        """Create the pooled HTTP session on first use"""
+        if self._session is None or self._session.closed:
+            import aiohttp
+            
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+    
+    async def _make_request(self,
+                            method: str,
+                            endpoint: str,
+                            timeout: Optional[float] = None,
+                            detect_unsupported: bool = False,
+                            **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        Make HTTP request to the service
+        
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint
+            timeout: Deadline for this request in seconds
+            detect_unsupported: Raise _UnsupportedEndpoint on 404/405 instead of failing
+            **kwargs: Additional request arguments
+        
+        Returns:
+            Response JSON or None if request fails, times out or the circuit is open
+        """
+        import aiohttp
+        
+        url = f"{self.base_url}{endpoint}"
+        request_timeout = self.timeout if timeout is None else timeout
+        
+        if request_timeout <= 0:
+            logger.warning("⏱️ Latency budget exhausted, skipping %s %s", method, url)
+            return None
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow_request():
+            logger.warning("⚡ C3PO circuit open, skipping %s %s", method, url)
+            return None
+        
+        session = await self._get_session()
+        started = time.monotonic()
+        
+        try:
+            async with session.request(method, url, timeout=aiohttp.ClientTimeout(total=request_timeout),
+                                       **kwargs) as response:
+                if detect_unsupported and response.status in (404, 405):
+                    self._record_outcome(True, time.monotonic() - started)
+                    raise _UnsupportedEndpoint(endpoint)
+                if response.status == 415:
+                    self._record_outcome(True, time.monotonic() - started)
+                    raise _UnsupportedEncoding(endpoint)
+                response.raise_for_status()
+                result = _decode_body(response.headers.get('Content-Type', ''), await response.read())
+        
+        except asyncio.TimeoutError:
+            logger.error("❌ Request timed out (%s %s)", method, url)
+            self._record_outcome(False)
+            return None
+        except aiohttp.ClientError as e:
+            logger.error("❌ Request failed (%s %s): %s", method, url, e)
+            self._record_outcome(False)
+            return None
+        except ValueError as e:
+            logger.error("❌ Invalid response body: %s", e)
+            self._record_outcome(False)
+            return None
+        
+        self._record_outcome(True, time.monotonic() - started)
+        return result
+    
+    async def _make_hedged_request(self,
+                                   method: str,
+                                   endpoint: str,
+                                   timeout: Optional[float] = None,
+                                   **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        Make an idempotent request, duplicating it if the first copy is slow
+        
+        If no response has arrived after the hedge delay (``hedge_after`` or the
+        observed p95 latency), a second identical request is sent and whichever
+        succeeds first wins; the loser is cancelled.
+        
+        Returns:
+            Response JSON or None if every copy fails
+        """
+        delay = self._hedge_delay()
+        request_timeout = self.timeout if timeout is None else timeout
+        if delay is None or delay >= request_timeout:
+            return await self._make_request(method, endpoint, timeout=timeout, **kwargs)
+        
+        primary = asyncio.ensure_future(self._make_request(method, endpoint, timeout=request_timeout, **kwargs))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+        
+        self.hedged_requests += 1
+        hedge = asyncio.ensure_future(
+            self._make_request(method, endpoint, timeout=request_timeout - delay, **kwargs)
+        )
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.result() is not None:
+                        return task.result()
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    def _hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None if hedging is off or not warmed up"""
+        if not self.hedge:
+            return None
+        if self.hedge_after is not None:
+            return self.hedge_after
+        if len(self.latency_tracker) < self.hedge_min_samples:
+            return None
+        return self.latency_tracker.percentile(0.95)
+    
+    def _record_outcome(self, ok: bool, elapsed: Optional[float] = None):
+        """Feed a request outcome to the circuit breaker and latency tracker"""
+        if ok:
+            self.latency_tracker.record(elapsed)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_success()
+        elif self.circuit_breaker is not None:
+            self.circuit_breaker.record_failure()
+    
+    async def _request_batch(self,
+                             request_data: Dict[str, Any],
+                             timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        POST a batch to /predict/batch
+        
+        Returns:
+            Response JSON, or None if the request fails or the service has no batch
+            endpoint (then batch_supported is cleared so later calls use the fallback)
+        """
+        try:
+            return await self._post('/predict/batch', request_data, timeout=timeout, detect_unsupported=True)
+        except _UnsupportedEndpoint:
+            logger.warning("⚠️ C3PO service has no batch endpoint, using per-item requests")
+            self.batch_supported = False
+            return None
+    
+    async def _predict_sessions(self,
+                                items: List[Dict[str, Any]],
+                                timeout: Optional[float] = None,
+                                budget: Optional[LatencyBudget] = None) -> Optional[List[Optional[Dict[str, Any]]]]:
+        """
+        Predict normalized items through server-side session windows (see C3POClient._predict_sessions)
+        
+        Session requests are not hedged: a duplicate delta would be rejected as
+        out of sequence and force a needless resync.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        todo = list(range(len(items)))
+        full = False
+        
+        while todo:
+            sent = [self.sessions.build_item(items[i], full=full) for i in todo]
+            try:
+                response = await self._post('/sessions/predict', {"requests": sent},
+                                            timeout=_effective_timeout(self.timeout, timeout, budget),
+                                            detect_unsupported=True, hedge=False)
+            except _UnsupportedEndpoint:
+                logger.warning("⚠️ C3PO service has no session endpoint, uploading full windows")
+                self.session_windows = False
+                return None
+            
+            retry = self.sessions.apply(items, todo, response, results)
+            if full:
+                break  # Rejected even with a full window; leave those items as None
+            todo, full = retry, True
+        return results
+    
+    async def _post(self,
+                    endpoint: str,
+                    request_data: Dict[str, Any],
+                    timeout: Optional[float] = None,
+                    detect_unsupported: bool = False,
+                    hedge: bool = True) -> Optional[Dict[str, Any]]:
+        """POST a (hedged) prediction body in the negotiated wire format (see C3POClient._post)"""
+        if self._wire_format is None:
+            timeout = await self._negotiate(timeout)
+        wire_format = self._wire_format or "json"
+        send = self._make_hedged_request if hedge else self._make_request
+        
+        try:
+            return await send('POST', endpoint, timeout=timeout, detect_unsupported=detect_unsupported,
+                              **_encode_body(request_data, wire_format))
+        except _UnsupportedEncoding:
+            logger.warning("⚠️ C3PO service rejected %s payloads, using JSON", wire_format)
+            self._wire_format = "json"
+            return await send('POST', endpoint, timeout=timeout, detect_unsupported=detect_unsupported,
+                              json=request_data)
+    
+    async def _negotiate(self, timeout: Optional[float]) -> float:
+        """Probe /health for the wire format within the caller's deadline (see C3POClient._negotiate)"""
+        deadline = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        if started < self._negotiate_after:
+            return deadline
+        self._update_wire_format(await self._make_request('GET', '/health', timeout=deadline))
+        if self._wire_format is None:
+            self._negotiate_after = started + NEGOTIATION_RETRY
+        return deadline - (time.monotonic() - started)
+    
+    def _update_wire_format(self, health: Optional[Dict[str, Any]]):
+        """Pick the wire format from a /health response when negotiating (wire_format="auto")"""
+        if self._wire_format is None and health is not None:
+            self._wire_format = _negotiate_wire_format(health)
+            logger.debug("C3PO wire format: %s", self._wire_format)
+
+# ============================================================================
+# SESSION WINDOWS
+# ============================================================================
+#
+# POST /sessions/predict {"requests": [item, ...]} where each item is a normal
+# predict body plus:
+#   session_id  null to (re)register the stream with a full window
+#   base_seq    candles the client believes the session has received so far
+#   window      rolling window length to keep (registration only)
+# and market_data holds only the candles after the last one sent. Each result
+# is a normal predict response plus "session": {"id": ..., "seq": ...}, or
+# {"success": false, "resync": true} when the session is unknown or base_seq
+# does not match (lost/duplicated deltas, service restart).
+
+class _SessionWindows:
+    """Client-side state of the rolling windows the service holds per (symbol, timeframe)"""
+    
+    def __init__(self):
+        self._streams: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        
+        # Statistics
+        self.full_uploads = 0
+        self.delta_uploads = 0
+        self.resyncs = 0
+    
+    def build_item(self, item: Dict[str, Any], full: bool = False) -> Dict[str, Any]:
+        """Session request item for a normalized predict item (delta if the stream is in sync)"""
+        market_data = item["market_data"]
+        stream = None if full else self._streams.get((item["symbol"], item["timeframe"]))
+        candles = _candles_after(market_data, stream["last_timestamp"]) if stream else None
+        
+        if candles is None:
+            # Unknown stream, or more than a window of candles missed client-side
+            self.full_uploads += 1
+            return dict(item, session_id=None, base_seq=0, window=len(market_data))
+        
+        self.delta_uploads += 1
+        return dict(item, market_data=candles, session_id=stream["session_id"], base_seq=stream["seq"])
+    
+    def apply(self,
+              items: List[Dict[str, Any]],
+              todo: List[int],
+              response: Optional[Dict[str, Any]],
+              results: List[Optional[Dict[str, Any]]]) -> List[int]:
+        """
+        Record a /sessions/predict response into ``results``
+        
+        Returns:
+            Indexes of items that must be resent with their full window
+        """
+        if response is None:
+            return []
+        if not response.get('success') or len(response.get('results', [])) != len(todo):
+            logger.error("❌ Session prediction failed: %s", response.get('message', 'Unknown error'))
+            return []
+        
+        resync = []
+        for i, result in zip(todo, response['results']):
+            item = items[i]
+            key = (item["symbol"], item["timeframe"])
+            if result.get('resync'):
+                self._streams.pop(key, None)
+                self.resyncs += 1
+                resync.append(i)
+                continue
+            
+            session = result.get('session')
+            if session:
+                self._streams[key] = {
+                    "session_id": session["id"],
+                    "seq": session["seq"],
+                    "last_timestamp": item["market_data"][-1]["timestamp"]
+                }
+            results[i] = _parse_predict_response(result, item["symbol"], item["model_type"])
+        return resync
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'streams': len(self._streams),
+            'full_uploads': self.full_uploads,
+            'delta_uploads': self.delta_uploads,
+            'resyncs': self.resyncs
+        }
+
+def _has_timestamps(items: List[Dict[str, Any]]) -> bool:
+    """Whether every item's window carries candle timestamps (required for session windows)"""
+    return all(item["market_data"] and "timestamp" in item["market_data"][-1] for item in items)
+
+def _candles_after(market_data: List[Dict[str, float]], timestamp: float) -> Optional[List[Dict[str, float]]]:
+    """Candles newer than ``timestamp``, or None if that candle is no longer in the window"""
+    for i in range(len(market_data) - 1, -1, -1):
+        candle_time = market_data[i]["timestamp"]
+        if candle_time == timestamp:
+            return market_data[i + 1:]
+        if candle_time < timestamp:
+            break
+    return None
+
+# ============================================================================
+# REQUEST COALESCING
+# ============================================================================
+
+class _InFlightCall:
+    """A predict() call that other threads can wait on"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+
+class _SingleFlight:
+    """Thread-based single-flight: concurrent calls with the same key share one execution"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Tuple, _InFlightCall] = {}
+        self.coalesced = 0
+    
+    def run(self, key: Tuple, fn: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _InFlightCall()
+                leader = True
+        
+        if not leader:
+            call.done.wait()
+            return dict(call.result) if call.result else None
+        
+        try:
+            call.result = fn()
+            return call.result
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+class _AsyncSingleFlight:
+    """asyncio single-flight: concurrent calls with the same key await one shared task"""
+    
+    def __init__(self):
+        self._calls: Dict[Tuple, "asyncio.Task"] = {}
+        self.coalesced = 0
+    
+    async def run(self, key: Tuple, fn: Callable[[], Any]) -> Optional[Dict[str, Any]]:
+        task = self._calls.get(key)
+        if task is None:
+            # The shared request runs as its own task so that one waiter being
+            # cancelled (e.g. by asyncio.wait_for) does not cancel it for the others
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            return await asyncio.shield(task)
+        
+        self.coalesced += 1
+        result = await asyncio.shield(task)
+        return dict(result) if result else None
+
+# ============================================================================
+# REQUEST HELPERS
+# ============================================================================
+
+def _build_predict_request(market_data: List[Dict[str, float]],
+                           symbol: str,
+                           model_type: str,
+                           prediction_horizon: str,
+                           timeframe: str) -> Dict[str, Any]:
+    """Build the JSON body for a /predict request"""
+    return {
+        "market_data": market_data,
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "model_type": model_type,
+        "prediction_horizon": prediction_horizon
+    }
+
+def _parse_predict_response(response: Optional[Dict[str, Any]],
+                            symbol: str,
+                            model_type: str) -> Optional[Dict[str, Any]]:
+    """Normalize a /predict response into the client prediction shape"""
+    if response and response.get('success'):
+        prediction = response.get('prediction', {})
+        return {
+            'direction': prediction.get('direction', 'NEUTRAL'),
+            'confidence': prediction.get('confidence', 0.5),
+            'prediction': prediction.get('prediction', 0.5),
+            'model_type': response.get('model_type', model_type),
+            'symbol': response.get('symbol', symbol),
+            'timestamp': response.get('timestamp'),
+            'individual_predictions': prediction.get('individual_predictions', {}),
+            'success': True
+        }
+    
+    error_msg = response.get('message', 'Unknown error') if response else 'No response'
+    logger.error("❌ Prediction failed: %s", error_msg)
+    return None
+
+class _UnsupportedEndpoint(Exception):
+    """The service answered 404/405 for an optional endpoint"""
+
+class _UnsupportedEncoding(Exception):
+    """The service answered 415 for a compact request encoding"""
+
+def _effective_timeout(default: float,
+                       timeout: Optional[float],
+                       budget: Optional[LatencyBudget]) -> float:
+    """Per-call timeout, capped by whatever is left of the latency budget"""
+    effective = default if timeout is None else timeout
+    if budget is not None:
+        effective = min(effective, budget.remaining())
+    return effective
+
+def _build_batch_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in predict() defaults for one /predict/batch item"""
+    return _build_predict_request(
+        item["market_data"],
+        item.get("symbol", "BTCUSDT"),
+        item.get("model_type", "ensemble"),
+        item.get("prediction_horizon", "1h"),
+        item.get("timeframe", "1m")
+    )
+
+def _window_fingerprint(market_data: List[Dict[str, float]]) -> Tuple:
+    """Cheap identity of a candle window: its length plus the last two candles"""
+    return (len(market_data),) + tuple(
+        tuple(sorted(candle.items())) for candle in market_data[-2:]
+    )
+
+def _lookup_batch(cache: Optional[PredictionCache],
+                  items: List[Dict[str, Any]]) -> Tuple[List[Optional[Dict[str, Any]]], List[int]]:
+    """Resolve batch items from the cache; returns (results, indexes still to fetch)"""
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    if cache is None:
+        return results, list(range(len(items)))
+    
+    missing = []
+    for i, item in enumerate(items):
+        results[i] = cache.get(_batch_item_key(item))
+        if results[i] is None:
+            missing.append(i)
+    return results, missing
+
+def _merge_batch_results(cache: Optional[PredictionCache],
+                         results: List[Optional[Dict[str, Any]]],
+                         missing: List[int],
+                         pending: List[Dict[str, Any]],
+                         fetched: List[Optional[Dict[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+    """Fill fetched predictions into their batch slots and cache the successful ones"""
+    for i, item, prediction in zip(missing, pending, fetched):
+        results[i] = prediction
+        if prediction and cache is not None:
+            cache.put(_batch_item_key(item), prediction)
+    return results
+
+def _batch_item_key(item: Dict[str, Any]) -> Tuple:
+    """Cache key for a normalized batch item"""
+    return PredictionCache.make_key(
+        item["market_data"], item["symbol"], item["model_type"],
+        item["prediction_horizon"], item["timeframe"]
+    )
+
+def _parse_batch_response(response: Dict[str, Any],
+                          items: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    """Normalize a /predict/batch response into per-item predictions, in request order"""
+    if not response.get('success'):
+        logger.error("❌ Batch prediction failed: %s", response.get('message', 'Unknown error'))
+        return [None] * len(items)
+    
+    results = response.get('results', [])
+    if len(results) != len(items):
+        logger.error("❌ Batch prediction returned %d results for %d requests", len(results), len(items))
+        return [None] * len(items)
+    
+    return [
+        _parse_predict_response(result, item["symbol"], item["model_type"])
+        for result, item in zip(results, items)
+    ]
+
+# ============================================================================
+# WIRE FORMAT
+# ============================================================================
+#
+# "json"      market_data as a list of candle objects (every service understands it)
+# "columnar"  JSON with "market_data_columns": {"open": [...], "close": [...], ...}
+#             in place of "market_data", so keys are sent once per window
+# "msgpack"   the columnar body as msgpack (Content-Type application/x-msgpack),
+#             each column a packed little-endian float64 buffer; the response is
+#             msgpack too when the service honours the Accept header
+#
+# Services advertise what they accept in /health as "wire_formats": [...].
+
+def _validate_wire_format(wire_format: str) -> Optional[str]:
+    """Check a requested wire format; returns it, or None when it is to be negotiated"""
+    if wire_format == "auto":
+        return None
+    if wire_format not in WIRE_FORMATS:
+        raise ValueError(f"Unknown wire format {wire_format!r} (expected auto, {', '.join(WIRE_FORMATS)})")
+    if wire_format == "msgpack" and msgpack is None:
+        raise ValueError("The msgpack wire format requires the msgpack package")
+    return wire_format
+
+def _negotiate_wire_format(health: Dict[str, Any]) -> str:
+    """Most compact format advertised by the service that this client can produce"""
+    advertised = health.get("wire_formats") or []
+    for wire_format in WIRE_FORMATS:
+        if wire_format in advertised and (wire_format != "msgpack" or msgpack is not None):
+            return wire_format
+    return "json"
+
+def _market_data_columns(market_data: List[Dict[str, float]], packed: bool) -> Dict[str, Any]:
+    """Transpose candle dicts into per-field columns (packed float64 buffers if ``packed``)"""
+    fields = list(market_data[0]) if market_data else ["open", "high", "low", "close", "volume"]
+    layout = f"<{len(market_data)}d"
+    columns = {}
+    for field in fields:
+        values = [candle[field] for candle in market_data]
+        columns[field] = struct.pack(layout, *values) if packed else values
+    return columns
+
+def _encode_body(request_data: Dict[str, Any], wire_format: str) -> Dict[str, Any]:
+    """
+    Encode a /predict or /predict/batch body
+    
+    Returns:
+        Keyword arguments for the HTTP call (``json=`` or ``data=`` plus headers)
+    """
+    if wire_format == "json":
+        return {"json": request_data}
+    
+    packed = wire_format == "msgpack"
+    
+    def to_columns(body: Dict[str, Any]) -> Dict[str, Any]:
+        body = dict(body)
+        body["market_data_columns"] = _market_data_columns(body.pop("market_data"), packed)
+        return body
+    
+    if "requests" in request_data:
+        encoded = dict(request_data, requests=[to_columns(item) for item in request_data["requests"]])
+    else:
+        encoded = to_columns(request_data)
+    
+    if packed:
+        return {
+            "data": msgpack.packb(encoded, use_bin_type=True),
+            "headers": {"Content-Type": MSGPACK_CONTENT_TYPE, "Accept": MSGPACK_CONTENT_TYPE}
+        }
+    return {"json": encoded}
+
+def _decode_body(content_type: str, raw: bytes) -> Any:
+    """Decode a response body by its Content-Type (msgpack or JSON)"""
+    if MSGPACK_CONTENT_TYPE in content_type:
+        if msgpack is None:
+            raise ValueError("msgpack response but the msgpack package is not installed")
+        return msgpack.unpackb(raw, raw=False)
+    return json.loads(raw)
+
+def encode_predict_request(market_data: List[Dict[str, float]],
+                           symbol: str = "BTCUSDT",
+                           model_type: str = "ensemble",
+                           prediction_horizon: str = "1h",
+                           timeframe: str = "1m",
+                           wire_format: str = "json") -> Tuple[bytes, str]:
+    """
+    A /predict body exactly as the clients put it on the wire
+    
+    Args:
+        market_data: OHLCV candles
+        symbol: Trading symbol
+        model_type: C3PO model
+        prediction_horizon: Prediction horizon
+        timeframe: Candle timeframe
+        wire_format: "json", "columnar" or "msgpack"
+    
+    Returns:
+        (body bytes, Content-Type)
+    """
+    request_data = _build_predict_request(market_data, symbol, model_type, prediction_horizon, timeframe)
+    encoded = _encode_body(request_data, _validate_wire_format(wire_format) or "json")
+    if "data" in encoded:
+        return encoded["data"], encoded["headers"]["Content-Type"]
+    return json.dumps(encoded["json"]).encode(), "application/json"
+
+def decode_predict_response(raw: bytes,
+                            content_type: str = "application/json",
+                            symbol: str = "BTCUSDT",
+                            model_type: str = "ensemble") -> Optional[Dict[str, Any]]:
+    """
+    A raw /predict response decoded and normalized as the clients do it
+    
+    Returns:
+        Prediction dict, or None for an unsuccessful response
+    """
+    return _parse_predict_response(_decode_body(content_type, raw), symbol, model_type)
 
 # ============================================================================
 # UTILITY FUNCTIONS
@@ -281,7 +1617,7 @@ def main():
     # Check service health
     if not client.health_check():
         print("❌ C3PO service is not available")
-        print("💡 Make sure the C3PO service is running")
+        print("💡 Make sure the C3PO service is running (or start the local mock: python mock_c3po_server.py)")
         return
     
     # Get service status
@@ -303,20 +1639,24 @@ def main():
     symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
     model_types = ["ensemble", "autoencoder", "vae", "transformer"]
     
+    # One batch request covers every symbol × model combination
+    batch = []
     for symbol in symbols:
-        print(f"\n📈 {symbol}:")
-        
-        # Create sample data
         market_data = create_sample_market_data(symbol, 50)
-        
         for model_type in model_types:
-            prediction = client.predict(
-                market_data=market_data,
-                symbol=symbol,
-                model_type=model_type,
-                prediction_horizon="1h"
-            )
-            
+            batch.append({
+                "market_data": market_data,
+                "symbol": symbol,
+                "model_type": model_type,
+                "prediction_horizon": "1h"
+            })
+    
+    predictions = client.predict_batch(batch)
+    
+    for i, symbol in enumerate(symbols):
+        print(f"\n📈 {symbol}:")
+        
+        for prediction in predictions[i * len(model_types):(i + 1) * len(model_types)]:
             output = format_prediction_output(prediction)
             print(f"   {output}")
     
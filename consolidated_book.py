@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+🌐 CONSOLIDATED CROSS-EXCHANGE TOP OF BOOK
+==========================================
+
+Best bid/ask across venues, aggregated depth and cross-venue spread per
+symbol, maintained incrementally from the per-venue L2 books of an
+OrderBookManager.
+
+Each symbol keeps one heap of venue best bids and one of venue best asks
+with lazy deletion: a venue whose touch moved pushes its new level and the
+superseded entry is discarded when it reaches the top. A book update that
+leaves its venue's touch unchanged (most of them) costs two O(1) reads;
+one that moves it costs O(log v) for v venues. Nothing re-merges the full
+books per tick. Aggregated depth is merged on request from each venue's
+best ``n`` levels only.
+
+Venues that lose sequence drop out of the consolidated quote until their
+next snapshot, so a stale book never sets the price.
+
+Usage:
+    aggregator = TopOfBookAggregator(on_change=bot.on_quote)
+    manager = OrderBookManager(on_gap=request_snapshot)
+    aggregator.attach(manager)
+    manager.handle_message("binance", depth_update_event)
+    quote = aggregator.quote("BTCUSDT")
+    print(quote.bid, quote.bid_venue, quote.ask, quote.ask_venue, quote.spread)
+    print(aggregator.depth("BTCUSDT", 10))
+"""
+
+import heapq
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from order_book import Level, OrderBook, OrderBookManager, parse_binance_depth, synthetic_binance_stream
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ConsolidatedQuote:
+    """Best bid and ask across venues for one symbol"""
+    __slots__ = ('symbol', 'bid', 'bid_size', 'bid_venue', 'ask', 'ask_size', 'ask_venue', 'timestamp')
+
+    symbol: str
+    bid: Optional[float]
+    bid_size: float
+    bid_venue: Optional[str]
+    ask: Optional[float]
+    ask_size: float
+    ask_venue: Optional[str]
+    timestamp: Optional[float]  # exchange time of the update that produced this quote
+
+    @property
+    def mid(self) -> Optional[float]:
+        if self.bid is None or self.ask is None:
+            return None
+        return (self.bid + self.ask) / 2
+
+    @property
+    def spread(self) -> Optional[float]:
+        """Best ask minus best bid across venues (negative when venues are crossed)"""
+        if self.bid is None or self.ask is None:
+            return None
+        return self.ask - self.bid
+
+    @property
+    def crossed(self) -> bool:
+        spread = self.spread
+        return spread is not None and spread < 0
+
+class _VenueHeap:
+    """Best level per venue for one side, best venue on top, with lazy deletion"""
+
+    __slots__ = ('_sign', '_heap', '_levels')
+
+    def __init__(self, is_bid: bool):
+        self._sign = -1.0 if is_bid else 1.0  # heapq is a min-heap
+        self._heap: List[Tuple[float, float, str]] = []
+        self._levels: Dict[str, Level] = {}
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def get(self, venue: str) -> Optional[Level]:
+        return self._levels.get(venue)
+
+    def set(self, venue: str, level: Optional[Level]):
+        """Replace a venue's best level (None removes the venue)"""
+        if level is None:
+            self._levels.pop(venue, None)
+            return
+        self._levels[venue] = level
+        # At equal prices the larger size ranks first
+        heapq.heappush(self._heap, (level[0] * self._sign, -level[1], venue))
+        if len(self._heap) > 4 * len(self._levels) + 16:
+            self._compact()
+
+    def best(self) -> Optional[Tuple[str, Level]]:
+        heap, levels, sign = self._heap, self._levels, self._sign
+        while heap:
+            key, negative_size, venue = heap[0]
+            level = levels.get(venue)
+            if level is not None and level[0] * sign == key and level[1] == -negative_size:
+                return venue, level
+            heapq.heappop(heap)
+        return None
+
+    def _compact(self):
+        sign = self._sign
+        self._heap = [(price * sign, -size, venue) for venue, (price, size) in self._levels.items()]
+        heapq.heapify(self._heap)
+
+class ConsolidatedBook:
+    """Consolidated view of one symbol across venues"""
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = _VenueHeap(is_bid=True)
+        self.asks = _VenueHeap(is_bid=False)
+        self.books: Dict[str, OrderBook] = {}
+        self.quote = ConsolidatedQuote(symbol, None, 0.0, None, None, 0.0, None, None)
+
+    def update(self, venue: str, book: Optional[OrderBook]) -> bool:
+        """
+        Take a venue's current touch (None drops the venue)
+
+        Returns:
+            True if the consolidated quote changed
+        """
+        if book is None:
+            self.books.pop(venue, None)
+            bid = ask = None
+            timestamp = self.quote.timestamp
+        else:
+            self.books[venue] = book
+            bid, ask = book.best_bid, book.best_ask
+            timestamp = book.timestamp
+            if bid == self.bids.get(venue) and ask == self.asks.get(venue):
+                return False
+
+        if bid != self.bids.get(venue):
+            self.bids.set(venue, bid)
+        if ask != self.asks.get(venue):
+            self.asks.set(venue, ask)
+
+        best_bid, best_ask = self.bids.best(), self.asks.best()
+        quote = ConsolidatedQuote(
+            self.symbol,
+            best_bid[1][0] if best_bid else None, best_bid[1][1] if best_bid else 0.0, best_bid[0] if best_bid else None,
+            best_ask[1][0] if best_ask else None, best_ask[1][1] if best_ask else 0.0, best_ask[0] if best_ask else None,
+            timestamp
+        )
+        previous = self.quote
+        self.quote = quote
+        return (quote.bid, quote.bid_size, quote.bid_venue, quote.ask, quote.ask_size, quote.ask_venue) != \
+               (previous.bid, previous.bid_size, previous.bid_venue, previous.ask, previous.ask_size, previous.ask_venue)
+
+    def depth(self, n: int = 10) -> Dict[str, List[Level]]:
+        """
+        Aggregated depth: best ``n`` price levels per side, sizes summed across venues
+
+        Only each venue's own best ``n`` levels are merged.
+        """
+        bids = heapq.merge(*(book.bids.top(n) for book in self.books.values()), key=lambda level: -level[0])
+        asks = heapq.merge(*(book.asks.top(n) for book in self.books.values()), key=lambda level: level[0])
+        return {'bids': _sum_levels(bids, n), 'asks': _sum_levels(asks, n)}
+
+    def venue_quotes(self) -> Dict[str, Dict[str, Optional[Level]]]:
+        """Each venue's best bid and ask"""
+        return {venue: {'bid': self.bids.get(venue), 'ask': self.asks.get(venue)} for venue in self.books}
+
+def _sum_levels(levels, n: int) -> List[Level]:
+    merged: List[Level] = []
+    for price, size in levels:
+        if merged and merged[-1][0] == price:
+            merged[-1] = (price, merged[-1][1] + size)
+        elif len(merged) == n:
+            break
+        else:
+            merged.append((price, size))
+    return merged
+
+class TopOfBookAggregator:
+    """Consolidated top of book for every symbol fed by one or more OrderBookManagers"""
+
+    def __init__(self,
+                 on_change: Optional[Callable[[ConsolidatedQuote], None]] = None,
+                 symbol_map: Optional[Dict[Tuple[str, str], str]] = None):
+        """
+        Initialize aggregator
+
+        Args:
+            on_change: Called with the new ConsolidatedQuote whenever a symbol's best
+                       bid/ask price, size or venue changes (e.g. AIPaperTradingBot.on_quote)
+            symbol_map: (exchange, exchange symbol) -> consolidated symbol, for venues
+                        that name the same market differently (default: symbol as is)
+        """
+        self.on_change = on_change
+        self.symbol_map = symbol_map or {}
+        self.symbols: Dict[str, ConsolidatedBook] = {}
+
+        # Statistics
+        self.updates = 0
+        self.changes = 0
+
+    def attach(self, manager: OrderBookManager):
+        """Consolidate a manager's books, keeping its existing on_update/on_gap callbacks"""
+        on_update, on_gap = manager.on_update, manager.on_gap
+
+        def updated(book: OrderBook):
+            self.on_book_update(book)
+            if on_update is not None:
+                on_update(book)
+
+        def gapped(book: OrderBook):
+            self.on_book_gap(book)
+            if on_gap is not None:
+                on_gap(book)
+
+        manager.on_update = updated
+        manager.on_gap = gapped
+
+    def _consolidated(self, exchange: str, symbol: str) -> ConsolidatedBook:
+        symbol = self.symbol_map.get((exchange, symbol), symbol)
+        consolidated = self.symbols.get(symbol)
+        if consolidated is None:
+            consolidated = self.symbols[symbol] = ConsolidatedBook(symbol)
+        return consolidated
+
+    def on_book_update(self, book: OrderBook):
+        """OrderBookManager on_update callback"""
+        self.updates += 1
+        consolidated = self._consolidated(book.exchange, book.symbol)
+        if consolidated.update(book.exchange, book):
+            self._publish(consolidated.quote)
+
+    def on_book_gap(self, book: OrderBook):
+        """OrderBookManager on_gap callback: the venue is out of the quote until resynced"""
+        consolidated = self._consolidated(book.exchange, book.symbol)
+        if book.exchange in consolidated.books and consolidated.update(book.exchange, None):
+            self._publish(consolidated.quote)
+
+    def _publish(self, quote: ConsolidatedQuote):
+        self.changes += 1
+        if self.on_change is not None:
+            try:
+                self.on_change(quote)
+            except Exception as e:
+                logger.error("❌ Quote subscriber failed for %s: %s", quote.symbol, e)
+
+    def quote(self, symbol: str) -> Optional[ConsolidatedQuote]:
+        consolidated = self.symbols.get(symbol)
+        return consolidated.quote if consolidated is not None else None
+
+    def depth(self, symbol: str, n: int = 10) -> Dict[str, List[Level]]:
+        """Aggregated depth across venues (empty sides for unknown symbols)"""
+        consolidated = self.symbols.get(symbol)
+        return consolidated.depth(n) if consolidated is not None else {'bids': [], 'asks': []}
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'updates': self.updates,
+            'changes': self.changes,
+            'symbols': {
+                symbol: {'venues': len(consolidated.books), 'bid': consolidated.quote.bid,
+                         'ask': consolidated.quote.ask, 'spread': consolidated.quote.spread}
+                for symbol, consolidated in self.symbols.items()
+            }
+        }
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+def main():
+    """Consolidate five simulated venues and measure update throughput"""
+    print("🌐 Consolidated Top of Book")
+    print("=" * 60)
+
+    venues = ["binance", "bybit", "okx", "kraken", "coinbase"]
+    rng = random.Random(42)
+    streams = {}
+    for i, venue in enumerate(venues):
+        # Binance-format streams around slightly different mids, relabelled per venue
+        updates = [parse_binance_depth(message, "BTCUSDT")
+                   for message in synthetic_binance_stream("BTCUSDT", updates=20_000, mid=50000.0 + i * 0.3, seed=i)]
+        for update in updates:
+            update.exchange = venue
+        streams[venue] = updates
+
+    aggregator = TopOfBookAggregator()
+    manager = OrderBookManager()
+    aggregator.attach(manager)
+    for venue in venues:
+        manager.apply(streams[venue][0])
+
+    interleaved = [update for position in range(1, 20_001) for update in
+                   rng.sample([streams[venue][position] for venue in venues], len(venues))]
+    started = time.perf_counter()
+    for update in interleaved:
+        manager.apply(update)
+    elapsed = time.perf_counter() - started
+
+    quote = aggregator.quote("BTCUSDT")
+    print(f"⚡ {len(interleaved):,} updates across {len(venues)} venues in {elapsed:.2f}s "
+          f"({len(interleaved) / elapsed:,.0f} updates/s, {aggregator.changes:,} quote changes)")
+    print(f"📊 Best bid {quote.bid} ({quote.bid_venue}) | best ask {quote.ask} ({quote.ask_venue}) | "
+          f"spread {quote.spread:.2f}{' (crossed)' if quote.crossed else ''}")
+    depth = aggregator.depth("BTCUSDT", 5)
+    print(f"📚 Top 5 bids {depth['bids']}")
+    print(f"📚 Top 5 asks {depth['asks']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+📏 LATENCY STATISTICS
+=====================
+
+Dependency-free latency summaries shared by the benchmark suite and the
+load generator. Importing this module pulls in neither the bot nor NumPy,
+so lightweight tools can report latencies in the same format.
+
+Usage:
+    from latency_stats import latency_summary
+
+    summary = latency_summary([0.0012, 0.0015, 0.0420])
+    print(summary['p50_ms'], summary['p99_ms'])
+"""
+
+import math
+from typing import Dict, List, Sequence
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """
+    Percentile of already sorted values, interpolating linearly between ranks
+
+    Matches ``numpy.percentile``'s default ("linear") method.
+    """
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def latency_summary(samples: Sequence[float]) -> Dict[str, float]:
+    """
+    Summary of latency samples in seconds
+
+    Returns:
+        Count, mean, p50/p95/p99/p999 and max in milliseconds (only the count
+        when there are no samples)
+    """
+    if not len(samples):
+        return {'count': 0}
+    values = sorted(float(sample) * 1000.0 for sample in samples)
+    return {
+        'count': len(values),
+        'mean_ms': math.fsum(values) / len(values),
+        'p50_ms': percentile(values, 50),
+        'p95_ms': percentile(values, 95),
+        'p99_ms': percentile(values, 99),
+        'p999_ms': percentile(values, 99.9),
+        'max_ms': values[-1],
+    }
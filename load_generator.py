@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+🔥 C3PO LOAD GENERATOR
+======================
+
+Closed-loop load tests for the C3PO service through C3POClient, for sizing
+the model service and the client pool.
+
+Each of ``concurrency`` workers owns a C3POClient (its own connection pool)
+and sends its next prediction as soon as the previous one returns. With a
+target ``rate`` the workers instead take send slots from a shared schedule
+(request k is due at start + k / rate) and latency is measured from the slot,
+not from the actual send, so a saturated service shows up as latency rather
+than being hidden by the generator slowing down (coordinated omission); slots
+that were never reached are reported as ``unsent``. Throughput counts the
+successful requests issued (or, with a rate, due) inside the measured window.
+
+Cache and request coalescing are disabled and every worker cycles through
+distinct seeded windows, so each call reaches the service.
+
+Usage:
+    from load_generator import run_load, run_sweep
+
+    result = run_load("http://localhost:8002", concurrency=16, duration=10)
+    print(result['throughput'], result['latency']['p99_ms'], result['error_rate'])
+
+    python load_generator.py        # sweep against a local MockC3POServer, writes load-results.json
+"""
+
+import itertools
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from c3po_client import C3POClient
+from latency_stats import latency_summary
+from mock_c3po_server import MockC3POServer
+from synthetic_market_data import SyntheticMarket
+
+logger = logging.getLogger(__name__)
+
+class _Schedule:
+    """Shared send slots for a target request rate"""
+
+    def __init__(self, rate: float, start: float):
+        self.rate = rate
+        self.start = start
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def next_slot(self) -> float:
+        with self._lock:
+            k = next(self._next)
+        return self.start + k / self.rate
+
+def make_windows(window: int, count: int = 64, symbols: Sequence[str] = ("BTCUSDT",), seed: int = 7) -> List[Dict[str, Any]]:
+    """
+    Distinct request payloads: ``count`` consecutive windows per symbol
+
+    Returns:
+        List of {"market_data": [...], "symbol": ...}
+    """
+    market = SyntheticMarket(list(symbols), seed=seed, start_time=1_700_000_000.0)
+    series = market.candles(window + count)
+    return [
+        {"market_data": series[symbol][i:i + window], "symbol": symbol}
+        for i in range(count)
+        for symbol in symbols
+    ]
+
+def run_load(url: str,
+             concurrency: int = 8,
+             duration: float = 10.0,
+             rate: Optional[float] = None,
+             window: int = 50,
+             model_types: Sequence[str] = ("ensemble",),
+             wire_format: str = "auto",
+             timeout: float = 5.0,
+             warmup: float = 1.0,
+             seed: int = 7) -> Dict[str, Any]:
+    """
+    Drive predictions at the service for ``duration`` seconds
+
+    Args:
+        url: C3PO service URL
+        concurrency: Workers (each with its own client and connection)
+        duration: Measured seconds (sending stops then; in-flight requests still complete)
+        rate: Target requests per second across all workers (None: as fast as answered)
+        window: Candles per request
+        model_types: Model types, cycled per request
+        wire_format: Client wire format
+        timeout: Per-request timeout in seconds
+        warmup: Unmeasured seconds first (connections, negotiation)
+        seed: Market data seed
+
+    Returns:
+        Configuration, request/error counts, throughput and latency summary
+    """
+    payloads = make_windows(window, seed=seed)
+    clients = [C3POClient(url, timeout=timeout, coalesce=False, wire_format=wire_format) for _ in range(concurrency)]
+
+    start = time.perf_counter() + 0.05
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+    schedule = _Schedule(rate, start) if rate else None
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+
+    def worker(index: int):
+        client = clients[index]
+        samples = latencies[index]
+        requests = itertools.cycle(itertools.product(payloads[index::concurrency] or payloads, model_types))
+        while True:
+            now = time.perf_counter()
+            if now >= stop_at:
+                return
+            if schedule is not None:
+                due = schedule.next_slot()
+                if due >= stop_at:
+                    return
+                if due > now:
+                    time.sleep(due - now)
+            else:
+                due = now
+
+            payload, model_type = next(requests)
+            prediction = client.predict(payload["market_data"], symbol=payload["symbol"], model_type=model_type)
+            finished = time.perf_counter()
+            # Requests issued during warmup count for neither latency nor throughput
+            if due >= measure_from:
+                if prediction is None:
+                    errors[index] += 1
+                else:
+                    samples.append(finished - due)
+
+    # Failed predictions are counted here; per-request error logs would swamp the run
+    client_logger = logging.getLogger(C3POClient.__module__)
+    previous_level = client_logger.level
+    client_logger.setLevel(logging.CRITICAL)
+    try:
+        threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = max(time.perf_counter(), stop_at) - measure_from
+    finally:
+        client_logger.setLevel(previous_level)
+        for client in clients:
+            client.session.close()
+
+    samples = [sample for worker_samples in latencies for sample in worker_samples]
+    failed = sum(errors)
+    total = len(samples) + failed
+    result = {
+        'concurrency': concurrency,
+        'target_rate': rate,
+        'window': window,
+        'model_types': list(model_types),
+        'wire_format': clients[0]._wire_format if clients else wire_format,
+        'duration': duration,
+        'requests': total,
+        'errors': failed,
+        'error_rate': failed / total if total else 0.0,
+        'throughput': len(samples) / elapsed,
+        'latency': latency_summary(samples),
+    }
+    if rate:
+        # Slots the workers never reached: the service could not keep up with the target rate
+        result['unsent'] = max(0, int(rate * duration) - total)
+    return result
+
+def run_sweep(url: str,
+              concurrency: Sequence[int] = (1, 2, 4, 8, 16),
+              rates: Sequence[Optional[float]] = (None,),
+              windows: Sequence[int] = (50,),
+              model_types: Sequence[Sequence[str]] = (("ensemble",),),
+              **load_kwargs) -> List[Dict[str, Any]]:
+    """
+    run_load over every combination of the given settings
+
+    Returns:
+        One run_load result per combination
+    """
+    results = []
+    for workers, rate, window, models in itertools.product(concurrency, rates, windows, model_types):
+        result = run_load(url, concurrency=workers, rate=rate, window=window, model_types=models, **load_kwargs)
+        logger.info("🔥 %d workers, rate %s, window %d: %.0f req/s, p99 %.1f ms, %.2f%% errors",
+                    workers, rate or 'max', window, result['throughput'],
+                    result['latency'].get('p99_ms', 0), result['error_rate'] * 100)
+        results.append(result)
+    return results
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+def main():
+    """Sweep concurrency against a mock service with realistic latency and a throughput cap"""
+    logging.basicConfig(level=logging.WARNING)
+
+    config = {
+        'url': None,  # None: start a local MockC3POServer
+        'output': 'load-results.json',
+        'concurrency': (1, 4, 16, 32),
+        'rates': (None,),
+        'windows': (50, 200),
+        'duration': 5.0,
+        'mock': {
+            'latency': 0.01,
+            'latency_distribution': 'lognormal',
+            'latency_jitter': 0.4,
+            'tail_probability': 0.002,
+            'tail_latency': 0.2,
+            'error_rate': 0.001,
+            'max_concurrency': 8,
+            'seed': 42,
+        },
+    }
+
+    print("🔥 C3PO Load Generator")
+    print("=" * 60)
+
+    server = None
+    url = config['url']
+    if url is None:
+        server = MockC3POServer(**config['mock']).start()
+        url = server.url
+        print(f"🧪 Mock service at {url}: {config['mock']}")
+
+    try:
+        results = run_sweep(url, config['concurrency'], config['rates'], config['windows'],
+                            duration=config['duration'])
+    finally:
+        if server is not None:
+            server.stop()
+
+    print(f"\n{'workers':>7} {'window':>6} {'req/s':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'p999':>7} {'errors':>7}")
+    for result in results:
+        latency = result['latency']
+        print(f"{result['concurrency']:>7} {result['window']:>6} {result['throughput']:>8.0f} "
+              + " ".join(f"{latency.get(key, 0.0):>7.1f}" for key in ('p50_ms', 'p95_ms', 'p99_ms', 'p999_ms'))
+              + f" {result['error_rate']:>7.2%}")
+
+    with open(config['output'], 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results written to {config['output']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+📊 MARKET DATA STORE
+====================
+
+Fixed-capacity columnar ring buffers for OHLCV candles.
+
+Each symbol keeps one preallocated float64 array per field instead of a list
+of per-candle dicts, so appending a candle never allocates and a trailing
+window is available as zero-copy memoryviews.
+
+Usage:
+    from market_data_store import MarketDataStore
+
+    store = MarketDataStore(["BTCUSDT"], capacity=256)
+    store["BTCUSDT"].append(50000, 50100, 49900, 50050, 12.5, time.time())
+    closes = store["BTCUSDT"].column("close", 50)      # memoryview, no copy
+    payload = store["BTCUSDT"].to_payload(50)          # C3PO request format
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+# Column order of every buffer
+FIELDS = ("open", "high", "low", "close", "volume", "timestamp")
+
+class CandleWindow:
+    """Zero-copy view over the last ``len(window)`` candles of a ring buffer"""
+
+    __slots__ = ("open", "high", "low", "close", "volume", "timestamp")
+
+    def __init__(self, columns: Dict[str, memoryview]):
+        for field in FIELDS:
+            setattr(self, field, columns[field])
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+class CandleRingBuffer:
+    """
+    Preallocated columnar ring buffer of OHLCV candles for one symbol
+
+    Every value is written twice, at ``i`` and ``i + capacity``, so the most
+    recent ``n <= capacity`` candles always occupy one contiguous slice and can
+    be handed out as memoryviews without copying, even after wrap-around.
+    """
+
+    def __init__(self, capacity: int = 256):
+        """
+        Initialize ring buffer
+
+        Args:
+            capacity: Maximum number of candles retained (oldest are overwritten)
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self._columns: Dict[str, array] = {
+            field: array("d", bytes(8 * 2 * capacity)) for field in FIELDS
+        }
+        self._head = 0  # next write slot in [0, capacity)
+        self._count = 0
+        self.appended = 0  # candles ever appended (lets consumers find what is new)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self,
+               open: float,
+               high: float,
+               low: float,
+               close: float,
+               volume: float,
+               timestamp: float = 0.0):
+        """Append one candle, overwriting the oldest once the buffer is full"""
+        head = self._head
+        mirror = head + self.capacity
+        columns = self._columns
+
+        for field, value in (("open", open), ("high", high), ("low", low),
+                             ("close", close), ("volume", volume), ("timestamp", timestamp)):
+            column = columns[field]
+            column[head] = value
+            column[mirror] = value
+
+        self._head = head + 1 if head + 1 < self.capacity else 0
+        self.appended += 1
+        if self._count < self.capacity:
+            self._count += 1
+
+    def append_candle(self, candle: Dict[str, float]):
+        """Append a candle given in the dict format used by C3POClient"""
+        self.append(candle["open"], candle["high"], candle["low"], candle["close"],
+                    candle["volume"], candle.get("timestamp", 0.0))
+
+    def extend(self, candles: Iterable[Dict[str, float]]):
+        """Append several dict-format candles"""
+        for candle in candles:
+            self.append_candle(candle)
+
+    def last(self, field: str = "close") -> float:
+        """Most recent value of a field"""
+        if not self._count:
+            raise IndexError("ring buffer is empty")
+        return self._columns[field][self._head - 1 + self.capacity]
+
+    @property
+    def last_close(self) -> float:
+        return self.last("close")
+
+    def column(self, field: str, n: Optional[int] = None) -> memoryview:
+        """
+        Zero-copy view of the last ``n`` values of one field (oldest first)
+
+        Args:
+            field: One of FIELDS
+            n: Window length (defaults to everything retained)
+        """
+        start, stop = self._window_bounds(n)
+        return memoryview(self._columns[field])[start:stop]
+
+    def window(self, n: Optional[int] = None) -> CandleWindow:
+        """Zero-copy views of every field over the last ``n`` candles"""
+        start, stop = self._window_bounds(n)
+        return CandleWindow({
+            field: memoryview(column)[start:stop] for field, column in self._columns.items()
+        })
+
+    def to_payload(self, n: Optional[int] = None) -> List[Dict[str, float]]:
+        """
+        Last ``n`` candles in the list-of-dicts format expected by C3POClient.predict
+
+        This is the only method that materializes per-candle dicts; call it at
+        the request boundary rather than for internal calculations.
+        """
+        window = self.window(n)
+        return [
+            {"open": o, "high": h, "low": l, "close": c, "volume": v, "timestamp": t}
+            for o, h, l, c, v, t in zip(window.open, window.high, window.low,
+                                        window.close, window.volume, window.timestamp)
+        ]
+
+    def _window_bounds(self, n: Optional[int]) -> tuple:
+        """Contiguous [start, stop) slice of the mirrored arrays holding the last n candles"""
+        n = self._count if n is None else min(n, self._count)
+        start = (self._head - n) % self.capacity
+        return start, start + n
+
+class MarketDataStore:
+    """Per-symbol collection of CandleRingBuffers"""
+
+    def __init__(self, symbols: Iterable[str] = (), capacity: int = 256):
+        """
+        Initialize store
+
+        Args:
+            symbols: Symbols to preallocate buffers for
+            capacity: Candles retained per symbol
+        """
+        self.capacity = capacity
+        self._buffers: Dict[str, CandleRingBuffer] = {}
+        for symbol in symbols:
+            self.add_symbol(symbol)
+
+    def add_symbol(self, symbol: str) -> CandleRingBuffer:
+        """Get the buffer for a symbol, allocating it on first use"""
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            buffer = self._buffers[symbol] = CandleRingBuffer(self.capacity)
+        return buffer
+
+    def __getitem__(self, symbol: str) -> CandleRingBuffer:
+        return self._buffers[symbol]
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._buffers
+
+    def __iter__(self):
+        return iter(self._buffers)
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def items(self):
+        return self._buffers.items()
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the preallocated columns"""
+        return sum(
+            column.itemsize * len(column)
+            for buffer in self._buffers.values()
+            for column in buffer._columns.values()
+        )
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+🧪 MOCK C3PO SERVICE
+====================
+
+Local stand-in for the C3PO model service, for tests, benchmarks and running
+the bot without the real backend.
+
+Implements ``/``, ``/health``, ``/models``, ``/predict``, ``/predict/batch``
+and ``/sessions/predict`` with the real service's response shapes, JSON /
+columnar / msgpack request bodies, and deterministic predictions: UP when the
+window's last close is at or above its first, DOWN otherwise.
+
+Performance behaviour is tunable per server:
+
+    latency          per-request service time drawn from a seeded distribution
+                     (constant, uniform, normal, lognormal, exponential), plus
+                     an optional rare tail spike
+    error_rate       fraction of prediction requests answered with error_status
+    max_rps          token-bucket throughput cap; excess requests get 429
+    max_concurrency  worker slots; further requests queue for a free slot
+
+Usage:
+    with MockC3POServer(latency=0.02, latency_distribution="lognormal", latency_jitter=0.5,
+                        error_rate=0.01, seed=7) as server:
+        client = C3POClient(server.url)
+
+    python mock_c3po_server.py          # serve on localhost:8002 for the bot / examples
+"""
+
+import json
+import logging
+import math
+import random
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from c3po_client import MSGPACK_CONTENT_TYPE, msgpack
+
+logger = logging.getLogger(__name__)
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "normal", "lognormal", "exponential")
+MODELS = ["ensemble", "autoencoder", "vae", "transformer"]
+
+class MockC3POServer(ThreadingHTTPServer):
+    """Threaded HTTP server speaking the C3PO API with injectable latency and failures"""
+
+    daemon_threads = True
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 latency: float = 0.0,
+                 latency_distribution: str = "constant",
+                 latency_jitter: float = 0.0,
+                 tail_probability: float = 0.0,
+                 tail_latency: float = 0.0,
+                 error_rate: float = 0.0,
+                 error_status: int = 503,
+                 max_rps: Optional[float] = None,
+                 max_concurrency: Optional[int] = None,
+                 confidence: float = 0.75,
+                 wire_formats: Optional[List[str]] = None,
+                 batch_endpoint: bool = True,
+                 seed: Optional[int] = None):
+        """
+        Initialize server (call start() or use as a context manager to serve)
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Service time in seconds; the median for lognormal, the mean otherwise
+            latency_distribution: One of LATENCY_DISTRIBUTIONS
+            latency_jitter: Spread: half-width (uniform), standard deviation in seconds
+                            (normal) or log-space sigma (lognormal); unused otherwise
+            tail_probability: Chance that a request additionally takes tail_latency
+            tail_latency: Extra seconds for tail requests
+            error_rate: Fraction of prediction requests that fail
+            error_status: HTTP status of injected failures
+            max_rps: Prediction requests per second before answering 429 (None: unlimited)
+            max_concurrency: Prediction requests served at once; others wait (None: unlimited)
+            confidence: Confidence of every prediction
+            wire_formats: Request encodings accepted (default: json, columnar and msgpack if installed)
+            batch_endpoint: Serve /predict/batch (False answers 404, like an older service)
+            seed: Seed for latency and failure draws
+        """
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution {latency_distribution!r}")
+
+        super().__init__((host, port), MockC3POHandler)
+        self.latency = latency
+        self.latency_distribution = latency_distribution
+        self.latency_jitter = latency_jitter
+        self.tail_probability = tail_probability
+        self.tail_latency = tail_latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.max_rps = max_rps
+        self.confidence = confidence
+        self.wire_formats = wire_formats or ["json", "columnar"] + (["msgpack"] if msgpack else [])
+        self.batch_endpoint = batch_endpoint
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._tokens = max_rps or 0.0
+        self._refilled = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at = time.time()
+        self.reset()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_port}"
+
+    def start(self) -> "MockC3POServer":
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-c3po", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the socket"""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> "MockC3POServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reset(self):
+        """Clear statistics and sessions"""
+        with self._lock:
+            self.request_counts: Dict[str, int] = {}
+            self.connections = 0
+            self.bytes_received = 0
+            self.last_request_bytes = 0
+            self.injected_errors = 0
+            self.throttled = 0
+            self.sessions: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'requests': dict(self.request_counts),
+                'connections': self.connections,
+                'bytes_received': self.bytes_received,
+                'injected_errors': self.injected_errors,
+                'throttled': self.throttled
+            }
+
+    # ------------------------------------------------------------------
+    # Behaviour draws (called from handler threads)
+    # ------------------------------------------------------------------
+
+    def connection_opened(self):
+        with self._lock:
+            self.connections += 1
+
+    def count(self, path: str, body_bytes: int = 0):
+        with self._lock:
+            self.request_counts[path] = self.request_counts.get(path, 0) + 1
+            self.bytes_received += body_bytes
+            if body_bytes:
+                self.last_request_bytes = body_bytes
+
+    def sample_latency(self) -> float:
+        """Service time for one request"""
+        with self._lock:
+            rng = self._rng
+            if self.latency_distribution == "uniform":
+                delay = rng.uniform(self.latency - self.latency_jitter, self.latency + self.latency_jitter)
+            elif self.latency_distribution == "normal":
+                delay = rng.gauss(self.latency, self.latency_jitter)
+            elif self.latency_distribution == "lognormal":
+                delay = self.latency * math.exp(rng.gauss(0.0, self.latency_jitter)) if self.latency > 0 else 0.0
+            elif self.latency_distribution == "exponential":
+                delay = rng.expovariate(1.0 / self.latency) if self.latency > 0 else 0.0
+            else:
+                delay = self.latency
+            if self.tail_probability and rng.random() < self.tail_probability:
+                delay += self.tail_latency
+        return max(delay, 0.0)
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            failed = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if failed:
+                self.injected_errors += 1
+        return failed
+
+    def admit(self) -> bool:
+        """Token bucket for max_rps (burst of one second's worth)"""
+        if not self.max_rps:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.max_rps, self._tokens + (now - self._refilled) * self.max_rps)
+            self._refilled = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            self.throttled += 1
+            return False
+
+class MockC3POHandler(BaseHTTPRequestHandler):
+    """Request handler for MockC3POServer"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body are separate writes; avoid 40 ms delayed-ACK stalls
+    server: MockC3POServer
+
+    def setup(self):
+        super().setup()
+        self.server.connection_opened()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.count(self.path)
+        if self.path == "/health":
+            self._send({"status": "healthy", "wire_formats": server.wire_formats})
+        elif self.path == "/models":
+            self._send({"available_models": MODELS})
+        else:
+            self._send({
+                "service_name": "C3PO Mock",
+                "models_loaded": MODELS,
+                "uptime_seconds": time.time() - server.started_at
+            })
+
+    def do_POST(self):
+        server = self.server
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server.count(self.path, len(raw))
+
+        if not server.admit():
+            self._send({"success": False, "message": "rate limit exceeded"}, status=429, headers={"Retry-After": "1"})
+            return
+
+        if server._slots is not None:
+            server._slots.acquire()
+        try:
+            time.sleep(server.sample_latency())
+            if server.should_fail():
+                self._send({"success": False, "message": "injected failure"}, status=server.error_status)
+                return
+            self._handle_prediction(raw)
+        finally:
+            if server._slots is not None:
+                server._slots.release()
+
+    def _handle_prediction(self, raw: bytes):
+        server = self.server
+        self._msgpack = "msgpack" in self.headers.get("Content-Type", "")
+        if self._msgpack and "msgpack" not in server.wire_formats:
+            self._send({"success": False, "message": "unsupported media type"}, status=415)
+            return
+        try:
+            body = msgpack.unpackb(raw) if self._msgpack else json.loads(raw or b"{}")
+        except ValueError:
+            self._send({"success": False, "message": "malformed request body"}, status=400)
+            return
+        if "columnar" not in server.wire_formats and _has_columns(body):
+            self._send({"success": False, "message": "unsupported media type"}, status=415)
+            return
+
+        if self.path == "/predict":
+            self._send(self._predict(body))
+        elif self.path == "/predict/batch" and server.batch_endpoint:
+            self._send({"success": True, "results": [self._predict(item) for item in body.get("requests", [])]})
+        elif self.path == "/sessions/predict":
+            items = body.get("requests") if isinstance(body, dict) else None
+            if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+                self._send({"success": False, "message": "malformed request body"}, status=400)
+                return
+            self._send({"success": True, "results": [self._predict_session(item) for item in items]})
+        else:
+            self._send({"success": False, "message": "not found"}, status=404)
+
+    def _predict(self, body: Dict[str, Any], closes: Optional[List[float]] = None) -> Dict[str, Any]:
+        closes = _closes(body) if closes is None else closes
+        if not closes:
+            return {"success": False, "message": "no market data"}
+        up = closes[-1] >= closes[0]
+        confidence = self.server.confidence
+        return {
+            "success": True,
+            "symbol": body.get("symbol"),
+            "model_type": body.get("model_type"),
+            "prediction": {
+                "direction": "UP" if up else "DOWN",
+                "confidence": confidence,
+                "prediction": confidence if up else 1.0 - confidence
+            }
+        }
+
+    def _predict_session(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        server = self.server
+        with server._lock:
+            sessions = server.sessions
+            if item.get("session_id") is None:
+                window = item.get("window")
+                if not isinstance(window, int) or isinstance(window, bool) or window <= 0:
+                    return {"success": False, "message": "registration requires a positive window"}
+                session_id = f"s{len(sessions) + 1}"
+                closes = _closes(item)
+                sessions[session_id] = {"closes": closes[-window:], "window": window, "seq": len(closes)}
+            else:
+                session_id = item["session_id"]
+                session = sessions.get(session_id)
+                # A missing base_seq can't be in sequence: ask for the full window
+                if session is None or session["seq"] != item.get("base_seq"):
+                    return {"success": False, "resync": True, "message": "out of sequence"}
+                new = _closes(item)
+                session["closes"] = (session["closes"] + new)[-session["window"]:]
+                session["seq"] += len(new)
+            session = sessions[session_id]
+            closes, seq = list(session["closes"]), session["seq"]
+
+        return dict(self._predict(item, closes=closes), session={"id": session_id, "seq": seq})
+
+    def _send(self, payload: Dict[str, Any], status: int = 200, headers: Optional[Dict[str, str]] = None):
+        reply_msgpack = getattr(self, "_msgpack", False) and "msgpack" in self.headers.get("Accept", "")
+        data = msgpack.packb(payload) if reply_msgpack else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", MSGPACK_CONTENT_TYPE if reply_msgpack else "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+def _closes(body: Dict[str, Any]) -> List[float]:
+    """Close prices of a request item in any wire format"""
+    if "market_data_columns" in body:
+        closes = body["market_data_columns"].get("close", [])
+        if isinstance(closes, bytes):
+            closes = struct.unpack(f"<{len(closes) // 8}d", closes)
+        return list(closes)
+    return [candle["close"] for candle in body.get("market_data", [])]
+
+def _has_columns(body: Dict[str, Any]) -> bool:
+    """Whether a request body uses the columnar wire format"""
+    items = body.get("requests", [body])
+    return any("market_data_columns" in item for item in items)
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+def main():
+    """Serve the mock on the real service's address so the bot and examples run unchanged"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    config = {
+        'host': 'localhost',
+        'port': 8002,
+        'latency': 0.02,
+        'latency_distribution': 'lognormal',
+        'latency_jitter': 0.5,
+        'tail_probability': 0.01,
+        'tail_latency': 0.5,
+        'error_rate': 0.0,
+        'seed': 42,
+    }
+
+    server = MockC3POServer(**config)
+    logger.info("🧪 Mock C3PO service listening on %s", server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info("🛑 Mock C3PO service stopped: %s", server.stats)
+
+if __name__ == "__main__":
+    main()
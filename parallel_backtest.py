@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+🚀 PARALLEL BACKTEST RUNNER
+===========================
+
+Shards (symbol, config) backtest jobs across a ProcessPoolExecutor.
+
+Candle series are published once into shared memory as float64 columns
+(open, high, low, close, volume, timestamp per symbol). Each worker attaches
+to them in its initializer, so a task only pickles its symbol and config
+dict, never the candles. Per-job reports are merged into one summary with a
+combined, job-tagged trade log.
+
+Usage:
+    from parallel_backtest import run_parallel_backtests
+
+    report = run_parallel_backtests(
+        candles_by_symbol,
+        configs=[{'ai_confidence_threshold': t} for t in (0.6, 0.7, 0.8)],
+        max_workers=32,
+    )
+    for row in report['jobs']:
+        print(row['symbol'], row['config'], row['total_pnl_percent'])
+"""
+
+import asyncio
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, resource_tracker, shared_memory, util
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backtest import LocalPredictor, momentum_prediction, run_backtest
+from c3po_client import create_sample_market_data
+from market_data_store import FIELDS
+
+# Worker-side state set by _init_worker
+_worker_blocks: Dict[str, shared_memory.SharedMemory] = {}
+_worker_layout: Dict[str, Tuple[str, int]] = {}
+_worker_candles: Dict[str, List[Dict[str, float]]] = {}
+_worker_predict_fn: Optional[Callable] = None
+
+def _publish_candles(candles: Dict[str, List[Dict[str, float]]]) -> Tuple[Dict[str, Tuple[str, int]], List[shared_memory.SharedMemory]]:
+    """
+    Copy candle series into one shared-memory block per symbol (column-major float64)
+
+    Missing timestamps are stored as NaN so workers can drop them again and let
+    run_backtest space the candles itself.
+    """
+    layout = {}
+    blocks = []
+    for symbol, series in candles.items():
+        length = len(series)
+        block = shared_memory.SharedMemory(create=True, size=max(8 * len(FIELDS) * length, 1))
+        blocks.append(block)
+        columns = block.buf.cast('d')
+        for f, field in enumerate(FIELDS):
+            offset = f * length
+            for i, candle in enumerate(series):
+                columns[offset + i] = candle.get(field, math.nan)
+        columns.release()
+        layout[symbol] = (block.name, length)
+    return layout, blocks
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to a published block from a worker without registering it
+
+    The parent owns the blocks and unlinks them when the pool is done. Before
+    Python 3.13 (no ``track=False``) attaching registers the block with the
+    worker's resource tracker; a worker that ends up with its own tracker (e.g.
+    started outside the parent's tracker connection) would unlink the block
+    when it exits, under the other workers, and warn about a leak. The
+    registration is skipped instead, so cleanup never depends on the start method.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        pass
+
+    register = resource_tracker.register
+
+    def register_unless_shared_memory(resource: str, rtype: str):
+        if rtype != 'shared_memory':
+            register(resource, rtype)
+
+    resource_tracker.register = register_unless_shared_memory
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+def _release_blocks():
+    """Worker exit: unmap attached blocks (the parent unlinks them)"""
+    _worker_candles.clear()
+    for block in _worker_blocks.values():
+        block.close()
+    _worker_blocks.clear()
+
+def _init_worker(layout: Dict[str, Tuple[str, int]], predict_fn: Optional[Callable]):
+    """ProcessPool initializer: remember where each symbol's candles live"""
+    global _worker_predict_fn
+    _worker_layout.update(layout)
+    _worker_predict_fn = predict_fn
+    util.Finalize(None, _release_blocks, exitpriority=10)
+
+def _candles_for(symbol: str) -> List[Dict[str, float]]:
+    """Candles for a symbol, materialized from shared memory once per worker"""
+    candles = _worker_candles.get(symbol)
+    if candles is None:
+        name, length = _worker_layout[symbol]
+        block = _worker_blocks.get(symbol) or _attach(name)
+        _worker_blocks[symbol] = block
+        columns = block.buf.cast('d')
+        candles = []
+        for i in range(length):
+            candle = {field: columns[f * length + i] for f, field in enumerate(FIELDS)}
+            if math.isnan(candle['timestamp']):
+                del candle['timestamp']
+            candles.append(candle)
+        columns.release()
+        _worker_candles[symbol] = candles
+    return candles
+
+def _run_job(job: Tuple[int, str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Run one (symbol, config) backtest inside a worker"""
+    job_id, symbol, config = job
+    predictor = LocalPredictor(_worker_predict_fn or momentum_prediction)
+    report = asyncio.run(run_backtest({symbol: _candles_for(symbol)}, predictor=predictor, **config))
+    report.update(job_id=job_id, symbol=symbol, config=config, worker_pid=os.getpid())
+    return report
+
+def merge_reports(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge per-job backtest reports into one summary
+
+    Returns:
+        Dict with per-job rows (ranked by return), aggregate totals and the
+        combined trade log (each trade tagged with its job_id and config)
+    """
+    jobs = []
+    trades = []
+    for report in sorted(reports, key=lambda r: r['job_id']):
+        metrics = report['performance_metrics']
+        jobs.append({
+            'job_id': report['job_id'],
+            'symbol': report['symbol'],
+            'config': report['config'],
+            'final_value': report['final_value'],
+            'total_pnl': report['total_pnl'],
+            'total_pnl_percent': report['total_pnl_percent'],
+            'performance_metrics': metrics,
+            'wall_seconds': report['wall_seconds'],
+        })
+        for trade in report['trades']:
+            trades.append(dict(trade, job_id=report['job_id']))
+
+    total_trades = sum(job['performance_metrics']['total_trades'] for job in jobs)
+    winning = sum(job['performance_metrics']['winning_trades'] for job in jobs)
+    return {
+        'jobs': sorted(jobs, key=lambda job: job['total_pnl_percent'], reverse=True),
+        'totals': {
+            'jobs': len(jobs),
+            'total_trades': total_trades,
+            'win_rate': (winning / total_trades * 100) if total_trades else 0.0,
+            'total_pnl': sum(job['total_pnl'] for job in jobs),
+            'cpu_seconds': sum(job['wall_seconds'] for job in jobs),
+        },
+        'trades': trades,
+    }
+
+def run_parallel_backtests(candles: Dict[str, List[Dict[str, float]]],
+                           configs: List[Dict[str, Any]],
+                           symbols: Optional[List[str]] = None,
+                           max_workers: Optional[int] = None,
+                           predict_fn: Optional[Callable] = None,
+                           start_method: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Backtest every (symbol, config) pair across a process pool
+
+    Args:
+        candles: Symbol -> list of OHLCV dicts
+        configs: run_backtest keyword arguments per configuration
+                 (e.g. {'ai_confidence_threshold': 0.8, 'strategy_config': {'stop_loss_percent': 0.03}})
+        symbols: Subset of symbols to run (default: all)
+        max_workers: Worker processes (default: CPU count)
+        predict_fn: Picklable module-level prediction function for LocalPredictor
+                    (default: momentum_prediction)
+        start_method: Worker start method ('fork', 'spawn', 'forkserver'; default: platform default)
+
+    Returns:
+        Merged report (see merge_reports) plus wall-clock time and worker count
+    """
+    symbols = symbols or list(candles)
+    jobs = [
+        (job_id, symbol, config)
+        for job_id, (symbol, config) in enumerate((s, c) for s in symbols for c in configs)
+    ]
+
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (4 * workers))
+
+    layout, blocks = _publish_candles({symbol: candles[symbol] for symbol in symbols})
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=get_context(start_method),
+                                 initializer=_init_worker,
+                                 initargs=(layout, predict_fn)) as pool:
+            reports = list(pool.map(_run_job, jobs, chunksize=chunksize))
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    merged = merge_reports(reports)
+    merged['totals']['wall_seconds'] = time.perf_counter() - started
+    merged['totals']['workers'] = len({report['worker_pid'] for report in reports})
+    return merged
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+def main():
+    """Backtest a small threshold × stop-loss grid over sample symbols in parallel"""
+    print("🚀 Parallel Backtest Runner")
+    print("=" * 60)
+
+    candles = {symbol: create_sample_market_data(symbol, 24 * 60) for symbol in ["BTCUSDT", "ETHUSDT", "SOLUSDT", "DOGEUSDT"]}
+    configs = [
+        {'ai_confidence_threshold': threshold, 'strategy_config': {'stop_loss_percent': stop_loss}}
+        for threshold in (0.6, 0.7, 0.8)
+        for stop_loss in (0.02, 0.05)
+    ]
+
+    report = run_parallel_backtests(candles, configs)
+    totals = report['totals']
+    print(f"⚡ {totals['jobs']} jobs on {totals['workers']} workers: {totals['wall_seconds']:.2f}s wall, "
+          f"{totals['cpu_seconds']:.2f}s of backtesting ({totals['cpu_seconds'] / totals['wall_seconds']:.1f}x)")
+    print(f"🎯 {totals['total_trades']} trades, {totals['win_rate']:.1f}% win rate\n")
+
+    for job in report['jobs'][:5]:
+        print(f"   {job['symbol']} {job['config']} → {job['total_pnl_percent']:+.2f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+🧮 VECTORIZED PARAMETER SWEEP
+=============================
+
+Evaluates thousands of strategy parameter combinations against one shared
+price/prediction series in a single pass.
+
+Instead of one Portfolio per combination, the state of every combination
+(position side, entry price, cash, trade statistics, equity peak) lives in
+NumPy arrays indexed by grid point; each candle is one vectorized step across
+the whole grid. Predictions are computed once and shared by all combinations.
+
+Swept parameters mirror AIPaperTradingBot:
+    stop_loss_percent, take_profit_percent, max_holding_bars (max_holding_time
+    in candles), confidence_threshold (ai_confidence_threshold) and ai_weight
+    (blend of AI and technical scores when a technical_series() score series is given)
+
+Usage:
+    from parameter_sweep import make_grid, prediction_series, run_sweep
+
+    direction, confidence = prediction_series(candles, momentum_prediction)
+    grid = make_grid(stop_loss_percent=[0.02, 0.05], confidence_threshold=[0.6, 0.7, 0.8])
+    ranking = run_sweep(closes, direction, confidence, grid)
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from technical_indicators import IncrementalIndicators
+
+# Bot defaults (AIPaperTradingBot.strategy_config / Portfolio)
+BASE_POSITION_FRACTION = 0.15
+MAX_POSITION_FRACTION = 0.2
+
+def make_grid(stop_loss_percent: Sequence[float] = (0.05,),
+              take_profit_percent: Sequence[float] = (0.10,),
+              max_holding_bars: Sequence[int] = (24 * 60,),
+              confidence_threshold: Sequence[float] = (0.7,),
+              ai_weight: Sequence[float] = (1.0,)) -> Dict[str, np.ndarray]:
+    """
+    Cartesian product of parameter values as flat, equally long arrays
+
+    Returns:
+        Dict of parameter name -> array with one entry per combination
+    """
+    axes = {
+        'stop_loss_percent': stop_loss_percent,
+        'take_profit_percent': take_profit_percent,
+        'max_holding_bars': max_holding_bars,
+        'confidence_threshold': confidence_threshold,
+        'ai_weight': ai_weight,
+    }
+    mesh = np.meshgrid(*[np.asarray(values, dtype=np.float64) for values in axes.values()], indexing='ij')
+    return {name: values.ravel() for name, values in zip(axes, mesh)}
+
+def prediction_series(candles: List[Dict[str, float]],
+                      predict_fn: Callable[[List[Dict[str, float]], str], Optional[Dict[str, Any]]],
+                      symbol: str = "BTCUSDT",
+                      window: int = 50) -> tuple:
+    """
+    Run a predictor once over every trailing window of a candle series
+
+    Returns:
+        (direction, confidence) arrays aligned with ``candles``; direction is
+        +1 (UP), -1 (DOWN) or 0, and the first ``window - 1`` entries are neutral
+    """
+    direction = np.zeros(len(candles), dtype=np.int8)
+    confidence = np.zeros(len(candles), dtype=np.float64)
+    codes = {'UP': 1, 'DOWN': -1}
+
+    for t in range(window - 1, len(candles)):
+        prediction = predict_fn(candles[t - window + 1:t + 1], symbol)
+        if prediction:
+            direction[t] = codes.get(prediction.get('direction'), 0)
+            confidence[t] = prediction.get('confidence', 0.0)
+
+    return direction, confidence
+
+def technical_series(candles: List[Dict[str, float]], **indicator_kwargs) -> np.ndarray:
+    """
+    The bot's technical score after every candle of a series
+
+    Returns:
+        Array aligned with ``candles``; NaN while the indicators warm up
+    """
+    indicators = IncrementalIndicators(**indicator_kwargs)
+    scores = np.full(len(candles), np.nan)
+    for t, candle in enumerate(candles):
+        indicators.update(candle['high'], candle['low'], candle['close'], candle['volume'])
+        score = indicators.score()
+        if score is not None:
+            scores[t] = score
+    return scores
+
+def run_sweep(closes: Sequence[float],
+              direction: Sequence[int],
+              confidence: Sequence[float],
+              grid: Dict[str, np.ndarray],
+              technical_score: Optional[Sequence[float]] = None,
+              initial_cash: float = 10000.0,
+              rank_by: str = 'total_return_percent',
+              top: Optional[int] = None) -> List[Dict[str, float]]:
+    """
+    Simulate every grid combination over one price/prediction series
+
+    Rules follow the bot (a single-point grid reproduces run_backtest): enter
+    when the (blended) confidence clears the threshold, size at 15% of equity
+    scaled by 0.5-1.0x confidence (capped at 20%); exit on stop loss, take
+    profit (both mirrored for shorts), holding longer than max_holding_bars, or
+    an opposite AI prediction above the threshold; exits are checked before
+    entries on each candle and whatever is open after the last candle is closed
+    at its price. A closed position returns its cost plus P&L, for shorts too.
+
+    Args:
+        closes: Close price per candle
+        direction: Predicted direction per candle (+1/-1/0)
+        confidence: Prediction confidence per candle (0-1)
+        grid: Parameter arrays from make_grid()
+        technical_score: Optional per-candle technical score in [-1, 1] (NaN while
+                         warming up); blended with the signed AI confidence using
+                         ai_weight, and the blend must reach ai_weight * threshold
+        initial_cash: Starting cash of every combination
+        rank_by: Result column to sort by (descending; max_drawdown_percent ascending)
+        top: Only return the best ``top`` rows
+
+    Returns:
+        Ranked list of dicts with the parameters and PnL/drawdown/win-rate columns;
+        profit_factor (average win over average loss) and sharpe_ratio (mean over
+        sample std of per-candle returns) use MetricsAccumulator's definitions
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    ai_direction = np.asarray(direction, dtype=np.float64)
+    ai_confidence = np.asarray(confidence, dtype=np.float64)
+    signed = ai_direction * ai_confidence
+    technical = None if technical_score is None else np.asarray(technical_score, dtype=np.float64)
+
+    stop_loss = grid['stop_loss_percent']
+    take_profit = grid['take_profit_percent']
+    max_hold = grid['max_holding_bars']
+    threshold = grid['confidence_threshold']
+    ai_weight = grid['ai_weight']
+    n = len(stop_loss)
+
+    # Per-combination state
+    side = np.zeros(n)            # +1 long, -1 short, 0 flat
+    entry = np.zeros(n)
+    quantity = np.zeros(n)
+    held = np.zeros(n)
+    cash = np.full(n, initial_cash)
+    trades = np.zeros(n)
+    wins = np.zeros(n)
+    gross_win = np.zeros(n)
+    gross_loss = np.zeros(n)
+    peak = np.full(n, initial_cash)
+    max_drawdown = np.zeros(n)
+    previous_equity = np.full(n, initial_cash)
+    marks = 0
+    mean_return = np.zeros(n)
+    m2_return = np.zeros(n)
+
+    def mark_equity(equity: np.ndarray):
+        # Welford over mark-to-mark returns, as MetricsAccumulator.mark_equity
+        nonlocal marks, previous_equity
+        step_return = equity / previous_equity - 1.0
+        marks += 1
+        delta = step_return - mean_return
+        mean_return[:] += delta / marks
+        m2_return[:] += delta * (step_return - mean_return)
+        previous_equity = equity
+
+    def close_where(mask: np.ndarray, price: float):
+        pnl = side * (price - entry) * quantity
+        np.add(cash, np.where(mask, entry * quantity + pnl, 0.0), out=cash)
+        np.add(trades, mask, out=trades)
+        np.add(wins, mask & (pnl > 0), out=wins)
+        np.add(gross_win, np.where(mask & (pnl > 0), pnl, 0.0), out=gross_win)
+        np.add(gross_loss, np.where(mask & (pnl <= 0), -pnl, 0.0), out=gross_loss)
+        side[mask] = 0.0
+        quantity[mask] = 0.0
+        held[mask] = 0.0
+
+    for t, price in enumerate(closes):
+        # Blended signal for every combination at this candle (same thresholds as the bot)
+        if technical is None or np.isnan(technical[t]):
+            score = np.full(n, signed[t])
+            entry_threshold = threshold
+        else:
+            score = ai_weight * signed[t] + (1.0 - ai_weight) * technical[t]
+            entry_threshold = ai_weight * threshold
+        strength = np.abs(score)
+        signal = np.sign(score)
+
+        # Exits (the AI exit looks at the prediction alone, like the bot)
+        in_position = side != 0
+        held += in_position
+        is_long, is_short = side > 0, side < 0
+        exit_mask = in_position & (
+            (held > max_hold)
+            | (is_long & ((price <= entry * (1 - stop_loss)) | (price >= entry * (1 + take_profit))))
+            | (is_short & ((price >= entry * (1 + stop_loss)) | (price <= entry * (1 - take_profit))))
+            | ((ai_direction[t] == -side) & (ai_confidence[t] > threshold))
+        )
+        if exit_mask.any():
+            close_where(exit_mask, price)
+
+        # Entries
+        enter = (side == 0) & (signal != 0) & (strength >= entry_threshold)
+        if enter.any():
+            equity = cash  # flat combinations hold everything in cash
+            size = np.minimum(equity * BASE_POSITION_FRACTION * (0.5 + 0.5 * strength),
+                              equity * MAX_POSITION_FRACTION)
+            side[enter] = signal[enter]
+            entry[enter] = price
+            quantity[enter] = size[enter] / price
+            cash[enter] -= size[enter]
+
+        # Mark to market
+        equity = cash + quantity * (entry + side * (price - entry))
+        np.maximum(peak, equity, out=peak)
+        np.maximum(max_drawdown, (peak - equity) / peak, out=max_drawdown)
+        mark_equity(equity)
+
+    # Session end: close whatever is still open at the last price and mark once more, like the bot
+    if len(closes):
+        close_where(side != 0, closes[-1])
+        mark_equity(cash.copy())
+
+    std_return = np.sqrt(m2_return / (marks - 1)) if marks > 1 else np.zeros(n)
+    losses = trades - wins
+    avg_win = np.divide(gross_win, wins, out=np.zeros(n), where=wins > 0)
+    avg_loss = np.divide(gross_loss, losses, out=np.zeros(n), where=losses > 0)
+
+    columns = {
+        **{name: values for name, values in grid.items()},
+        'final_value': cash,
+        'total_return_percent': (cash / initial_cash - 1.0) * 100,
+        'max_drawdown_percent': max_drawdown * 100,
+        'trades': trades,
+        'win_rate': np.divide(wins, trades, out=np.zeros(n), where=trades > 0) * 100,
+        'profit_factor': np.divide(avg_win, avg_loss, out=np.zeros(n), where=avg_loss > 0),
+        'sharpe_ratio': np.divide(mean_return, std_return, out=np.zeros(n), where=std_return > 0),
+    }
+
+    order = np.argsort(columns[rank_by], kind='stable')
+    if rank_by != 'max_drawdown_percent':
+        order = order[::-1]
+    if top is not None:
+        order = order[:top]
+
+    return [{name: float(values[i]) for name, values in columns.items()} for i in order]
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+def main():
+    """Sweep a 10,000-point grid over a week of sample 1-minute candles"""
+    from backtest import momentum_prediction
+    from synthetic_market_data import generate_candles
+
+    print("🧮 Vectorized Parameter Sweep")
+    print("=" * 60)
+
+    candles = generate_candles("BTCUSDT", 7 * 24 * 60, seed=7)
+    closes = [candle['close'] for candle in candles]
+
+    started = time.perf_counter()
+    direction, confidence = prediction_series(candles, momentum_prediction)
+    print(f"🔮 Predictions for {len(candles)} candles in {time.perf_counter() - started:.2f}s")
+
+    grid = make_grid(
+        stop_loss_percent=np.linspace(0.01, 0.10, 10),
+        take_profit_percent=np.linspace(0.02, 0.20, 10),
+        max_holding_bars=[60, 240, 720, 1440, 2880, 4320, 5760, 7200, 8640, 10080],
+        confidence_threshold=np.linspace(0.55, 0.95, 10),
+    )
+
+    started = time.perf_counter()
+    ranking = run_sweep(closes, direction, confidence, grid, top=10)
+    print(f"⚡ {len(grid['stop_loss_percent']):,} combinations in {time.perf_counter() - started:.2f}s\n")
+
+    for row in ranking:
+        print(f"   SL {row['stop_loss_percent']:.1%} | TP {row['take_profit_percent']:.1%} | "
+              f"hold {row['max_holding_bars']:.0f} | conf {row['confidence_threshold']:.0%} → "
+              f"{row['total_return_percent']:+.2f}% | DD {row['max_drawdown_percent']:.2f}% | "
+              f"{row['trades']:.0f} trades, {row['win_rate']:.1f}% wins")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+📐 INCREMENTAL TECHNICAL INDICATORS
+===================================
+
+Streaming EMA, RSI, ATR, Bollinger Bands and VWAP that update in O(1) per
+candle, plus a combined technical score the bot blends with C3PO predictions
+through ``strategy_config['ai_weight']``.
+
+Every indicator keeps only running state: exponential/Wilder averages, and
+running sums over a fixed-length deque for the windowed ones. Nothing is
+recomputed over the candle window.
+
+Usage:
+    from technical_indicators import IndicatorEngine
+
+    engine = IndicatorEngine()
+    engine.sync("BTCUSDT", store["BTCUSDT"])    # consume candles appended since last sync
+    score = engine["BTCUSDT"].score()           # -1 (bearish) .. +1 (bullish), None until warm
+"""
+
+import math
+from collections import deque
+from typing import Dict, Optional
+
+from market_data_store import CandleRingBuffer
+
+class _RollingSum:
+    """Sum of the last ``period`` values, with periodic exact recomputation to shed float drift"""
+
+    __slots__ = ("values", "total", "_updates")
+
+    def __init__(self, period: int):
+        self.values: deque = deque(maxlen=period)
+        self.total = 0.0
+        self._updates = 0
+
+    def push(self, value: float):
+        if len(self.values) == self.values.maxlen:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+
+        self._updates += 1
+        if self._updates >= 16 * self.values.maxlen:
+            self.total = math.fsum(self.values)
+            self._updates = 0
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.values.maxlen
+
+class IncrementalIndicators:
+    """Technical indicators for one symbol, updated one candle at a time"""
+
+    def __init__(self,
+                 ema_fast: int = 12,
+                 ema_slow: int = 26,
+                 rsi_period: int = 14,
+                 atr_period: int = 14,
+                 bollinger_period: int = 20,
+                 bollinger_k: float = 2.0,
+                 vwap_period: int = 50):
+        """
+        Initialize indicators
+
+        Args:
+            ema_fast: Fast EMA period (candles)
+            ema_slow: Slow EMA period (candles)
+            rsi_period: RSI period (Wilder smoothing)
+            atr_period: ATR period (Wilder smoothing)
+            bollinger_period: Bollinger moving-average window
+            bollinger_k: Bollinger band width in standard deviations
+            vwap_period: Rolling VWAP window
+        """
+        self._fast_alpha = 2.0 / (ema_fast + 1)
+        self._slow_alpha = 2.0 / (ema_slow + 1)
+        self.rsi_period = rsi_period
+        self.atr_period = atr_period
+        self.bollinger_k = bollinger_k
+        self.warmup = max(ema_slow, rsi_period + 1, atr_period + 1, bollinger_period)
+
+        self.count = 0
+        self.close: Optional[float] = None
+        self.ema_fast: Optional[float] = None
+        self.ema_slow: Optional[float] = None
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self.atr: Optional[float] = None
+        self._closes = _RollingSum(bollinger_period)
+        self._closes_sq = _RollingSum(bollinger_period)
+        self._price_volume = _RollingSum(vwap_period)
+        self._volume = _RollingSum(vwap_period)
+
+    def update(self, high: float, low: float, close: float, volume: float):
+        """Add one candle"""
+        previous = self.close
+        self.count += 1
+        self.close = close
+
+        # EMAs
+        if self.ema_fast is None:
+            self.ema_fast = self.ema_slow = close
+        else:
+            self.ema_fast += self._fast_alpha * (close - self.ema_fast)
+            self.ema_slow += self._slow_alpha * (close - self.ema_slow)
+
+        if previous is not None:
+            # RSI and ATR: simple average over the first period, Wilder smoothing after
+            change = close - previous
+            true_range = max(high - low, abs(high - previous), abs(low - previous))
+            samples = self.count - 1
+            rsi_n = min(samples, self.rsi_period)
+            atr_n = min(samples, self.atr_period)
+            self._avg_gain += (max(change, 0.0) - self._avg_gain) / rsi_n
+            self._avg_loss += (max(-change, 0.0) - self._avg_loss) / rsi_n
+            self.atr = true_range if self.atr is None else self.atr + (true_range - self.atr) / atr_n
+
+        # Bollinger (rolling mean/variance) and VWAP (rolling sums)
+        self._closes.push(close)
+        self._closes_sq.push(close * close)
+        typical = (high + low + close) / 3.0
+        self._price_volume.push(typical * volume)
+        self._volume.push(volume)
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.warmup
+
+    @property
+    def rsi(self) -> Optional[float]:
+        if self.count < 2:
+            return None
+        if self._avg_loss == 0:
+            return 100.0 if self._avg_gain > 0 else 50.0
+        return 100.0 - 100.0 / (1.0 + self._avg_gain / self._avg_loss)
+
+    @property
+    def bollinger(self) -> Optional[tuple]:
+        """(lower, middle, upper) bands, None until the window is full"""
+        if not self._closes.full:
+            return None
+        n = len(self._closes.values)
+        mean = self._closes.total / n
+        std = math.sqrt(max(self._closes_sq.total / n - mean * mean, 0.0))
+        return mean - self.bollinger_k * std, mean, mean + self.bollinger_k * std
+
+    @property
+    def vwap(self) -> Optional[float]:
+        if self._volume.total <= 0:
+            return None
+        return self._price_volume.total / self._volume.total
+
+    def score(self) -> Optional[float]:
+        """
+        Combined trend-following score in [-1, 1] (None until warmed up)
+
+        Mean of four components: EMA fast/slow spread and close-vs-VWAP (both in
+        ATR units, squashed with tanh), RSI distance from 50, and the close's
+        position within the Bollinger Bands.
+        """
+        if not self.ready or not self.atr:
+            return None
+
+        lower, middle, upper = self.bollinger
+        band = (self.close - middle) / (upper - middle) if upper > middle else 0.0
+        vwap = self.vwap
+
+        components = (
+            math.tanh((self.ema_fast - self.ema_slow) / self.atr),
+            (self.rsi - 50.0) / 50.0,
+            max(-1.0, min(1.0, band)),
+            math.tanh((self.close - vwap) / self.atr) if vwap is not None else 0.0,
+        )
+        return sum(components) / len(components)
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        """Current indicator values"""
+        bands = self.bollinger or (None, None, None)
+        return {
+            'ema_fast': self.ema_fast,
+            'ema_slow': self.ema_slow,
+            'rsi': self.rsi,
+            'atr': self.atr,
+            'bollinger_lower': bands[0],
+            'bollinger_middle': bands[1],
+            'bollinger_upper': bands[2],
+            'vwap': self.vwap,
+            'score': self.score(),
+        }
+
+class IndicatorEngine:
+    """Per-symbol IncrementalIndicators fed from CandleRingBuffers"""
+
+    def __init__(self, **indicator_kwargs):
+        """
+        Initialize engine
+
+        Args:
+            **indicator_kwargs: Periods passed to every IncrementalIndicators
+        """
+        self.indicator_kwargs = indicator_kwargs
+        self._indicators: Dict[str, IncrementalIndicators] = {}
+        self._consumed: Dict[str, int] = {}
+
+    def __getitem__(self, symbol: str) -> IncrementalIndicators:
+        indicators = self._indicators.get(symbol)
+        if indicators is None:
+            indicators = self._indicators[symbol] = IncrementalIndicators(**self.indicator_kwargs)
+        return indicators
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._indicators
+
+    def sync(self, symbol: str, buffer: CandleRingBuffer) -> IncrementalIndicators:
+        """
+        Feed the candles appended to ``buffer`` since the last sync (O(new candles))
+
+        If more candles arrived than the buffer retains, only the retained ones
+        are applied.
+        """
+        indicators = self[symbol]
+        new = min(buffer.appended - self._consumed.get(symbol, 0), len(buffer))
+        if new > 0:
+            window = buffer.window(new)
+            for high, low, close, volume in zip(window.high, window.low, window.close, window.volume):
+                indicators.update(high, low, close, volume)
+        self._consumed[symbol] = buffer.appended
+        return indicators
+
+    def score(self, symbol: str) -> Optional[float]:
+        """Technical score for a symbol (None if unknown or still warming up)"""
+        indicators = self._indicators.get(symbol)
+        return indicators.score() if indicators is not None else None
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+🤖 AI Paper Trading Bot Test
+============================
+
+Checks the bot's signal logic with an in-process predictor: entry signals
+from the AI prediction alone, the technical score alone, and their blend.
+Also checks the Portfolio's cached totals against a full recompute, the
+columnar TradeLog round trip and the bounded concurrent evaluation.
+"""
+
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+from ai_paper_trading_bot import AIPaperTradingBot, Portfolio, Position, Trade, TradeLog
+from backtest import LocalPredictor
+from synthetic_market_data import generate_candles
+
+CANDLES = generate_candles("BTCUSDT", 60, seed=3, start_time=1_700_000_000.0)
+
+class StubIndicators:
+    """IndicatorEngine stand-in with a fixed technical score"""
+
+    def __init__(self, score):
+        self._score = score
+
+    def sync(self, symbol, buffer):
+        pass
+
+    def score(self, symbol):
+        return self._score
+
+def make_bot(predict_fn=None, technical=None, **bot_kwargs):
+    bot = AIPaperTradingBot(trading_symbols=["BTCUSDT"], predictor=LocalPredictor(predict_fn or (lambda data, symbol: None)),
+                            quiet=True, **bot_kwargs)
+    bot.indicators = StubIndicators(technical)
+    bot.market_data["BTCUSDT"].extend(CANDLES)
+    return bot
+
+def entry_signal(direction=None, confidence=0.0, technical=None, **strategy):
+    """Entry signal for one prediction (None: prediction unavailable) and technical score"""
+    def predict(data, symbol):
+        return {'direction': direction, 'confidence': confidence} if direction else None
+
+    bot = make_bot(predict, technical)
+    bot.strategy_config.update(strategy)
+    return asyncio.run(bot._get_entry_signal("BTCUSDT"))
+
+def test_entry_signal_ai_only():
+    """Test AI-only entries: same ai_confidence_threshold comparison as before blending"""
+    print("\n🔮 Testing AI-Only Entry Signals")
+    print("-" * 40)
+
+    signal = entry_signal("UP", 0.9)
+    assert (signal['action'], signal['reason'], signal['confidence']) == ('buy', 'ai_signal_up', 0.9)
+    assert entry_signal("DOWN", 0.7)['action'] == 'sell'  # at the threshold enters
+    assert entry_signal("UP", 0.69)['reason'] == 'low_ai_confidence'
+    assert entry_signal("NEUTRAL", 0.95)['action'] == 'hold'
+    assert entry_signal()['reason'] == 'no_ai_prediction'
+    print("✅ AI-only entries at confidence >= 0.7")
+
+def test_entry_signal_technical_only():
+    """Test that the technical score alone drives entries when the prediction is missing"""
+    signal = entry_signal(technical=0.75)
+    assert (signal['action'], signal['reason']) == ('buy', 'technical_signal_up')
+    assert entry_signal(technical=-0.8)['action'] == 'sell'
+    assert entry_signal(technical=0.5)['reason'] == 'low_technical_confidence'
+
+def test_entry_signal_blended():
+    """Test the blended threshold: neutral technicals keep AI entries, others move the bar"""
+    print("\n🧪 Testing Blended Entry Signals")
+    print("-" * 40)
+
+    # 0.7 * 0.9 = 0.63 against 0.7 * 0.7 = 0.49
+    signal = entry_signal("UP", 0.9, technical=0.0)
+    assert (signal['action'], signal['reason']) == ('buy', 'blended_signal_up')
+    assert abs(signal['confidence'] - 0.63) < 1e-12
+    assert entry_signal("UP", 0.7, technical=0.0)['action'] == 'buy'
+
+    # Agreeing technicals lower the AI confidence needed, disagreeing ones raise it
+    assert entry_signal("UP", 0.6, technical=0.4)['action'] == 'buy'
+    assert entry_signal("UP", 0.75, technical=-0.3)['reason'] == 'low_blended_confidence'
+    assert entry_signal("DOWN", 0.9, technical=-0.5)['action'] == 'sell'
+
+    # An explicit blended threshold overrides the default
+    assert entry_signal("UP", 0.9, technical=0.0, blended_threshold=0.7)['action'] == 'hold'
+    assert entry_signal("UP", 0.9, technical=0.0, ai_weight=1.0)['action'] == 'buy'
+    print("✅ Blend thresholds hold")
+
+def assert_totals_match(portfolio):
+    """Cached aggregates against a recompute over the open positions"""
+    positions = portfolio.positions.values()
+    market_value = sum(position.market_value for position in positions)
+    unrealized_pnl = sum(position.unrealized_pnl for position in positions)
+    assert abs(portfolio.market_value - market_value) < 1e-6
+    assert abs(portfolio.unrealized_pnl - unrealized_pnl) < 1e-6
+    assert abs(portfolio.total_value - (portfolio.cash + market_value)) < 1e-6
+
+def test_portfolio_cached_totals():
+    """Test that incremental totals match a recompute through opens, marks and closes, longs and shorts"""
+    print("\n💼 Testing Portfolio Cached Totals")
+    print("-" * 40)
+
+    rng = random.Random(9)
+    portfolio = Portfolio(100000)
+    prices = {symbol: rng.uniform(10, 1000) for symbol in ["BTCUSDT", "ETHUSDT", "SOLUSDT", "ADAUSDT", "DOTUSDT"]}
+
+    for _ in range(2000):
+        symbol = rng.choice(list(prices))
+        prices[symbol] *= 1 + rng.uniform(-0.03, 0.03)
+        action = rng.random()
+        if symbol not in portfolio.positions and action < 0.3:
+            quantity = rng.uniform(1, 20)
+            position = Position(symbol, quantity, prices[symbol], prices[symbol], datetime.now(), rng.choice(['long', 'short']))
+            portfolio.add_position(position, prices[symbol] * quantity)
+        elif symbol in portfolio.positions and action < 0.1:
+            position = portfolio.remove_position(symbol)
+            portfolio.cash += position.market_value
+        else:
+            portfolio.mark_price(symbol, prices[symbol])
+        assert_totals_match(portfolio)
+
+    # A short that loses is worth less than its cost, a long that gains more
+    portfolio = Portfolio(10000)
+    portfolio.add_position(Position("BTCUSDT", 1.0, 100.0, 100.0, datetime.now(), 'short'), 100.0)
+    portfolio.add_position(Position("ETHUSDT", 2.0, 50.0, 50.0, datetime.now(), 'long'), 100.0)
+    portfolio.mark_price("BTCUSDT", 110.0)
+    portfolio.mark_price("ETHUSDT", 60.0)
+    assert_totals_match(portfolio)
+    assert (portfolio.market_value, portfolio.unrealized_pnl, portfolio.total_value) == (210.0, 10.0, 10010.0)
+    print("✅ Totals match a recompute (shorts marked at cost plus P&L)")
+
+def test_trade_log_round_trip():
+    """Test append, indexing (negative too), slicing, last() and iteration against the Trade objects"""
+    print("\n📒 Testing TradeLog Round Trip")
+    print("-" * 40)
+
+    started = datetime(2026, 1, 5, 9, 30)
+    trades = [
+        Trade(symbol=["BTCUSDT", "ETHUSDT", "SOLUSDT"][i % 3], side=['long', 'short'][i % 2],
+              quantity=0.1 * (i + 1), entry_price=100.0 + i, exit_price=101.5 + i,
+              entry_time=started + timedelta(minutes=i), exit_time=started + timedelta(minutes=i, seconds=30.25),
+              pnl=(-1) ** i * 1.5, pnl_percent=(-1) ** i * 0.75, strategy='ai_c3po',
+              ai_confidence=0.8, c3po_used=i % 4 != 0)
+        for i in range(25)
+    ]
+    log = TradeLog()
+    for trade in trades:
+        log.append(trade)
+
+    assert len(log) == 25
+    assert list(log) == trades
+    assert log[0] == trades[0] and log[-1] == trades[-1] and log[-25] == trades[0]
+    assert log[3:9:2] == trades[3:9:2]
+    assert log.last() == trades[-10:] and log.last(3) == trades[-3:] and log.last(100) == trades and log.last(0) == []
+    for index in (25, -26):
+        try:
+            log[index]
+            assert False, f"index {index} should raise"
+        except IndexError:
+            pass
+
+    # Repeated strings are stored once, columns come back in trade order
+    assert log._strings == ["BTCUSDT", "long", "ai_c3po", "ETHUSDT", "short", "SOLUSDT"]
+    assert log.column('symbol') == [trade.symbol for trade in trades]
+    assert list(log.column('pnl')) == [trade.pnl for trade in trades]
+    assert log.column('c3po_used') == [trade.c3po_used for trade in trades]
+    assert log.nbytes == 77 * len(trades)
+    print(f"✅ {len(log)} trades in {log.nbytes} bytes, {len(log._strings)} interned strings")
+
+def test_evaluate_concurrently():
+    """Test the concurrency cap with a slow fake predictor, and input order when one evaluation raises"""
+    print("\n🧵 Testing Bounded Concurrent Evaluation")
+    print("-" * 40)
+
+    in_flight = 0
+    peak = 0
+
+    async def slow_predict(symbol):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            # Later symbols finish first, so gather order differs from completion order
+            await asyncio.sleep(0.001 * (30 - int(symbol[3:])))
+            if symbol == "SYM07":
+                raise RuntimeError("model unavailable")
+            return symbol.lower()
+        finally:
+            in_flight -= 1
+
+    symbols = [f"SYM{i:02d}" for i in range(30)]
+    bot = make_bot(max_concurrent_evaluations=4)
+    results = asyncio.run(bot._evaluate_concurrently(slow_predict, symbols, default="failed"))
+
+    assert peak == 4
+    assert results == [("failed" if symbol == "SYM07" else symbol.lower()) for symbol in symbols]
+
+    # A single item takes the sequential path with the same failure handling
+    assert asyncio.run(bot._evaluate_concurrently(slow_predict, ["SYM07"], default="failed")) == ["failed"]
+    print(f"✅ Peak concurrency {peak}, {len(results)} results in input order")
+
+if __name__ == "__main__":
+    test_entry_signal_ai_only()
+    test_entry_signal_technical_only()
+    test_entry_signal_blended()
+    test_portfolio_cached_totals()
+    test_trade_log_round_trip()
+    test_evaluate_concurrently()
@@ -6,8 +6,22 @@
 Test script to verify C3PO AI models are working with the crypto trading system.
 """
 
-from c3po_client import C3POClient, create_sample_market_data, format_prediction_output
+from c3po_client import (AsyncC3POClient, C3POClient, CircuitBreaker, LatencyBudget, PredictionCache,
+                         create_sample_market_data, format_prediction_output, msgpack)
+from mock_c3po_server import MockC3POServer
+from synthetic_market_data import generate_candles
+import asyncio
+import json
+import socket
+import threading
 import time
+import urllib.error
+import urllib.request
+
+def start_stand_in_server(**options):
+    """Start a MockC3POServer on a free local port; returns (server, base_url)"""
+    server = MockC3POServer(**options).start()
+    return server, server.url
 
 def test_c3po_integration():
     """Test C3PO integration with the trading system"""
@@ -22,6 +36,7 @@ def test_c3po_integration():
     if not client.health_check():
         print("❌ C3PO service is not available!")
         print("💡 Make sure the C3PO service is running at http://localhost:8002")
+        print("💡 For a local stand-in run: python mock_c3po_server.py")
         return False
     
     print("✅ C3PO service is healthy!")
@@ -44,20 +59,25 @@ def test_c3po_integration():
     successful_predictions = 0
     total_tests = 0
     
+    # Create realistic market data and request every symbol × model in one batch
+    batch = [
+        {
+            "market_data": create_sample_market_data(symbol, 30),
+            "symbol": symbol,
+            "model_type": model_type,
+            "prediction_horizon": "1h"
+        }
+        for symbol in test_symbols
+        for model_type in model_types
+    ]
+    predictions = iter(client.predict_batch(batch))
+    
     for symbol in test_symbols:
         print(f"\n📈 Testing {symbol}:")
         
-        # Create realistic market data
-        market_data = create_sample_market_data(symbol, 30)
-        
         for model_type in model_types:
             total_tests += 1
-            prediction = client.predict(
-                market_data=market_data,
-                symbol=symbol,
-                model_type=model_type,
-                prediction_horizon="1h"
-            )
+            prediction = next(predictions)
             
             if prediction:
                 successful_predictions += 1
@@ -92,6 +112,517 @@ def test_c3po_integration():
         print("⚠️ WARNING: C3PO integration has issues")
         return False
 
+def test_predict_batch():
+    """Test that a batch of predictions is served by a single round trip"""
+    print("\n📦 Testing Batch Predictions (local stand-in)")
+    print("-" * 40)
+    
+    server, base_url = start_stand_in_server()
+    try:
+        client = C3POClient(base_url)
+        batch = [
+            {"market_data": create_sample_market_data(symbol, 30), "symbol": symbol, "model_type": model_type}
+            for symbol in ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+            for model_type in ["ensemble", "vae"]
+        ]
+        predictions = client.predict_batch(batch)
+        
+        assert len(predictions) == len(batch)
+        assert all(p and p['success'] for p in predictions)
+        assert [(p['symbol'], p['model_type']) for p in predictions] == \
+            [(item['symbol'], item['model_type']) for item in batch]
+        assert server.request_counts.get("/predict/batch") == 1
+        assert "/predict" not in server.request_counts
+        print(f"✅ {len(predictions)} predictions in 1 request")
+    finally:
+        server.stop()
+
+def test_predict_batch_fallback():
+    """Test per-item requests against a service without the batch endpoint"""
+    print("\n📦 Testing Batch Fallback (local stand-in)")
+    print("-" * 40)
+    
+    batch = [
+        {"market_data": create_sample_market_data(symbol, 30), "symbol": symbol}
+        for symbol in ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    ]
+    server, base_url = start_stand_in_server(batch_endpoint=False)
+    try:
+        client = C3POClient(base_url, coalesce=False)
+        predictions = client.predict_batch(batch)
+        assert not client.batch_supported
+        assert [p['symbol'] for p in predictions] == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+        
+        # Once unsupported, later batches go straight to per-item requests
+        client.predict_batch(batch)
+        assert server.request_counts.get("/predict/batch") == 1
+        assert server.request_counts.get("/predict") == 6
+        
+        async def run():
+            async with AsyncC3POClient(base_url, coalesce=False) as client:
+                predictions = await client.predict_batch(batch)
+                return client.batch_supported, [p['symbol'] for p in predictions]
+        
+        assert asyncio.run(run()) == (False, ["BTCUSDT", "ETHUSDT", "SOLUSDT"])
+        assert server.request_counts.get("/predict/batch") == 2
+        assert server.request_counts.get("/predict") == 9
+        print("✅ Fell back to per-item requests (sync and async)")
+    finally:
+        server.stop()
+
+def test_async_client():
+    """Test AsyncC3POClient predictions, batches and connection pooling"""
+    print("\n🔀 Testing Async Client (local stand-in)")
+    print("-" * 40)
+    
+    server, base_url = start_stand_in_server(latency=0.05)
+    
+    async def run():
+        async with AsyncC3POClient(base_url, coalesce=False, max_connections=4) as client:
+            assert await client.health_check()
+            window = create_sample_market_data("BTCUSDT", 50)
+            prediction = await client.predict(window, symbol="BTCUSDT", model_type="vae")
+            assert prediction['success'] and (prediction['symbol'], prediction['model_type']) == ("BTCUSDT", "vae")
+            
+            batch = [
+                {"market_data": create_sample_market_data(symbol, 30), "symbol": symbol}
+                for symbol in ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+            ]
+            predictions = await client.predict_batch(batch)
+            assert [p['symbol'] for p in predictions] == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+            assert server.request_counts.get("/predict/batch") == 1
+            
+            # 16 concurrent calls share the pool: at most 4 connections, reused across calls
+            session = client._session
+            started = time.monotonic()
+            windows = [create_sample_market_data("BTCUSDT", 50) for _ in range(16)]
+            results = await asyncio.gather(*(client.predict(w) for w in windows))
+            elapsed = time.monotonic() - started
+            assert all(r and r['success'] for r in results)
+            assert client._session is session
+            assert server.connections <= 4
+            assert elapsed < 16 * 0.05  # overlapped, not one after another
+            return elapsed
+    
+    try:
+        elapsed = asyncio.run(run())
+        print(f"✅ 16 concurrent predictions in {elapsed:.2f}s over {server.connections} connections")
+    finally:
+        server.stop()
+
+def test_async_deadlines():
+    """Test AsyncC3POClient per-call deadlines and latency budgets"""
+    print("\n⏱️ Testing Async Deadlines (local stand-in)")
+    print("-" * 40)
+    
+    server, base_url = start_stand_in_server(latency=0.5)
+    
+    async def run():
+        async with AsyncC3POClient(base_url, timeout=5.0, coalesce=False, wire_format="json") as client:
+            window = create_sample_market_data("BTCUSDT", 50)
+            
+            # The per-call timeout overrides the client default
+            started = time.monotonic()
+            assert await client.predict(window, timeout=0.1) is None
+            assert time.monotonic() - started < 0.4
+            
+            # The batch deadline covers the whole round trip
+            started = time.monotonic()
+            assert await client.predict_batch([{"market_data": window}], timeout=0.1) == [None]
+            assert time.monotonic() - started < 0.4
+            
+            # An exhausted budget skips the request; a roomy one lets it complete
+            sent = server.request_counts.get("/predict")
+            assert await client.predict(window, budget=LatencyBudget(0)) is None
+            assert server.request_counts.get("/predict") == sent
+            assert await client.predict(window, budget=LatencyBudget(2.0)) is not None
+    
+    try:
+        asyncio.run(run())
+        print("✅ Deadlines enforced per call")
+    finally:
+        server.stop()
+
+def test_prediction_cache():
+    """Test that repeated windows are served from the cache and entries expire"""
+    print("\n🗃️ Testing Prediction Cache (local stand-in)")
+    print("-" * 40)
+    
+    now = [0.0]
+    cache = PredictionCache(max_size=2, ttl=10.0, clock=lambda: now[0])
+    server, base_url = start_stand_in_server()
+    try:
+        client = C3POClient(base_url, cache=cache)
+        window = create_sample_market_data("BTCUSDT", 50)
+        
+        first = client.predict(window, symbol="BTCUSDT")
+        second = client.predict(list(window), symbol="BTCUSDT")
+        assert first == second
+        assert server.request_counts.get("/predict") == 1
+        assert cache.stats['hits'] == 1 and cache.stats['misses'] == 1
+        
+        # A new candle changes the fingerprint
+        client.predict(window + create_sample_market_data("BTCUSDT", 1), symbol="BTCUSDT")
+        assert server.request_counts.get("/predict") == 2
+        
+        # Expired entries are refetched, and the LRU bound holds
+        now[0] = 11.0
+        client.predict(window, symbol="BTCUSDT")
+        client.predict(window, symbol="ETHUSDT")
+        assert server.request_counts.get("/predict") == 4
+        assert cache.stats['size'] == 2
+        print(f"✅ Cache stats: {cache.stats}")
+    finally:
+        server.stop()
+
+def test_request_coalescing():
+    """Test that identical concurrent predictions share one HTTP request"""
+    print("\n🧵 Testing Request Coalescing (local stand-in)")
+    print("-" * 40)
+    
+    server, base_url = start_stand_in_server(latency=0.2)
+    try:
+        client = C3POClient(base_url)
+        window = create_sample_market_data("BTCUSDT", 50)
+        results = []
+        
+        threads = [
+            threading.Thread(target=lambda: results.append(client.predict(window, symbol="BTCUSDT")))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(results) == 8 and all(r and r['success'] for r in results)
+        assert server.request_counts.get("/predict") == 1
+        assert client.coalesced_requests == 7
+        print("✅ 8 concurrent calls served by 1 request")
+    finally:
+        server.stop()
+
+def test_async_request_coalescing():
+    """Test that identical concurrent async predictions share one HTTP request"""
+    print("\n🧵 Testing Async Request Coalescing (local stand-in)")
+    print("-" * 40)
+    
+    server, base_url = start_stand_in_server(latency=0.2)
+    
+    async def run():
+        async with AsyncC3POClient(base_url, wire_format="json") as client:
+            window = create_sample_market_data("BTCUSDT", 50)
+            other = create_sample_market_data("ETHUSDT", 50)
+            results = await asyncio.gather(*(client.predict(window, symbol="BTCUSDT") for _ in range(8)),
+                                           client.predict(other, symbol="ETHUSDT"))
+            
+            assert all(r and r['success'] for r in results)
+            assert results[0] == results[7] and results[0] is not results[7]  # waiters get their own copy
+            assert client.coalesced_requests == 7
+            assert server.request_counts.get("/predict") == 2
+            
+            # A cancelled waiter does not cancel the shared request for the others
+            first = asyncio.ensure_future(client.predict(window, symbol="SOLUSDT"))
+            second = asyncio.ensure_future(client.predict(window, symbol="SOLUSDT"))
+            await asyncio.sleep(0.05)
+            first.cancel()
+            assert (await second)['success']
+            assert server.request_counts.get("/predict") == 3
+    
+    try:
+        asyncio.run(run())
+        print("✅ 8 concurrent awaits served by 1 request")
+    finally:
+        server.stop()
+
+def test_circuit_breaker_and_budget():
+    """Test fail-fast behaviour of the circuit breaker and latency budget"""
+    print("\n⚡ Testing Circuit Breaker & Latency Budget (local stand-in)")
+    print("-" * 40)
+    
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=5.0, clock=lambda: now[0])
+    server, base_url = start_stand_in_server(latency=0.3)
+    try:
+        client = C3POClient(base_url, timeout=0.1, coalesce=False, circuit_breaker=breaker)
+        window = create_sample_market_data("BTCUSDT", 50)
+        
+        # Two timeouts open the circuit; the next call fails fast without a request
+        assert client.predict(window) is None
+        assert client.predict(window) is None
+        assert breaker.state == CircuitBreaker.OPEN
+        sent = server.request_counts.get("/predict")
+        assert client.predict(window) is None
+        assert server.request_counts.get("/predict") == sent
+        assert breaker.rejected == 1
+        
+        # After reset_timeout one probe goes through and closes the circuit
+        server.latency = 0.0
+        now[0] = 6.0
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert client.predict(window) is not None
+        assert breaker.state == CircuitBreaker.CLOSED
+        
+        # An exhausted budget skips the request entirely
+        sent = server.request_counts.get("/predict")
+        assert client.predict(window, budget=LatencyBudget(0)) is None
+        assert server.request_counts.get("/predict") == sent
+        print("✅ Breaker opened, failed fast, probed and closed")
+    finally:
+        server.stop()
+
+def test_async_hedged_requests():
+    """Test that a slow primary is hedged, the hedge wins and the primary is cancelled"""
+    print("\n🏁 Testing Async Hedged Requests (local stand-in)")
+    print("-" * 40)
+    
+    class SlowFirstServer(MockC3POServer):
+        """Mock whose first prediction request stalls for a second"""
+        served = 0
+        
+        def sample_latency(self):
+            self.served += 1
+            return 1.0 if self.served == 1 else 0.0
+    
+    server = SlowFirstServer().start()
+    
+    async def run():
+        async with AsyncC3POClient(server.url, timeout=5.0, coalesce=False, wire_format="json",
+                                   hedge=True, hedge_after=0.05) as client:
+            outcomes = []
+            make_request = client._make_request
+            
+            async def tracked(*args, **kwargs):
+                try:
+                    result = await make_request(*args, **kwargs)
+                except asyncio.CancelledError:
+                    outcomes.append("cancelled")
+                    raise
+                outcomes.append("completed")
+                return result
+            
+            client._make_request = tracked
+            started = time.monotonic()
+            prediction = await client.predict(create_sample_market_data("BTCUSDT", 50))
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(0)
+            
+            assert prediction is not None and prediction['success']
+            assert elapsed < 0.5
+            assert client.hedged_requests == 1
+            assert outcomes == ["completed", "cancelled"]
+            assert server.request_counts.get("/predict") == 2
+            return elapsed
+    
+    try:
+        elapsed = asyncio.run(run())
+        print(f"✅ Hedge answered in {elapsed * 1000:.0f} ms, slow primary cancelled")
+    finally:
+        server.stop()
+
+def test_async_negotiation_deadline():
+    """Test that wire-format negotiation shares the call's deadline and is not retried after failing"""
+    print("\n🤝 Testing Async Negotiation Deadline")
+    print("-" * 40)
+    
+    # A listening socket that never answers: every request runs into its deadline
+    silent = socket.socket()
+    silent.bind(("127.0.0.1", 0))
+    silent.listen(16)
+    url = f"http://127.0.0.1:{silent.getsockname()[1]}"
+    
+    async def run():
+        async with AsyncC3POClient(url, timeout=5.0, coalesce=False) as client:
+            endpoints = []
+            make_request = client._make_request
+            
+            async def tracked(method, endpoint, *args, **kwargs):
+                endpoints.append(endpoint)
+                return await make_request(method, endpoint, *args, **kwargs)
+            
+            client._make_request = tracked
+            window = create_sample_market_data("BTCUSDT", 50)
+            for _ in range(2):
+                started = time.monotonic()
+                assert await client.predict(window, timeout=0.3) is None
+                assert time.monotonic() - started < 0.5  # one deadline, not one per request
+            return endpoints
+    
+    try:
+        endpoints = asyncio.run(run())
+        assert endpoints.count("/health") == 1
+        print(f"✅ Requests made: {endpoints}")
+    finally:
+        silent.close()
+
+def test_wire_formats():
+    """Test that compact encodings are negotiated, shrink payloads and give identical predictions"""
+    print("\n🗜️ Testing Wire Formats (local stand-in)")
+    print("-" * 40)
+    
+    # Seeded klines as an exchange sends them (cent prices, whole-second open times),
+    # so the byte counts and ratios below are the same on every run
+    def kline(candle):
+        return dict({field: round(candle[field], 2) for field in ("open", "high", "low", "close", "volume")},
+                    timestamp=int(candle["timestamp"]))
+    
+    batch = [
+        {"market_data": [kline(candle) for candle in generate_candles(symbol, 200, seed=seed, start_time=1_700_000_000.0)],
+         "symbol": symbol}
+        for seed, symbol in enumerate(["BTCUSDT", "ETHUSDT", "SOLUSDT"])
+    ]
+    server, base_url = start_stand_in_server()
+    try:
+        sizes = {}
+        results = {}
+        for wire_format in ["json", "columnar"] + (["msgpack"] if msgpack else []):
+            client = C3POClient(base_url, coalesce=False, wire_format=wire_format)
+            results[wire_format] = [(p['direction'], p['confidence']) for p in client.predict_batch(batch)]
+            sizes[wire_format] = server.last_request_bytes
+        
+        assert all(r == results["json"] for r in results.values())
+        assert sizes["columnar"] < sizes["json"] / 2
+        if msgpack:
+            assert sizes["msgpack"] < sizes["columnar"]
+        
+        # "auto" picks the most compact advertised format
+        client = C3POClient(base_url)
+        client.predict(batch[0]["market_data"])
+        assert client._wire_format == ("msgpack" if msgpack else "columnar")
+        print(f"✅ Batch request bytes: {sizes}")
+    finally:
+        server.stop()
+    
+    # A service that rejects the encoding (415) is switched to JSON
+    server, base_url = start_stand_in_server(wire_formats=["json"])
+    try:
+        client = C3POClient(base_url, wire_format="columnar")
+        assert client.predict(batch[0]["market_data"]) is not None
+        assert client._wire_format == "json"
+        print("✅ Fell back to JSON after 415")
+    finally:
+        server.stop()
+
+def test_session_windows():
+    """Test that session mode uploads only new candles and resyncs after a lost session"""
+    print("\n🪟 Testing Session Windows (local stand-in)")
+    print("-" * 40)
+    
+    def window_at(series, end):
+        return series[end - 50:end]
+    
+    series = create_sample_market_data("BTCUSDT", 120)
+    for i, candle in enumerate(series):
+        candle["timestamp"] = 1_700_000_000 + 60 * i
+    
+    server, base_url = start_stand_in_server()
+    try:
+        plain = C3POClient(base_url, coalesce=False, wire_format="json")
+        client = C3POClient(base_url, coalesce=False, wire_format="json", session_windows=True)
+        
+        # Registration uploads the full window, then each step only the new candle
+        for end in range(50, 60):
+            window = window_at(series, end)
+            prediction = client.predict(window, symbol="BTCUSDT")
+            delta_bytes = server.last_request_bytes
+            assert prediction == plain.predict(window, symbol="BTCUSDT")
+            full_bytes = server.last_request_bytes
+        assert client.sessions.stats['full_uploads'] == 1
+        assert client.sessions.stats['delta_uploads'] == 9
+        assert delta_bytes * 10 < full_bytes
+        
+        # The service lost the session: the client re-registers transparently
+        server.sessions.clear()
+        assert client.predict(window_at(series, 61), symbol="BTCUSDT") is not None
+        assert client.sessions.stats['resyncs'] == 1
+        
+        # Falling more than a window behind re-registers client-side
+        assert client.predict(window_at(series, 120), symbol="BTCUSDT") is not None
+        assert client.sessions.stats['full_uploads'] == 3
+        assert server.request_counts.get("/sessions/predict") == 13
+        print(f"✅ {client.sessions.stats} | full {full_bytes} B vs delta {delta_bytes} B")
+    finally:
+        server.stop()
+
+def test_mock_session_validation():
+    """Test that malformed session items get error payloads, not a server exception"""
+    def post(url, body):
+        request = urllib.request.Request(url + "/sessions/predict", data=json.dumps(body).encode(),
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+    
+    market_data = create_sample_market_data("BTCUSDT", 5)
+    with MockC3POServer() as server:
+        status, reply = post(server.url, {"requests": [
+            {"symbol": "BTCUSDT", "market_data": market_data, "session_id": None},              # no window
+            {"symbol": "BTCUSDT", "market_data": market_data, "session_id": None, "window": 5},
+        ]})
+        assert status == 200
+        assert reply["results"][0] == {"success": False, "message": "registration requires a positive window"}
+        session = reply["results"][1]["session"]
+        assert session == {"id": "s1", "seq": 5}
+        
+        # A delta without base_seq is out of sequence: the client's resync path
+        status, reply = post(server.url, {"requests": [{"market_data": market_data[-1:], "session_id": "s1"}]})
+        assert status == 200 and reply["results"][0]["resync"] is True
+        assert server.sessions["s1"]["seq"] == 5
+        
+        assert post(server.url, {"requests": "BTCUSDT"}) == (400, {"success": False, "message": "malformed request body"})
+
+def test_mock_fault_injection():
+    """Test the mock service's seeded failures, throughput cap and latency distribution"""
+    print("\n🧪 Testing Mock Fault Injection (local stand-in)")
+    print("-" * 40)
+
+    window = create_sample_market_data("BTCUSDT", 50)
+
+    # Seeded failure draws are reproducible; failed requests return None
+    outcomes = []
+    for _ in range(2):
+        with MockC3POServer(error_rate=0.5, seed=3) as server:
+            client = C3POClient(server.url, coalesce=False, wire_format="json",
+                                circuit_breaker=CircuitBreaker(failure_threshold=100))
+            outcomes.append([client.predict(window) is not None for _ in range(20)])
+            assert server.injected_errors == outcomes[-1].count(False)
+    assert outcomes[0] == outcomes[1]
+    assert 0 < outcomes[0].count(False) < 20
+
+    # Requests beyond max_rps are rejected with 429
+    with MockC3POServer(max_rps=5) as server:
+        client = C3POClient(server.url, coalesce=False, wire_format="json",
+                            circuit_breaker=CircuitBreaker(failure_threshold=100))
+        served = sum(client.predict(window) is not None for _ in range(10))
+        assert 5 <= served < 10
+        assert server.throttled == 10 - served
+
+    # Latency draws follow the configured distribution and seed
+    server = MockC3POServer(latency=0.01, latency_distribution="lognormal", latency_jitter=0.5, seed=1)
+    draws = [server.sample_latency() for _ in range(1000)]
+    server.server_close()
+    assert 0.008 < sorted(draws)[500] < 0.012
+    print(f"✅ Failures {outcomes[0].count(False)}/20 (reproducible) | throttled {served}/10 served")
+
+def test_mock_round_trip_latency():
+    """Test that keep-alive round trips to a zero-latency mock are not held by delayed ACKs"""
+    window = create_sample_market_data("BTCUSDT", 50)
+    with MockC3POServer() as server:
+        client = C3POClient(server.url, coalesce=False, wire_format="json")
+        timings = []
+        for _ in range(21):
+            started = time.perf_counter()
+            assert client.predict(window) is not None
+            timings.append(time.perf_counter() - started)
+        assert server.connections == 1
+    
+    # With Nagle on, the mock's separate header and body writes cost ~40 ms per request
+    median = sorted(timings[1:])[10]
+    assert median < 0.02, f"median round trip {median * 1000:.1f} ms"
+    print(f"✅ Median keep-alive round trip {median * 1000:.2f} ms")
+
 def test_real_time_predictions():
     """Test real-time prediction capability"""
     print("\n🔄 Testing Real-Time Predictions")
@@ -151,7 +682,7 @@ def main():
     else:
         print("\n❌ INTEGRATION TEST FAILED!")
         print("💡 Troubleshooting:")
-        print("   1. Ensure C3PO service is running: http://localhost:8002")
+        print("   1. Ensure C3PO service is running: http://localhost:8002 (or python mock_c3po_server.py)")
         print("   2. Check network connectivity")
         print("   3. Verify service has models loaded")
 
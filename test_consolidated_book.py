@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+🌐 Consolidated Top of Book Test
+================================
+
+Feeds several venues' depth updates through OrderBookManager into the
+cross-exchange aggregator and checks the consolidated quote, aggregated
+depth, gap handling and the bot's use of the quote as its price.
+"""
+
+from consolidated_book import TopOfBookAggregator
+from order_book import BINANCE, BYBIT, OrderBookManager
+
+def binance_snapshot(update_id, bids, asks):
+    return {'lastUpdateId': update_id, 'bids': bids, 'asks': asks}
+
+def binance_update(first, final, bids=(), asks=()):
+    return {'e': 'depthUpdate', 'E': 1_700_000_000_000 + final, 's': 'BTCUSDT',
+            'U': first, 'u': final, 'b': list(bids), 'a': list(asks)}
+
+def bybit_message(kind, update_id, bids=(), asks=()):
+    return {'topic': 'orderbook.50.BTCUSDT', 'type': kind, 'ts': 1_700_000_000_000 + update_id,
+            'data': {'s': 'BTCUSDT', 'b': list(bids), 'a': list(asks), 'u': update_id}}
+
+def make_feed():
+    quotes = []
+    aggregator = TopOfBookAggregator(on_change=quotes.append)
+    manager = OrderBookManager()
+    aggregator.attach(manager)
+    manager.handle_message(BINANCE, binance_snapshot(100, [["100.0", "1"], ["99.5", "2"]],
+                                                     [["100.5", "1"], ["101.0", "2"]]), symbol="BTCUSDT")
+    manager.handle_message(BYBIT, bybit_message('snapshot', 10, [["100.2", "3"], ["99.5", "1"]],
+                                                [["100.8", "1"], ["101.0", "1"]]))
+    return aggregator, manager, quotes
+
+def test_consolidated_quote():
+    """Test best bid/ask across venues, change events and dropping a venue on a gap"""
+    print("\n🌐 Testing Consolidated Quote")
+    print("-" * 40)
+
+    aggregator, manager, quotes = make_feed()
+    quote = aggregator.quote("BTCUSDT")
+    assert (quote.bid, quote.bid_venue, quote.ask, quote.ask_venue) == (100.2, BYBIT, 100.5, BINANCE)
+    assert abs(quote.spread - 0.3) < 1e-9 and len(quotes) == 2
+
+    # A change away from either venue's touch publishes nothing
+    manager.handle_message(BINANCE, binance_update(101, 101, bids=[["98.0", "5"]]))
+    assert len(quotes) == 2
+
+    # Binance bids through Bybit, then crosses Bybit's ask
+    manager.handle_message(BINANCE, binance_update(102, 102, bids=[["100.3", "2"]]))
+    assert (quotes[-1].bid, quotes[-1].bid_venue) == (100.3, BINANCE)
+    manager.handle_message(BINANCE, binance_update(103, 103, bids=[["100.9", "1"]], asks=[["101.2", "1"], ["100.5", "0"], ["101.0", "0"]]))
+    assert quotes[-1].crossed and (quotes[-1].ask, quotes[-1].ask_venue) == (100.8, BYBIT)
+
+    # Bybit sequence gap: it leaves the quote until its next snapshot
+    manager.handle_message(BYBIT, bybit_message('delta', 12, asks=[["100.7", "1"]]))
+    assert (quotes[-1].ask, quotes[-1].ask_venue) == (101.2, BINANCE)
+    manager.handle_message(BYBIT, bybit_message('snapshot', 20, [["100.1", "1"]], [["100.95", "2"]]))
+    assert (quotes[-1].ask, quotes[-1].ask_venue, quotes[-1].bid_venue) == (100.95, BYBIT, BINANCE)
+    print(f"✅ {aggregator.stats}")
+
+def test_aggregated_depth():
+    """Test that depth sums sizes at equal prices across venues, best first"""
+    aggregator, _, _ = make_feed()
+    depth = aggregator.depth("BTCUSDT", 3)
+    assert depth['bids'] == [(100.2, 3.0), (100.0, 1.0), (99.5, 3.0)]
+    assert depth['asks'] == [(100.5, 1.0), (100.8, 1.0), (101.0, 3.0)]
+    assert aggregator.depth("ETHUSDT") == {'bids': [], 'asks': []}
+
+def test_bot_price_source():
+    """Test that the bot prices symbols off the consolidated mid, keeping an existing subscriber"""
+    from ai_paper_trading_bot import AIPaperTradingBot
+
+    published = []
+    aggregator = TopOfBookAggregator(on_change=published.append)
+    bot = AIPaperTradingBot(trading_symbols=['BTCUSDT'], quote_source=aggregator)
+    bot.market_data['BTCUSDT'].append_candle({'open': 90.0, 'high': 91.0, 'low': 89.0, 'close': 90.0,
+                                              'volume': 1.0, 'timestamp': 0.0})
+    assert bot.current_price('BTCUSDT') == 90.0
+
+    manager = OrderBookManager()
+    aggregator.attach(manager)
+    manager.handle_message(BINANCE, binance_snapshot(100, [["100.0", "1"]], [["100.5", "1"]]), symbol="BTCUSDT")
+    assert bot.current_price('BTCUSDT') == 100.25
+    assert [(quote.symbol, quote.mid) for quote in published] == [('BTCUSDT', 100.25)]
+
+if __name__ == "__main__":
+    test_consolidated_quote()
+    test_aggregated_depth()
+    test_bot_price_source()
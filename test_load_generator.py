@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+🔥 Load Generator Test
+======================
+
+Checks the shared latency summary against NumPy and that closed-loop and
+fixed-rate runs against a local mock report throughput for the measured
+window only.
+"""
+
+import numpy as np
+
+from latency_stats import latency_summary
+from load_generator import run_load
+from mock_c3po_server import MockC3POServer
+
+def test_latency_summary_matches_numpy():
+    """Test percentiles and mean against numpy.percentile on a skewed sample"""
+    print("\n📏 Testing Latency Summary")
+    print("-" * 40)
+
+    samples = np.random.default_rng(5).lognormal(-6.0, 0.8, 2500)
+    summary = latency_summary(list(samples))
+    expected = np.percentile(samples * 1000.0, [50, 95, 99, 99.9])
+    assert summary['count'] == 2500
+    assert np.allclose([summary[key] for key in ('p50_ms', 'p95_ms', 'p99_ms', 'p999_ms')], expected, rtol=1e-12)
+    assert np.isclose(summary['mean_ms'], samples.mean() * 1000.0) and summary['max_ms'] == samples.max() * 1000.0
+    assert latency_summary([]) == {'count': 0}
+    assert latency_summary([0.002])['p999_ms'] == 2.0
+    print(f"✅ p50 {summary['p50_ms']:.3f} ms, p999 {summary['p999_ms']:.3f} ms")
+
+def test_rate_mode_throughput():
+    """Test that a fixed-rate run reports the target rate, not the warmup requests too"""
+    print("\n🔥 Testing Load Generator Throughput")
+    print("-" * 40)
+
+    with MockC3POServer(latency=0.002, seed=1) as server:
+        paced = run_load(server.url, concurrency=4, duration=1.0, rate=100.0, warmup=0.5, window=20)
+        closed = run_load(server.url, concurrency=2, duration=0.5, warmup=0.2, window=20)
+
+    # 100/s over 1 s of measurement; the 50 warmup slots are excluded
+    assert paced['errors'] == 0 and paced['unsent'] <= 2
+    assert 95 <= paced['requests'] <= 101
+    assert 90 <= paced['throughput'] <= 101
+    assert closed['errors'] == 0 and closed['throughput'] <= closed['requests'] / 0.5
+    print(f"✅ Paced {paced['throughput']:.0f} req/s (target 100) | closed loop {closed['throughput']:.0f} req/s")
+
+if __name__ == "__main__":
+    test_latency_summary_matches_numpy()
+    test_rate_mode_throughput()
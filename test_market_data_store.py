@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+📊 Market Data Store Test
+=========================
+
+Checks the columnar ring buffer across wrap-around: mirrored columns,
+zero-copy window views and the C3PO payload format.
+"""
+
+from market_data_store import FIELDS, CandleRingBuffer, MarketDataStore
+
+def candle(i):
+    return {"open": i + 0.1, "high": i + 0.5, "low": i - 0.5, "close": float(i), "volume": 10.0 + i, "timestamp": 1000.0 + i}
+
+def test_ring_buffer_wraparound():
+    """Test that the mirrored columns keep the newest candles contiguous after wrapping"""
+    print("\n🔁 Testing Ring Buffer Wrap-Around")
+    print("-" * 40)
+
+    capacity = 8
+    buffer = CandleRingBuffer(capacity)
+    for appended in range(1, 3 * capacity + 4):
+        buffer.append_candle(candle(appended - 1))
+        expected = [float(i) for i in range(max(0, appended - capacity), appended)]
+
+        assert len(buffer) == min(appended, capacity) and buffer.appended == appended
+        assert buffer.last_close == expected[-1]
+        assert list(buffer.column("close")) == expected
+        for n in (1, 3, capacity, capacity + 5):
+            assert list(buffer.column("close", n)) == expected[-n:]
+
+        # Both copies of every slot hold the same value
+        for field in FIELDS:
+            column = buffer._columns[field]
+            assert column[:capacity] == column[capacity:]
+
+    window = buffer.window(5)
+    assert len(window) == 5
+    assert list(window.timestamp) == [1000.0 + i for i in range(3 * capacity - 2, 3 * capacity + 3)]
+    assert buffer.to_payload(2) == [candle(3 * capacity + 1), candle(3 * capacity + 2)]
+    print(f"✅ {buffer.appended} appends into capacity {capacity}: {list(buffer.column('close', 4))}")
+
+def test_window_views_are_zero_copy():
+    """Test that windows are views of the buffer's storage, not copies"""
+    buffer = CandleRingBuffer(4)
+    for i in range(6):
+        buffer.append_candle(candle(i))
+
+    closes = buffer.column("close", 3)
+    window = buffer.window(3)
+    assert closes.obj is buffer._columns["close"] and window.close.obj is buffer._columns["close"]
+    assert closes.readonly is False and closes.nbytes == 3 * 8
+
+    # Views taken before the next append see the slot it overwrites in place
+    oldest = buffer.column("close", 4)
+    before = list(oldest)
+    buffer.append_candle(candle(6))
+    assert list(oldest) != before
+    assert list(buffer.column("close", 4)) == [3.0, 4.0, 5.0, 6.0]
+
+def test_store_symbols():
+    """Test per-symbol buffers and preallocated memory"""
+    store = MarketDataStore(["BTCUSDT"], capacity=16)
+    assert "ETHUSDT" not in store
+    store.add_symbol("ETHUSDT").append_candle(candle(1))
+    assert list(store) == ["BTCUSDT", "ETHUSDT"] and len(store["BTCUSDT"]) == 0
+    assert store.nbytes == 2 * len(FIELDS) * 2 * 16 * 8
+
+if __name__ == "__main__":
+    test_ring_buffer_wraparound()
+    test_window_views_are_zero_copy()
+    test_store_symbols()
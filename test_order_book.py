@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+📚 Order Book Engine Test
+=========================
+
+Replays recorded Binance and Bybit depth messages through the L2 order book
+engine and checks sequencing, gap recovery and ingestion speed.
+"""
+
+import os
+import time
+
+from order_book import (APPLIED, BINANCE, BUFFERED, BYBIT, GAP, SNAPSHOT, STALE, BookSide,
+                        OrderBookManager, read_replay, replay, synthetic_binance_stream)
+
+REPLAY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_order_book_replay.jsonl")
+
+def test_replay_sequencing():
+    """Test buffering before the snapshot, stale drops, gap detection and resync from the replay file"""
+    print("\n🔁 Testing Depth Replay & Resync")
+    print("-" * 40)
+
+    gaps = []
+    manager = OrderBookManager(on_gap=lambda book: gaps.append((book.exchange, book.symbol)))
+    statuses = [
+        manager.handle_message(record["exchange"], record["message"], record.get("symbol"))
+        for record in read_replay(REPLAY_FILE)
+    ]
+
+    assert statuses == [BUFFERED, BUFFERED, SNAPSHOT, APPLIED, GAP, BUFFERED, SNAPSHOT,
+                        SNAPSHOT, APPLIED, GAP, SNAPSHOT, APPLIED, None]
+    assert gaps == [(BINANCE, "BTCUSDT"), (BYBIT, "ETHUSDT")]
+
+    # Binance: the second snapshot (111) is bridged by the buffered 110-112 and 113-114 updates
+    btc = manager.book(BINANCE, "BTCUSDT")
+    assert btc.synced and btc.last_update_id == 114
+    assert btc.depth(5) == {"bids": [(100.0, 1.5), (99.5, 2.0)],
+                            "asks": [(100.6, 0.3), (100.8, 4.0), (101.0, 2.0)]}
+    assert btc.stale == 1 and btc.gaps == 1
+
+    # Bybit: the update that caused the gap is already covered by the new snapshot
+    eth = manager.book(BYBIT, "ETHUSDT")
+    assert eth.synced and eth.last_update_id == 511
+    assert eth.best_bid == (2999.9, 1.0) and eth.best_ask == (3000.5, 4.0)
+    assert manager.errors == 1
+
+    # Replaying the file again gives the same outcome
+    assert replay(REPLAY_FILE, OrderBookManager()) == {"buffered": 3, "snapshot": 4, "applied": 3, "gap": 2, "None": 1}
+    print(f"✅ {manager.stats['books']}")
+
+def test_book_side_ordering():
+    """Test that levels stay sorted best-first through inserts, updates and removals"""
+    bids, asks = BookSide(is_bid=True), BookSide(is_bid=False)
+    for price in (100.0, 98.0, 99.0, 101.0):
+        bids.update(price, 1.0)
+        asks.update(price + 5, 1.0)
+    bids.update(101.0, 0)
+    bids.update(99.0, 3.0)
+    asks.update(106.0, 0)
+
+    assert bids.top(10) == [(100.0, 1.0), (99.0, 3.0), (98.0, 1.0)]
+    assert asks.top(2) == [(103.0, 1.0), (104.0, 1.0)]
+    assert bids.best() == (100.0, 1.0) and asks.best() == (103.0, 1.0)
+
+def test_ingestion_rate():
+    """Test that one book keeps up with thousands of depth updates per second"""
+    print("\n⚡ Testing Depth Ingestion Rate")
+    print("-" * 40)
+
+    stream = synthetic_binance_stream("BTCUSDT", updates=20000, seed=1)
+    manager = OrderBookManager()
+    manager.handle_message(BINANCE, stream[0], symbol="BTCUSDT")
+
+    started = time.perf_counter()
+    for message in stream[1:]:
+        manager.handle_message(BINANCE, message)
+    rate = (len(stream) - 1) / (time.perf_counter() - started)
+
+    book = manager.book(BINANCE, "BTCUSDT")
+    assert book.applied == len(stream) - 1 and book.gaps == 0
+    assert book.best_bid[0] < book.best_ask[0]
+
+    # A redelivered update is dropped without touching the book
+    top = book.depth(5)
+    assert manager.handle_message(BINANCE, stream[-2]) == STALE
+    assert book.stale == 1 and book.depth(5) == top
+    assert rate > 5000
+    print(f"✅ {rate:,.0f} updates/s")
+
+if __name__ == "__main__":
+    test_replay_sequencing()
+    test_book_side_ordering()
+    test_ingestion_rate()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+🚀 Parallel Backtest Test
+=========================
+
+Checks that sharding backtests across worker processes gives the same
+results as running them serially, and that the shared-memory candle blocks
+are gone afterwards.
+"""
+
+import asyncio
+import os
+
+from backtest import run_backtest
+from parallel_backtest import run_parallel_backtests
+from synthetic_market_data import generate_candles
+
+def shared_memory_blocks():
+    return set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+
+def test_parallel_matches_serial():
+    """Test two symbols × two configs against serial run_backtest, with spawned workers"""
+    print("\n🚀 Testing Parallel vs Serial Backtests")
+    print("-" * 40)
+
+    candles = {symbol: generate_candles(symbol, 400, seed=seed, start_time=1_700_000_000.0)
+               for seed, symbol in enumerate(["BTCUSDT", "ETHUSDT"])}
+    configs = [{'ai_confidence_threshold': 0.6}, {'ai_confidence_threshold': 0.7, 'strategy_config': {'stop_loss_percent': 0.02}}]
+
+    before = shared_memory_blocks()
+    report = run_parallel_backtests(candles, configs, max_workers=2, start_method="spawn")
+    assert shared_memory_blocks() <= before
+
+    jobs = {job['job_id']: job for job in report['jobs']}
+    assert len(jobs) == 4
+    job_id = 0
+    for symbol in candles:
+        for config in configs:
+            serial = asyncio.run(run_backtest({symbol: candles[symbol]}, **config))
+            job = jobs[job_id]
+            assert (job['symbol'], job['config']) == (symbol, config)
+            assert job['final_value'] == serial['final_value']
+            assert job['performance_metrics']['total_trades'] == len(serial['trades'])
+            job_id += 1
+
+    assert report['totals']['total_trades'] == len(report['trades'])
+    print(f"✅ {report['totals']['jobs']} jobs on {report['totals']['workers']} workers match serial runs")
+
+if __name__ == "__main__":
+    test_parallel_matches_serial()
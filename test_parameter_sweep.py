@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+🧮 Parameter Sweep Test
+=======================
+
+Checks that a single-point grid reproduces run_backtest on the same seeded
+candles, for AI-only and blended signals, including short positions.
+"""
+
+import asyncio
+
+import numpy as np
+
+from backtest import momentum_prediction, run_backtest
+from parameter_sweep import make_grid, prediction_series, run_sweep, technical_series
+from synthetic_market_data import generate_candles
+
+WARMUP = 50
+
+def sweep_like_backtest(candles, ai_weight, **grid_kwargs):
+    """run_sweep over the candles the bot evaluates (those after the warmup)"""
+    direction, confidence = prediction_series(candles, momentum_prediction, window=WARMUP)
+    technical = technical_series(candles)[WARMUP:] if ai_weight < 1.0 else None
+    grid = make_grid(ai_weight=[ai_weight], **grid_kwargs)
+    closes = [candle['close'] for candle in candles[WARMUP:]]
+    return run_sweep(closes, direction[WARMUP:], confidence[WARMUP:], grid, technical_score=technical)[0]
+
+def test_single_point_matches_backtest():
+    """Test that the vectorized sweep and the bot agree on final value, trades and metrics"""
+    print("\n🧮 Testing Sweep vs Backtest")
+    print("-" * 40)
+
+    candles = generate_candles("BTCUSDT", 1500, seed=21, start_time=1_700_000_000.0)
+    for ai_weight, threshold in ((1.0, 0.7), (0.7, 0.6)):
+        report = asyncio.run(run_backtest({"BTCUSDT": candles}, warmup=WARMUP, max_positions=1,
+                                          ai_confidence_threshold=threshold, quiet=True,
+                                          strategy_config={'ai_weight': ai_weight}))
+        row = sweep_like_backtest(candles, ai_weight, confidence_threshold=[threshold])
+
+        trades = report['trades']
+        wins = sum(trade['pnl'] > 0 for trade in trades)
+        assert any(trade['side'] == 'short' for trade in trades)
+        assert row['trades'] == len(trades)
+        assert np.isclose(row['final_value'], report['final_value'], rtol=1e-9)
+        assert np.isclose(row['win_rate'], wins / len(trades) * 100)
+        metrics = report['performance_metrics']
+        assert np.isclose(row['profit_factor'], metrics['profit_factor'], rtol=1e-9)
+        assert np.isclose(row['sharpe_ratio'], metrics['sharpe_ratio'], rtol=1e-9)
+        assert np.isclose(row['max_drawdown_percent'], metrics['max_drawdown'], rtol=1e-9)
+        print(f"✅ ai_weight {ai_weight}: {len(trades)} trades, final value ${report['final_value']:.2f} in both")
+
+def test_short_positions():
+    """Test that a short is held while the price falls and stopped out when it rises"""
+    closes = np.array([100.0, 100.0, 90.0, 90.0, 120.0])
+    direction = np.array([0, -1, 0, -1, 0])
+    confidence = np.array([0.0, 0.9, 0.0, 0.9, 0.0])
+    row = run_sweep(closes, direction, confidence, make_grid(take_profit_percent=[0.5]))[0]
+
+    # Short at 100, still open at 90 (no second entry), stopped out at 120
+    size = 10000.0 * 0.15 * 0.95
+    pnl = (100.0 - 120.0) * size / 100.0
+    assert row['trades'] == 1 and row['win_rate'] == 0.0
+    assert np.isclose(row['final_value'], 10000.0 + pnl)
+
+if __name__ == "__main__":
+    test_single_point_matches_backtest()
+    test_short_positions()
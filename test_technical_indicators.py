@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+📐 Incremental Indicator Test
+=============================
+
+Checks the streaming EMA, RSI, ATR, Bollinger Bands and VWAP against batch
+NumPy computations over the same seeded candle series.
+"""
+
+import numpy as np
+
+from market_data_store import CandleRingBuffer
+from synthetic_market_data import generate_candles
+from technical_indicators import IncrementalIndicators, IndicatorEngine
+
+def batch_ema(values, period):
+    """EMA seeded with the first value, as a weighted sum over the whole series"""
+    alpha = 2.0 / (period + 1)
+    n = len(values)
+    weights = alpha * (1 - alpha) ** np.arange(n - 2, -1, -1)
+    return (1 - alpha) ** (n - 1) * values[0] + np.dot(weights, values[1:])
+
+def batch_wilder(values, period):
+    """Simple mean of the first ``period`` values, then Wilder smoothing"""
+    average = values[:period].mean()
+    for value in values[period:]:
+        average = (average * (period - 1) + value) / period
+    return average
+
+def test_indicators_match_batch():
+    """Test every indicator against a batch computation at several points of a long series"""
+    print("\n📐 Testing Incremental vs Batch Indicators")
+    print("-" * 40)
+
+    candles = generate_candles("BTCUSDT", 2000, seed=11, start_time=1_700_000_000.0)
+    high, low, close, volume = (np.array([c[field] for c in candles]) for field in ("high", "low", "close", "volume"))
+    indicators = IncrementalIndicators()
+
+    for i in range(len(candles)):
+        indicators.update(high[i], low[i], close[i], volume[i])
+        if i + 1 not in (30, 51, 400, 2000):
+            continue
+        closes = close[:i + 1]
+
+        assert np.isclose(indicators.ema_fast, batch_ema(closes, 12), rtol=1e-12)
+        assert np.isclose(indicators.ema_slow, batch_ema(closes, 26), rtol=1e-12)
+
+        change = np.diff(closes)
+        gain, loss = batch_wilder(np.maximum(change, 0), 14), batch_wilder(np.maximum(-change, 0), 14)
+        assert np.isclose(indicators.rsi, 100 - 100 / (1 + gain / loss), rtol=1e-9)
+
+        true_range = np.maximum.reduce([high[1:i + 1] - low[1:i + 1],
+                                        np.abs(high[1:i + 1] - closes[:-1]),
+                                        np.abs(low[1:i + 1] - closes[:-1])])
+        assert np.isclose(indicators.atr, batch_wilder(true_range, 14), rtol=1e-9)
+
+        window = closes[-20:]
+        lower, middle, upper = indicators.bollinger
+        assert np.isclose(middle, window.mean(), rtol=1e-12)
+        assert np.isclose(upper - middle, 2 * window.std(), rtol=1e-6)
+        assert np.isclose(middle - lower, 2 * window.std(), rtol=1e-6)
+
+        vwap_window = slice(max(0, i + 1 - 50), i + 1)
+        typical = (high[vwap_window] + low[vwap_window] + close[vwap_window]) / 3
+        assert np.isclose(indicators.vwap, np.dot(typical, volume[vwap_window]) / volume[vwap_window].sum(), rtol=1e-12)
+
+        score = indicators.score()
+        assert score is not None and -1.0 <= score <= 1.0
+    print(f"✅ {indicators.snapshot()}")
+
+def test_engine_consumes_only_new_candles():
+    """Test that syncing from a ring buffer gives the same state as feeding candles directly"""
+    candles = generate_candles("ETHUSDT", 300, seed=5, start_time=1_700_000_000.0)
+    buffer = CandleRingBuffer(64)
+    engine = IndicatorEngine()
+    direct = IncrementalIndicators()
+
+    assert engine.score("ETHUSDT") is None
+    for i, candle in enumerate(candles):
+        buffer.append_candle(candle)
+        direct.update(candle["high"], candle["low"], candle["close"], candle["volume"])
+        if i % 7 == 0 or i == len(candles) - 1:
+            engine.sync("ETHUSDT", buffer)
+    assert engine["ETHUSDT"].count == len(candles)
+    assert engine.score("ETHUSDT") == direct.score()
+
+if __name__ == "__main__":
+    test_indicators_match_batch()
+    test_engine_consumes_only_new_candles()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+📝 Trading Logging Test
+=======================
+
+Checks deferred formatting on the queue handler, the JSON-lines formatter,
+configure_logging's queued/JSON output, the bot's quiet status records and
+the client's lazily formatted skip warnings.
+"""
+
+import json
+import logging
+import os
+import queue
+import tempfile
+from datetime import datetime
+
+from ai_paper_trading_bot import AIPaperTradingBot, Position
+from backtest import LocalPredictor, momentum_prediction
+from c3po_client import C3POClient, CircuitBreaker, create_sample_market_data
+from mock_c3po_server import MockC3POServer
+from trading_logging import DeferredQueueHandler, JSONLinesFormatter, configure_logging
+
+class Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+def make_record(msg, *args, exc_info=None, **extra):
+    record = logging.LogRecord("bot", logging.INFO, __file__, 1, msg, args, exc_info)
+    record.__dict__.update(extra)
+    return record
+
+def test_deferred_queue_handler():
+    """Test that records are queued with msg/args intact and tracebacks rendered"""
+    print("\n📝 Testing Deferred Queue Handler")
+    print("-" * 40)
+
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger("test_trading_logging.deferred")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = DeferredQueueHandler(log_queue)
+    logger.addHandler(handler)
+    try:
+        logger.info("opened %s at $%.2f", "BTCUSDT", 101.5, extra={'event': 'position_opened'})
+        try:
+            raise ValueError("bad tick")
+        except ValueError:
+            logger.exception("feed failed for %s", "ETHUSDT")
+    finally:
+        logger.removeHandler(handler)
+
+    record = log_queue.get_nowait()
+    assert (record.msg, record.args, record.event) == ("opened %s at $%.2f", ("BTCUSDT", 101.5), 'position_opened')
+    assert record.getMessage() == "opened BTCUSDT at $101.50"
+
+    failed = log_queue.get_nowait()
+    assert failed.exc_info is None and "ValueError: bad tick" in failed.exc_text
+    assert failed.args == ("ETHUSDT",)
+    print("✅ Formatting left to the listener thread")
+
+def test_json_lines_formatter():
+    """Test one JSON object per record with extras and exception text"""
+    entry = json.loads(JSONLinesFormatter().format(make_record("\nclosed %s", "BTCUSDT", event='position_closed', pnl=12.5)))
+    assert entry['message'] == "closed BTCUSDT" and entry['level'] == "INFO" and entry['logger'] == "bot"
+    assert (entry['event'], entry['pnl']) == ('position_closed', 12.5)
+    assert not {'msg', 'args', 'levelno', 'exc_info'} & set(entry)
+
+    record = make_record("failed", when=datetime(2026, 1, 5))
+    record.exc_text = "Traceback: boom"
+    line = JSONLinesFormatter().format(record)
+    assert "\n" not in line
+    assert json.loads(line)['exc_info'] == "Traceback: boom" and json.loads(line)['when'] == "2026-01-05 00:00:00"
+
+def test_configure_logging_json_file():
+    """Test queued JSON-lines file output and the synchronous mode"""
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    logger = logging.getLogger("test_trading_logging.configure")
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            log_file = os.path.join(directory, "bot.log")
+            listener = configure_logging(log_file, queued=True, json_lines=True)
+            assert [type(handler) for handler in root.handlers] == [DeferredQueueHandler]
+            logger.info("iteration %d", 7, extra={'event': 'iteration'})
+            logger.debug("filtered out")
+            listener.stop()
+
+            with open(log_file) as f:
+                entries = [json.loads(line) for line in f]
+            assert [(entry['message'], entry['event']) for entry in entries] == [("iteration 7", 'iteration')]
+
+            assert configure_logging(None, level=logging.WARNING, queued=False) is None
+            assert [type(handler) for handler in root.handlers] == [logging.StreamHandler] and root.level == logging.WARNING
+    finally:
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            handler.close()
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+
+def test_quiet_status_record():
+    """Test that the status is one record, with per-position lines only when not quiet"""
+    bot_logger = logging.getLogger(AIPaperTradingBot.__module__)
+    previous_level = bot_logger.level
+    bot_logger.setLevel(logging.INFO)
+    capture = Capture()
+    bot_logger.addHandler(capture)
+    try:
+        messages = {}
+        for quiet in (False, True):
+            bot = AIPaperTradingBot(trading_symbols=["BTCUSDT"], predictor=LocalPredictor(momentum_prediction), quiet=quiet)
+            bot.portfolio.add_position(Position("BTCUSDT", 1.0, 100.0, 100.0, datetime.now(), 'short'), 100.0)
+            capture.records.clear()
+            bot._log_portfolio_status()
+            assert len(capture.records) == 1
+            messages[quiet] = capture.records[0].getMessage()
+    finally:
+        bot_logger.removeHandler(capture)
+        bot_logger.setLevel(previous_level)
+
+    assert "BTCUSDT: 1.000000 @ $100.00" in messages[False]
+    assert "BTCUSDT" not in messages[True] and "Open Positions: 1" in messages[True]
+
+def test_client_skip_warnings_are_lazy():
+    """Test that the client's per-request circuit-open warning keeps msg/args unformatted"""
+    client_logger = logging.getLogger(C3POClient.__module__)
+    capture = Capture()
+    client_logger.addHandler(capture)
+    try:
+        with MockC3POServer() as server:
+            breaker = CircuitBreaker(failure_threshold=1)
+            client = C3POClient(server.url, coalesce=False, wire_format="json", circuit_breaker=breaker)
+            breaker.record_failure()
+            capture.records.clear()
+            assert client.predict(create_sample_market_data("BTCUSDT", 20)) is None
+    finally:
+        client_logger.removeHandler(capture)
+
+    skipped = [record for record in capture.records if record.levelno == logging.WARNING]
+    assert [record.msg for record in skipped] == ["⚡ C3PO circuit open, skipping %s %s"]
+    assert skipped[0].args == ("POST", server.url + "/predict")
+
+if __name__ == "__main__":
+    test_deferred_queue_handler()
+    test_json_lines_formatter()
+    test_configure_logging_json_file()
+    test_quiet_status_record()
+    test_client_skip_warnings_are_lazy()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+📈 Streaming Metrics Test
+=========================
+
+Checks MetricsAccumulator's running statistics against NumPy computations
+over the whole series: Welford mean/variance, Sharpe ratio, max drawdown and
+the trade aggregates.
+"""
+
+import numpy as np
+
+from trading_metrics import MetricsAccumulator
+
+def equity_series(n=5000, seed=17):
+    """Fixed random-walk equity curve with drawdowns"""
+    rng = np.random.default_rng(seed)
+    return 10000.0 * np.cumprod(1.0 + rng.normal(0.0002, 0.004, n))
+
+def test_equity_statistics_match_numpy():
+    """Test mean/variance, Sharpe and max drawdown against batch NumPy"""
+    print("\n📈 Testing Streaming Equity Statistics")
+    print("-" * 40)
+
+    equity = equity_series()
+    metrics = MetricsAccumulator(10000.0)
+    for value in equity:
+        metrics.mark_equity(value)
+
+    marks = np.concatenate(([10000.0], equity))
+    returns = marks[1:] / marks[:-1] - 1.0
+    assert metrics.marks == len(returns)
+    assert np.isclose(metrics._mean_return, returns.mean(), rtol=1e-9)
+    assert np.isclose(metrics.return_std, returns.std(ddof=1), rtol=1e-9)
+    assert np.isclose(metrics.sharpe_ratio, returns.mean() / returns.std(ddof=1), rtol=1e-9)
+
+    peaks = np.maximum.accumulate(marks)[1:]
+    max_drawdown = ((peaks - equity) / peaks).max()
+    assert max_drawdown > 0.05
+    assert np.isclose(metrics.max_drawdown, max_drawdown, rtol=1e-12)
+    assert np.isclose(metrics.snapshot()['max_drawdown'], max_drawdown * 100, rtol=1e-12)
+    print(f"✅ Sharpe {metrics.sharpe_ratio:.4f}, max drawdown {max_drawdown:.2%} over {metrics.marks} marks")
+
+def test_trade_aggregates():
+    """Test win/loss counts, averages and profit factor against the trade list"""
+    pnls = np.random.default_rng(3).normal(5.0, 40.0, 500)
+    pnls[10] = 0.0  # break-even counts as a loss, like the bot
+    metrics = MetricsAccumulator(10000.0)
+    for pnl in pnls:
+        metrics.record_trade(pnl)
+
+    wins, losses = pnls[pnls > 0], pnls[pnls <= 0]
+    snapshot = metrics.snapshot()
+    assert (snapshot['total_trades'], snapshot['winning_trades'], snapshot['losing_trades']) == (500, len(wins), len(losses))
+    assert np.isclose(snapshot['win_rate'], len(wins) / 5)
+    assert np.isclose(snapshot['avg_win'], wins.mean()) and np.isclose(snapshot['avg_loss'], losses.mean())
+    assert np.isclose(snapshot['profit_factor'], abs(wins.mean() / losses.mean()))
+
+def test_empty_accumulator():
+    """Test that a fresh accumulator reports zeros rather than dividing by zero"""
+    metrics = MetricsAccumulator(10000.0)
+    metrics.mark_equity(10000.0)
+    assert metrics.snapshot() == {'total_trades': 0, 'winning_trades': 0, 'losing_trades': 0, 'win_rate': 0.0,
+                                  'avg_win': 0.0, 'avg_loss': 0.0, 'profit_factor': 0.0,
+                                  'max_drawdown': 0.0, 'sharpe_ratio': 0.0}
+
+if __name__ == "__main__":
+    test_equity_statistics_match_numpy()
+    test_trade_aggregates()
+    test_empty_accumulator()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+🗄️ Trading Persistence Test
+===========================
+
+Checks the batched SQLite writer against a temporary database: trade and
+portfolio-state rows, WAL mode, the session being closed, dropped batches,
+resuming a session_id, and that the bot closes persistence even when the session never starts.
+"""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+
+from ai_paper_trading_bot import AIPaperTradingBot
+from backtest import LocalPredictor, momentum_prediction
+from trading_persistence import TradingPersistence
+
+START = 1_767_600_000.0  # 2026-01-05 08:00:00 UTC
+
+def query(db_path, sql, *params):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+def test_rows_wal_and_session_close():
+    """Test that queued rows land in the tables and close() ends the session"""
+    print("\n🗄️ Testing Trading Persistence")
+    print("-" * 40)
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "paper-trading.db")
+        persistence = TradingPersistence(db_path, session_id="test-session", session_name="test", batch_size=2)
+
+        persistence.record_trade("BTCUSDT", "buy", 100.0, 2.0, START, "ai_c3po", reason="ai_signal_up", confidence=0.8)
+        persistence.record_portfolio_state(START + 60, 9800.0, 10010.0, 10000.0, 10.0,
+                                           [{'symbol': "BTCUSDT", 'side': 'long', 'quantity': 2.0,
+                                             'entry_price': 100.0, 'entry_time': START}])
+        persistence.record_trade("BTCUSDT", "sell", 105.0, 2.0, START + 120, "ai_c3po", pnl=10.0, reason="take_profit")
+        persistence.close()
+
+        trades = query(db_path, "SELECT timestamp, side, price, value, pnl, reason FROM trades ORDER BY id")
+        assert trades == [
+            ("2026-01-05 08:00:00", "buy", 100.0, 200.0, 0.0, "ai_signal_up"),
+            ("2026-01-05 08:02:00", "sell", 105.0, 210.0, 10.0, "take_profit"),
+        ]
+        run = persistence._run
+        assert query(db_path, "SELECT trade_id FROM trades ORDER BY id") == [(f"test-session-{run}-1",), (f"test-session-{run}-2",)]
+        states = query(db_path, "SELECT timestamp, total_value, position_asset, position_entry_time, total_pnl FROM portfolio_states")
+        assert states == [("2026-01-05 08:01:00", 10010.0, "BTCUSDT", "2026-01-05 08:00:00", 10.0)]
+
+        assert query(db_path, "PRAGMA journal_mode") == [("wal",)]
+        assert query(db_path, "SELECT is_active FROM trading_sessions WHERE session_id = ?", "test-session") == [(0,)]
+        assert persistence.stats == {'enqueued': 3, 'written': 3, 'dropped': 0, 'batches': 2, 'errors': 0, 'pending': 0}
+    print(f"✅ {persistence.stats}")
+
+def test_failed_batch_is_dropped():
+    """Test that a batch violating a constraint is dropped and counted, and the writer keeps going"""
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "paper-trading.db")
+        persistence = TradingPersistence(db_path, session_id="bad-batch", batch_size=1)
+
+        persistence.record_trade("BTCUSDT", "buy", 100.0, 1.0, START, "ai_c3po")
+        persistence.record_trade("BTCUSDT", "hold", 100.0, 1.0, START, "ai_c3po")  # side CHECK fails
+        persistence.record_trade("ETHUSDT", "buy", 50.0, 1.0, START, "ai_c3po")
+        persistence.close()
+
+        assert query(db_path, "SELECT asset, side FROM trades ORDER BY id") == [("BTCUSDT", "buy"), ("ETHUSDT", "buy")]
+        assert (persistence.written, persistence.dropped, persistence.errors) == (2, 1, 1)
+
+def test_resumed_session_id():
+    """Test that a second instance resuming a session_id appends rather than colliding on trade_id"""
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "paper-trading.db")
+        for run in range(2):
+            persistence = TradingPersistence(db_path, session_id="resume-me")
+            persistence.record_trade("BTCUSDT", "buy", 100.0 + run, 1.0, START + run, "ai_c3po")
+            persistence.record_portfolio_state(START + run, 9900.0, 10000.0, 10000.0, 0.0, [])
+            persistence.close()
+            assert (persistence.written, persistence.dropped, persistence.errors) == (2, 0, 0)
+
+        assert query(db_path, "SELECT price FROM trades WHERE session_id = ? ORDER BY id", "resume-me") == [(100.0,), (101.0,)]
+        assert query(db_path, "SELECT COUNT(*) FROM portfolio_states WHERE session_id = ?", "resume-me") == [(2,)]
+
+def test_bot_closes_persistence_without_session():
+    """Test that start_trading closes persistence when the health check fails"""
+    class UnavailablePredictor(LocalPredictor):
+        async def health_check(self, **kwargs) -> bool:
+            return False
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "paper-trading.db")
+        persistence = TradingPersistence(db_path, session_id="no-c3po")
+        bot = AIPaperTradingBot(predictor=UnavailablePredictor(momentum_prediction), persistence=persistence, quiet=True)
+        asyncio.run(bot.start_trading(duration_minutes=1))
+
+        assert not persistence._thread.is_alive()
+        assert query(db_path, "SELECT is_active FROM trading_sessions WHERE session_id = ?", "no-c3po") == [(0,)]
+
+if __name__ == "__main__":
+    test_rows_wal_and_session_close()
+    test_failed_batch_is_dropped()
+    test_resumed_session_id()
+    test_bot_closes_persistence_without_session()
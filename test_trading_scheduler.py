@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+⏱️ Data-Arrival Scheduler Test
+==============================
+
+Checks that bursts of notifications coalesce per symbol, that runs respect
+max_rate, and that run() returns on its deadline or on stop().
+"""
+
+import asyncio
+import time
+
+from trading_scheduler import DataArrivalScheduler
+
+def test_burst_coalescing():
+    """Test that repeated notifications for a symbol collapse into one evaluation"""
+    print("\n🧺 Testing Notification Coalescing")
+    print("-" * 40)
+
+    batches = []
+
+    async def handler(symbols):
+        batches.append(symbols)
+        await asyncio.sleep(0.05)
+
+    async def run():
+        scheduler = DataArrivalScheduler(handler, max_rate=None)
+        for symbol in ["BTCUSDT"] * 5 + ["ETHUSDT", "BTCUSDT", "ETHUSDT"]:
+            scheduler.notify(symbol)
+
+        async def burst_during_run():
+            await asyncio.sleep(0.02)
+            for symbol in ["SOLUSDT", "BTCUSDT", "SOLUSDT"]:
+                scheduler.notify(symbol)
+
+        producer = asyncio.ensure_future(burst_during_run())
+        await scheduler.run(deadline=time.monotonic() + 0.3)
+        await producer
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    assert batches == [["BTCUSDT", "ETHUSDT"], ["SOLUSDT", "BTCUSDT"]]
+    assert scheduler.stats == {'notifications': 11, 'runs': 2, 'coalesced': 7, 'pending': 0}
+    print(f"✅ {scheduler.stats}")
+
+def test_max_rate():
+    """Test that a continuous feed is evaluated at most max_rate times per second"""
+    print("\n🚦 Testing Evaluation Rate Limit")
+    print("-" * 40)
+
+    run_times = []
+
+    async def handler(symbols):
+        run_times.append(time.monotonic())
+
+    async def run():
+        scheduler = DataArrivalScheduler(handler, max_rate=10.0)
+
+        async def feed():
+            while True:
+                scheduler.notify("BTCUSDT")
+                await asyncio.sleep(0.005)
+
+        producer = asyncio.ensure_future(feed())
+        await scheduler.run(deadline=time.monotonic() + 0.55)
+        producer.cancel()
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    gaps = [b - a for a, b in zip(run_times, run_times[1:])]
+    assert 4 <= scheduler.runs <= 7
+    assert min(gaps) >= 0.1 - 0.005
+    assert scheduler.coalesced > 5 * scheduler.runs
+    print(f"✅ {scheduler.runs} runs, min gap {min(gaps) * 1000:.0f} ms")
+
+def test_deadline_and_stop():
+    """Test that run() ends at its deadline or on stop(), even mid rate-limit wait, and survives a failing handler"""
+    calls = []
+
+    async def idle(symbols):
+        calls.append(symbols)
+
+    async def run_until_deadline():
+        started = time.monotonic()
+        await DataArrivalScheduler(idle).run(deadline=started + 0.1)
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(run_until_deadline())
+    assert 0.09 <= elapsed < 0.3 and calls == []
+
+    async def run_until_stopped():
+        async def failing_then_stopping(symbols):
+            calls.append(symbols)
+            if len(calls) == 1:
+                raise RuntimeError("model unavailable")
+            scheduler.stop()
+
+        async def later():
+            await asyncio.sleep(0.05)
+            scheduler.notify("ETHUSDT")
+            await asyncio.sleep(0.05)
+            scheduler.notify("SOLUSDT")
+
+        scheduler = DataArrivalScheduler(failing_then_stopping, max_rate=None)
+        scheduler.notify("BTCUSDT")
+        producer = asyncio.ensure_future(later())
+        started = time.monotonic()
+        await scheduler.run()  # no deadline: only stop() ends it
+        await producer
+        return scheduler, time.monotonic() - started
+
+    scheduler, elapsed = asyncio.run(run_until_stopped())
+    assert calls == [["BTCUSDT"], ["ETHUSDT"]]
+    assert scheduler.pending == ["SOLUSDT"] and elapsed < 0.5
+
+    # stop() and the deadline both cut the rate-limit wait short without another run
+    async def stop_while_rate_limited(deadline_after):
+        rate_limited = []
+
+        async def record(symbols):
+            rate_limited.append(symbols)
+
+        scheduler = DataArrivalScheduler(record, max_rate=2.0)
+        started = time.monotonic()
+        scheduler.notify("A")
+        task = asyncio.ensure_future(scheduler.run(deadline=deadline_after and started + deadline_after))
+        await asyncio.sleep(0.05)
+        scheduler.notify("B")
+        if deadline_after is None:
+            await asyncio.sleep(0.05)
+            scheduler.stop()
+        await task
+        return rate_limited, scheduler.pending, time.monotonic() - started
+
+    rate_limited, pending, elapsed = asyncio.run(stop_while_rate_limited(None))
+    assert rate_limited == [["A"]] and pending == ["B"] and elapsed < 0.3
+    rate_limited, pending, elapsed = asyncio.run(stop_while_rate_limited(0.15))
+    assert rate_limited == [["A"]] and pending == ["B"] and 0.14 <= elapsed < 0.3
+
+if __name__ == "__main__":
+    test_burst_coalescing()
+    test_max_rate()
+    test_deadline_and_stop()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+📝 TRADING LOGGING
+==================
+
+Non-blocking logging setup for the trading bot.
+
+In queued mode the event loop thread only puts LogRecords on a queue; a
+QueueListener thread formats them and does the file/console I/O. Records are
+queued unformatted, so with lazy ``logger.info("... %s", value)`` calls the
+message is only built off the trading thread, and not at all when the level
+is filtered. Optionally each record is written as one JSON object per line,
+including any ``extra=`` fields, for machine-readable session logs.
+
+Usage:
+    listener = configure_logging(queued=True, json_lines=True)
+    ...
+    listener.stop()   # flush before exit
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Attributes every LogRecord has; anything else came from ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+class JSONLinesFormatter(logging.Formatter):
+    """Formats each record as a single-line JSON object"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage().strip(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread
+
+    The stock handler merges ``msg % args`` before enqueueing, i.e. on the
+    caller's thread. Here only exception info is rendered eagerly (tracebacks
+    can't cross threads safely); log arguments must therefore be immutable
+    values, which holds for the bot's numbers and strings.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def configure_logging(log_file: Optional[str] = 'ai_trading_bot.log',
+                      level: int = logging.INFO,
+                      queued: bool = True,
+                      json_lines: bool = False) -> Optional[logging.handlers.QueueListener]:
+    """
+    Replace the root logger's handlers with file and console output
+
+    Args:
+        log_file: Log file path (None for console only)
+        level: Root log level
+        queued: Do handler I/O on a background QueueListener thread
+        json_lines: Write the log file as JSON lines (console stays human-readable)
+
+    Returns:
+        The started QueueListener in queued mode (call stop() to flush), else None
+    """
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.setLevel(level)
+
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+    handlers = [console]
+    if log_file:
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(JSONLinesFormatter() if json_lines else logging.Formatter(DEFAULT_FORMAT))
+        handlers.append(file_handler)
+
+    if not queued:
+        for handler in handlers:
+            root.addHandler(handler)
+        return None
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root.addHandler(DeferredQueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
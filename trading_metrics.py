@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+📈 STREAMING PERFORMANCE METRICS
+================================
+
+O(1)-per-update accumulator for the bot's performance metrics.
+
+Closed trades update running win/loss counts and sums; equity marks update a
+Welford mean/variance of mark-to-mark returns (for the Sharpe ratio) and a
+running equity peak (for max drawdown). Nothing is recomputed over the trade
+history, so the cost of a metrics refresh does not grow with session length.
+"""
+
+import math
+from typing import Dict
+
+class MetricsAccumulator:
+    """Running trade and equity statistics"""
+
+    def __init__(self, initial_equity: float):
+        """
+        Initialize accumulator
+
+        Args:
+            initial_equity: Portfolio value before the first trade
+        """
+        # Trades
+        self.total_trades = 0
+        self.winning_trades = 0
+        self.losing_trades = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+
+        # Equity marks
+        self.last_equity = initial_equity
+        self.peak_equity = initial_equity
+        self.max_drawdown = 0.0  # fraction of peak
+        self.marks = 0
+        self._mean_return = 0.0
+        self._m2_return = 0.0
+
+    def record_trade(self, pnl: float):
+        """Add one closed trade"""
+        self.total_trades += 1
+        if pnl > 0:
+            self.winning_trades += 1
+            self.gross_profit += pnl
+        else:
+            self.losing_trades += 1
+            self.gross_loss += pnl
+
+    def mark_equity(self, equity: float):
+        """Add one mark-to-market portfolio value"""
+        if self.last_equity:
+            # Welford's online mean/variance of mark-to-mark returns
+            step_return = equity / self.last_equity - 1.0
+            self.marks += 1
+            delta = step_return - self._mean_return
+            self._mean_return += delta / self.marks
+            self._m2_return += delta * (step_return - self._mean_return)
+        self.last_equity = equity
+
+        if equity > self.peak_equity:
+            self.peak_equity = equity
+        elif self.peak_equity > 0:
+            self.max_drawdown = max(self.max_drawdown, (self.peak_equity - equity) / self.peak_equity)
+
+    @property
+    def return_std(self) -> float:
+        return math.sqrt(self._m2_return / (self.marks - 1)) if self.marks > 1 else 0.0
+
+    @property
+    def sharpe_ratio(self) -> float:
+        """Mean over standard deviation of mark-to-mark returns (not annualized)"""
+        std = self.return_std
+        return self._mean_return / std if std > 0 else 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        """Metrics in the bot's performance_metrics format (percentages where the bot uses them)"""
+        avg_win = self.gross_profit / self.winning_trades if self.winning_trades else 0.0
+        avg_loss = self.gross_loss / self.losing_trades if self.losing_trades else 0.0
+
+        return {
+            'total_trades': self.total_trades,
+            'winning_trades': self.winning_trades,
+            'losing_trades': self.losing_trades,
+            'win_rate': (self.winning_trades / self.total_trades * 100) if self.total_trades else 0.0,
+            'avg_win': avg_win,
+            'avg_loss': avg_loss,
+            'profit_factor': abs(avg_win / avg_loss) if avg_loss else 0.0,
+            'max_drawdown': self.max_drawdown * 100,
+            'sharpe_ratio': self.sharpe_ratio,
+        }
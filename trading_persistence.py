@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+🗄️ TRADING PERSISTENCE
+======================
+
+Durable SQLite history for AIPaperTradingBot, using the tables from
+``database-schema.sql`` (trading_sessions, portfolio_states, trades).
+
+The trading loop only enqueues rows. A background writer thread owns the
+connection, drains the queue in batches and commits each batch as a single
+transaction. The database runs in WAL mode with ``synchronous=NORMAL``, so
+commits do not fsync and readers (e.g. the Node.js dashboard API) are never
+blocked by the writer.
+
+Rows are best-effort: a full queue drops new rows, and a batch whose
+transaction fails (e.g. a constraint violation) is rolled back and its rows
+are dropped rather than retried. Both are counted in ``stats['dropped']``.
+
+Usage:
+    persistence = TradingPersistence('paper-trading.db', session_name='C3PO bot')
+    bot = AIPaperTradingBot(persistence=persistence)
+    await bot.start_trading(duration_minutes=60)   # closes persistence on exit
+"""
+
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database-schema.sql')
+
+INSERT_TRADE = """
+    INSERT INTO trades (
+        session_id, trade_id, timestamp, side, asset, exchange, price, quantity,
+        value, fee, fee_rate, pnl, strategy, reason, confidence, market_conditions
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_PORTFOLIO_STATE = """
+    INSERT INTO portfolio_states (
+        session_id, timestamp, cash, total_value, initial_value, day_start_value,
+        position_asset, position_quantity, position_average_price,
+        position_entry_time, total_pnl, daily_pnl, unrealized_pnl
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_STOP = object()
+
+def sql_timestamp(epoch: float) -> str:
+    """Epoch seconds as SQLite's CURRENT_TIMESTAMP format (UTC)"""
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+class TradingPersistence:
+    """Non-blocking, batched SQLite writer for one trading session"""
+
+    def __init__(self,
+                 db_path: str = 'paper-trading.db',
+                 session_id: Optional[str] = None,
+                 session_name: Optional[str] = None,
+                 exchange: str = 'paper',
+                 batch_size: int = 500,
+                 flush_interval: float = 1.0,
+                 max_queue: int = 100000,
+                 schema_path: str = SCHEMA_PATH):
+        """
+        Initialize persistence and start the writer thread
+
+        Args:
+            db_path: SQLite database file (created from the schema if it has no tables)
+            session_id: trading_sessions.session_id (default: random)
+            session_name: Human-readable session name
+            exchange: Value stored in trades.exchange
+            batch_size: Maximum rows per transaction
+            flush_interval: Seconds the writer waits for more rows before committing
+            max_queue: Queued rows before new rows are dropped (the trading loop never blocks)
+            schema_path: Schema applied to a fresh database
+        """
+        self.db_path = db_path
+        self.session_id = session_id or f"ai-bot-{uuid.uuid4().hex[:12]}"
+        self.session_name = session_name
+        self.exchange = exchange
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.schema_path = schema_path
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        # trade_ids are "<session>-<run>-<seq>": the per-instance run nonce keeps
+        # them unique when a session_id is resumed by a later instance
+        self._run = uuid.uuid4().hex[:8]
+        self._trade_seq = 0
+        self._day = None
+        self._day_start_value = None
+
+        # Statistics
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        # Each counter has a single writer thread, so += never races
+        self._dropped_full = 0     # trading loop: queue full
+        self._dropped_failed = 0   # writer: failed batches / no database
+
+        self._thread = threading.Thread(target=self._writer, name='trading-persistence', daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Producer side (trading loop)
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, statement: str, row: Tuple):
+        try:
+            self._queue.put_nowait((statement, row))
+            self.enqueued += 1
+        except queue.Full:
+            self._dropped_full += 1
+            if self._dropped_full == 1:
+                logger.warning("⚠️ Persistence queue full, dropping rows")
+
+    def record_trade(self,
+                     symbol: str,
+                     side: str,
+                     price: float,
+                     quantity: float,
+                     timestamp: float,
+                     strategy: str,
+                     pnl: float = 0.0,
+                     reason: Optional[str] = None,
+                     confidence: Optional[float] = None,
+                     fee: float = 0.0,
+                     market_conditions: Optional[Dict[str, Any]] = None):
+        """
+        Queue one execution for the trades table
+
+        Args:
+            symbol: Asset traded
+            side: 'buy' or 'sell'
+            price: Execution price
+            quantity: Executed quantity
+            timestamp: Epoch seconds (the bot's clock, so backtests store simulated time)
+            strategy: Strategy name
+            pnl: Realized P&L (closing executions)
+            reason: Entry/exit reason
+            confidence: AI confidence
+            fee: Fee paid
+            market_conditions: Optional JSON-serializable context
+        """
+        self._trade_seq += 1
+        self._enqueue(INSERT_TRADE, (
+            self.session_id, f"{self.session_id}-{self._run}-{self._trade_seq}", sql_timestamp(timestamp),
+            side, symbol, self.exchange, price, quantity, price * quantity, fee,
+            (fee / (price * quantity)) if price * quantity else None,
+            pnl, strategy, reason, confidence,
+            json.dumps(market_conditions) if market_conditions else None
+        ))
+
+    def record_portfolio_state(self,
+                               timestamp: float,
+                               cash: float,
+                               total_value: float,
+                               initial_value: float,
+                               unrealized_pnl: float,
+                               positions: List[Dict[str, Any]]):
+        """
+        Queue a portfolio snapshot for the portfolio_states table
+
+        A single open position fills the position_* columns; with several,
+        position_asset holds them as a JSON list and the other columns are NULL.
+
+        Args:
+            timestamp: Epoch seconds
+            cash: Cash balance
+            total_value: Cash plus position market value
+            initial_value: Starting balance
+            unrealized_pnl: Open-position P&L
+            positions: Dicts with symbol, side, quantity, entry_price, entry_time (epoch)
+        """
+        day = sql_timestamp(timestamp)[:10]
+        if day != self._day:
+            self._day, self._day_start_value = day, total_value
+
+        asset = quantity = average_price = entry_time = None
+        if len(positions) == 1:
+            position = positions[0]
+            asset = position['symbol']
+            quantity = position['quantity']
+            average_price = position['entry_price']
+            entry_time = sql_timestamp(position['entry_time'])
+        elif positions:
+            asset = json.dumps(positions)
+
+        self._enqueue(INSERT_PORTFOLIO_STATE, (
+            self.session_id, sql_timestamp(timestamp), cash, total_value, initial_value,
+            self._day_start_value, asset, quantity, average_price, entry_time,
+            total_value - initial_value, total_value - self._day_start_value, unrealized_pnl
+        ))
+
+    def close(self, timeout: Optional[float] = 10.0):
+        """Flush queued rows, mark the session inactive and stop the writer"""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("⚠️ Persistence writer still flushing after %ss", timeout)
+
+    @property
+    def dropped(self) -> int:
+        """Rows lost to a full queue or a failed batch"""
+        return self._dropped_full + self._dropped_failed
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'enqueued': self.enqueued,
+            'written': self.written,
+            'dropped': self.dropped,
+            'batches': self.batches,
+            'errors': self.errors,
+            'pending': self._queue.qsize()
+        }
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+        has_schema = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'trades'"
+        ).fetchone()
+        if not has_schema:
+            with open(self.schema_path) as f:
+                conn.executescript(f.read())
+
+        with conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO trading_sessions (session_id, session_name, notes) VALUES (?, ?, ?)",
+                (self.session_id, self.session_name, 'AI paper trading bot (C3PO)')
+            )
+        return conn
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Tuple[str, Tuple]]):
+        """Commit a batch as one transaction, grouping consecutive rows per statement"""
+        try:
+            with conn:
+                start = 0
+                while start < len(batch):
+                    statement = batch[start][0]
+                    end = start
+                    while end < len(batch) and batch[end][0] is statement:
+                        end += 1
+                    conn.executemany(statement, [row for _, row in batch[start:end]])
+                    start = end
+            self.written += len(batch)
+            self.batches += 1
+        except sqlite3.Error as e:
+            # The transaction rolled back: the batch is dropped, not retried
+            self.errors += 1
+            self._dropped_failed += len(batch)
+            logger.error("❌ Failed to persist %d rows, dropping them: %s", len(batch), e)
+
+    def _writer(self):
+        try:
+            conn = self._connect()
+        except (sqlite3.Error, OSError) as e:
+            logger.error("❌ Could not open trading database %s: %s", self.db_path, e)
+            self.errors += 1
+            # Keep draining so producers never fill the queue
+            while self._queue.get() is not _STOP:
+                self._dropped_failed += 1
+            return
+
+        stopping = False
+        while not stopping:
+            batch = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write_batch(conn, batch)
+
+        try:
+            with conn:
+                conn.execute("UPDATE trading_sessions SET is_active = 0 WHERE session_id = ?", (self.session_id,))
+        except sqlite3.Error as e:
+            logger.error("❌ Failed to close trading session %s: %s", self.session_id, e)
+        conn.close()
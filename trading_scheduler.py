@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+⏱️ DATA-ARRIVAL SCHEDULER
+=========================
+
+Event-driven replacement for a fixed ``asyncio.sleep`` trading loop.
+
+Data producers call ``notify(symbol)`` whenever a new candle/tick lands; the
+scheduler wakes up, takes every symbol that changed since the last run and
+hands them to the evaluation handler in one call. Symbols that update again
+while an evaluation is running are coalesced into the next run, and runs are
+spaced at most ``max_rate`` per second.
+
+Usage:
+    scheduler = DataArrivalScheduler(bot.evaluate_symbols, max_rate=2.0)
+    feed.on_candle = lambda symbol: scheduler.notify(symbol)
+    await scheduler.run(deadline=time.monotonic() + 3600)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class DataArrivalScheduler:
+    """Runs an async handler for the set of symbols that received new data"""
+
+    def __init__(self,
+                 handler: Callable[[List[str]], Awaitable[None]],
+                 max_rate: Optional[float] = 2.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize scheduler
+
+        Args:
+            handler: Coroutine function called with the changed symbols (first-notified first)
+            max_rate: Maximum handler runs per second (None for unlimited)
+            clock: Monotonic time source
+        """
+        self.handler = handler
+        self.min_interval = (1.0 / max_rate) if max_rate else 0.0
+        self.clock = clock
+        self._dirty: Dict[str, None] = {}
+        self._wakeup = asyncio.Event()
+        self._stop_requested = asyncio.Event()
+        self._stopped = False
+
+        # Statistics
+        self.notifications = 0
+        self.runs = 0
+        self.coalesced = 0
+
+    def notify(self, symbol: str):
+        """Mark a symbol as having new data (safe to call many times per run)"""
+        self.notifications += 1
+        if symbol in self._dirty:
+            self.coalesced += 1
+        else:
+            self._dirty[symbol] = None
+        self._wakeup.set()
+
+    def stop(self):
+        """Ask run() to return after the current handler call (without starting another)"""
+        self._stopped = True
+        self._stop_requested.set()
+        self._wakeup.set()
+
+    @property
+    def pending(self) -> List[str]:
+        """Symbols waiting for the next run"""
+        return list(self._dirty)
+
+    async def run(self, deadline: Optional[float] = None):
+        """
+        Dispatch changed symbols to the handler until stopped or the deadline passes
+
+        Args:
+            deadline: Clock value at which to stop (None runs until stop())
+        """
+        self._stopped = False
+        self._stop_requested.clear()
+        last_run = None
+
+        while not self._stopped:
+            timeout = None if deadline is None else deadline - self.clock()
+            if timeout is not None and timeout <= 0:
+                break
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if self._stopped:
+                break
+
+            # Rate limit: let further updates coalesce instead of running again at
+            # once, but return as soon as stop() is called or the deadline passes
+            if last_run is not None:
+                wait = last_run + self.min_interval - self.clock()
+                if deadline is not None:
+                    wait = min(wait, deadline - self.clock())
+                if wait > 0:
+                    try:
+                        await asyncio.wait_for(self._stop_requested.wait(), wait)
+                    except asyncio.TimeoutError:
+                        pass
+                if self._stopped or (deadline is not None and self.clock() >= deadline):
+                    break
+
+            self._wakeup.clear()
+            symbols, self._dirty = list(self._dirty), {}
+            if not symbols:
+                continue
+
+            last_run = self.clock()
+            self.runs += 1
+            try:
+                await self.handler(symbols)
+            except Exception as e:
+                logger.error("❌ Evaluation failed for %s: %s", ', '.join(symbols), e)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'notifications': self.notifications,
+            'runs': self.runs,
+            'coalesced': self.coalesced,
+            'pending': len(self._dirty)
+        }